@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Desktop Organizer pipeline
+"""
\ No newline at end of file
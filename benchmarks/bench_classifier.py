@@ -0,0 +1,79 @@
+"""
+Micro-benchmark for CategoryClassifier
+
+Grows a synthetic config from a handful to hundreds of categories and
+thousands of executable patterns, and reports per-file classification cost
+for the compiled classifier next to the old linear scan.
+
+    python benchmarks/bench_classifier.py [--files N] [--seed S]
+"""
+
+import sys
+import random
+import argparse
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_config, make_names
+from modules.classifier import CategoryClassifier
+
+SIZES = [(3, 6), (30, 100), (100, 1000), (300, 3000), (500, 5000)]
+
+def classifier_names(rng: random.Random, config: dict, count: int) -> list:
+    """Names over every configured extension plus unknown and missing ones"""
+    mix = {ext: 1 for data in config['categories'].values() for ext in data['extensions']}
+    mix.update({'.unknown': 1, '': 1, '.exe': len(mix) / 4})
+    patterns = [p for group in config['executable_rules'].values() for p in group]
+    return make_names(rng, count, mix, patterns)
+
+def legacy_classify(config: dict, name: str) -> str:
+    """The pre-index implementation of _determine_category, kept as reference"""
+    path = Path(name)
+    if path.suffix.lower() == '.exe':
+        stem = path.stem.lower()
+        for category, patterns in config['executable_rules'].items():
+            if any(p in stem for p in patterns):
+                return category
+        return 'Executables'
+    for category, data in config['categories'].items():
+        if path.suffix.lower() in data['extensions']:
+            return category
+    return 'Uncategorized'
+
+def _time_per_file(fn, names: list) -> float:
+    start = time.perf_counter()
+    for name in names:
+        fn(name)
+    return (time.perf_counter() - start) / len(names) * 1e6
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'categories':>10} {'patterns':>9} {'build ms':>9} {'compiled us/file':>17} {'linear us/file':>15}")
+    for n_categories, n_patterns in SIZES:
+        config = make_config(rng, n_categories, n_patterns)
+        names = classifier_names(rng, config, args.files)
+
+        start = time.perf_counter()
+        classifier = CategoryClassifier(config)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        for name in names[:2000]:
+            expected = legacy_classify(config, name)
+            if classifier.classify_name(name) != expected:
+                print(f"Mismatch for {name!r}: expected {expected}", file=sys.stderr)
+                return 1
+
+        compiled = _time_per_file(classifier.classify_name, names)
+        linear = _time_per_file(lambda n: legacy_classify(config, n), names)
+        print(f"{n_categories:>10} {n_patterns:>9} {build_ms:>9.1f} {compiled:>17.2f} {linear:>15.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
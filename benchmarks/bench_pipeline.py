@@ -0,0 +1,219 @@
+"""
+Benchmark harness for the organize pipeline
+
+Builds a synthetic desktop in a scratch directory (tmpfs when available)
+and times each stage: container creation, classification, moves, rules,
+a full rebuild, a no-op incremental run, reset, the watchdog batch path
+and vault encryption. Results are written as JSON; pass ``--baseline`` with
+an earlier result to fail on regressions.
+
+    python benchmarks/bench_pipeline.py --files 20000 --rules 50 -o result.json
+    python benchmarks/bench_pipeline.py --baseline result.json
+"""
+
+import sys
+import json
+import logging
+import time
+import random
+import shutil
+import argparse
+import platform
+import threading
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import (
+    generate_desktop, make_config, make_rules, parse_extension_mix, scratch_dir,
+    DEFAULT_EXTENSION_MIX
+)
+from modules.core_organizer import DesktopOrganizer
+from modules.rule_engine import RuleEngine
+from modules.event_queue import CoalescingQueue
+from modules.security import FileVault
+
+class StageTimer:
+    def __init__(self):
+        self.stages: Dict[str, Dict] = {}
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        record = {'items': items}
+        start = time.perf_counter()
+        yield record
+        seconds = time.perf_counter() - start
+        items = record['items']
+        record['seconds'] = round(seconds, 6)
+        if items:
+            record['per_item_us'] = round(seconds / items * 1e6, 3)
+            record['items_per_second'] = round(items / seconds, 1) if seconds else None
+        self.stages[name] = record
+        print(f"{name:>16}: {seconds:9.4f}s  {items:>8} items", file=sys.stderr)
+
+def _git_version() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def _count_loose(directory: Path) -> int:
+    return sum(1 for p in directory.iterdir() if p.is_file() and not p.name.startswith('.'))
+
+def run(args: argparse.Namespace) -> Dict:
+    rng = random.Random(args.seed)
+    work = scratch_dir()
+    timer = StageTimer()
+    try:
+        config = make_config(rng, args.categories, args.patterns)
+        config['move_workers'] = args.workers
+        config_path = work / 'categories.json'
+        config_path.write_text(json.dumps(config))
+        rules_path = work / 'rules.json'
+        rules_path.write_text(json.dumps(make_rules(rng, args.rules)))
+        patterns = [p for group in config['executable_rules'].values() for p in group]
+        extension_mix = parse_extension_mix(args.extensions) if args.extensions else DEFAULT_EXTENSION_MIX
+
+        desktop = work / 'Desktop'
+        with timer.stage('generate', args.files):
+            generate_desktop(desktop, args.files, extension_mix, args.size_dist,
+                             args.mean_size, args.seed, patterns)
+
+        organizer = DesktopOrganizer(str(config_path))
+        organizer.rule_engine = RuleEngine(str(rules_path))
+
+        with timer.stage('containers', len(config['categories'])):
+            organizer._create_containers(desktop)
+
+        with timer.stage('classification') as record:
+            moves = list(organizer._classify_files(desktop))
+            record['items'] = len(moves)
+
+        with timer.stage('moves', len(moves)):
+            report = organizer.executor.execute(moves)
+
+        with timer.stage('rules', len(report.moved)) as record:
+            plan = organizer.rule_engine.plan_for()
+            matched = 0
+            for result in report.moved:
+                if organizer.rule_engine.apply_rules(result.dest, plan, result.stat) != result.dest:
+                    matched += 1
+            organizer.rule_engine.flush()
+            record['matched'] = matched
+
+        with timer.stage('rebuild', args.files):
+            organizer.organize(desktop, rebuild=True)
+
+        with timer.stage('incremental_noop', args.files):
+            organizer.organize(desktop)
+
+        with timer.stage('reset') as record:
+            organizer._reset_desktop(desktop)
+            record['items'] = _count_loose(desktop)
+
+        loose = [p for p in desktop.iterdir() if p.is_file() and not p.name.startswith('.')]
+        done = threading.Event()
+        processed = []
+
+        def handle(batch):
+            processed.extend(organizer.process_batch(desktop, batch).results)
+            if len(processed) >= len(loose):
+                done.set()
+
+        with timer.stage('watchdog', len(loose)) as record:
+            queue = CoalescingQueue(handle, quiet_window=0.05, max_delay=1.0)
+            for path in loose:
+                # Editors and browsers typically fire created + modified per file
+                queue.add(path)
+                queue.add(path)
+            if loose:
+                done.wait(timeout=600)
+            queue.stop()
+            record.update(queue.stats())
+
+        vault_dir = work / 'vault'
+        vault_dir.mkdir()
+        vault_files = []
+        for i in range(args.encrypt_files):
+            path = vault_dir / f"secret{i}.bin"
+            path.write_bytes(rng.randbytes(args.encrypt_size))
+            vault_files.append(path)
+        vault = FileVault()
+        vault.generate_key('benchmark')
+        with timer.stage('encrypt', len(vault_files)) as record:
+            vault_report = vault.encrypt_files(vault_files, 'benchmark', args.workers)
+            record['bytes'] = args.encrypt_size * len(vault_report.encrypted)
+        seconds = timer.stages['encrypt']['seconds']
+        timer.stages['encrypt']['bytes_per_second'] = round(timer.stages['encrypt']['bytes'] / seconds) if seconds else None
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    return {
+        'version': _git_version(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': vars(args),
+        'stages': timer.stages
+    }
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> list:
+    """Return the stages that got slower than the baseline by more than ``tolerance``"""
+    regressions = []
+    for name, stage in result['stages'].items():
+        before = baseline.get('stages', {}).get(name)
+        if not before or not before.get('seconds'):
+            continue
+        key = 'per_item_us' if 'per_item_us' in stage and 'per_item_us' in before else 'seconds'
+        ratio = stage[key] / before[key] if before[key] else 1.0
+        if ratio > 1 + tolerance:
+            regressions.append((name, key, before[key], stage[key], ratio))
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--extensions', type=str, help="Extension weights, e.g. 'pdf:3,mp4:1,none:0.5'")
+    parser.add_argument('--size-dist', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--mean-size', type=int, default=16 * 1024, help='Mean file size in bytes')
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--patterns', type=int, default=50)
+    parser.add_argument('--rules', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--encrypt-files', type=int, default=8)
+    parser.add_argument('--encrypt-size', type=int, default=4 * 1024 * 1024)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show organizer log output')
+    parser.add_argument('-o', '--output', type=str, help='Write JSON results here instead of stdout')
+    parser.add_argument('--baseline', type=str, help='Earlier JSON result to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before failing')
+    args = parser.parse_args()
+    if not args.verbose:
+        # Per-file reset/move errors would drown out the stage timings
+        logging.getLogger('modules').setLevel(logging.CRITICAL)
+
+    result = run(args)
+    payload = json.dumps(result, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(result, baseline, args.tolerance)
+        for name, key, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {key} {before} -> {after} ({ratio:.2f}x)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
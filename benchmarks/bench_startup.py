@@ -0,0 +1,131 @@
+"""
+Startup benchmark for the headless command line
+
+Runs each entry point in a fresh interpreter under ``-X importtime`` and
+reports the cumulative import time, the slowest top-level imports and the
+wall time of the process. Headless paths fail outright if they load any
+GUI or optional heavy dependency; pass ``--baseline`` with an earlier
+result to also fail on import-time regressions.
+
+    python benchmarks/bench_startup.py -o startup.json
+    python benchmarks/bench_startup.py --baseline startup.json
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> interpreter arguments, run from the repository root
+SCENARIOS = {
+    'cli_help': ['main.py', '--help'],
+    'package': ['-c', 'import modules'],
+    'organizer': ['-c', 'from modules.core_organizer import DesktopOrganizer; DesktopOrganizer()'],
+}
+
+# Nothing headless should pull these in before it needs them
+FORBIDDEN = ('tkinter', 'PIL', 'plyer', 'winsound', 'watchdog', 'cryptography', 'sqlite3')
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) for every line ``-X importtime`` printed"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, depth, int(self_us), int(cumulative_us)))
+    return rows
+
+def measure(args: List[str]) -> Dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(f"{' '.join(args)} exited with {proc.returncode}: {' '.join(errors[-3:])}")
+    rows = parse_importtime(proc.stderr)
+    top_level = [row for row in rows if row[1] == 0]
+    return {
+        'wall_ms': wall * 1000,
+        'import_ms': sum(row[3] for row in top_level) / 1000,
+        'modules': len(rows),
+        'slowest': sorted(((row[0], row[3] / 1000) for row in top_level), key=lambda r: -r[1])[:10],
+        'loaded': sorted({row[0].split('.')[0] for row in rows})
+    }
+
+def run(args: argparse.Namespace) -> Dict:
+    scenarios = {}
+    for name, argv in SCENARIOS.items():
+        # One untimed run so bytecode caches are warm, like on a machine that ran before
+        measure(argv)
+        samples = [measure(argv) for _ in range(args.repeat)]
+        median = sorted(samples, key=lambda s: s['import_ms'])[len(samples) // 2]
+        scenarios[name] = {
+            'import_ms': round(median['import_ms'], 2),
+            'wall_ms': round(statistics.median(s['wall_ms'] for s in samples), 2),
+            'modules': median['modules'],
+            'slowest': [(module, round(ms, 2)) for module, ms in median['slowest']],
+            'forbidden': [module for module in FORBIDDEN if module in median['loaded']]
+        }
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': vars(args),
+        'scenarios': scenarios
+    }
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> list:
+    """Return the scenarios whose import time grew by more than ``tolerance``"""
+    regressions = []
+    for name, scenario in result['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before or not before.get('import_ms'):
+            continue
+        ratio = scenario['import_ms'] / before['import_ms']
+        if ratio > 1 + tolerance:
+            regressions.append((name, before['import_ms'], scenario['import_ms'], ratio))
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per scenario; the median is kept')
+    parser.add_argument('-o', '--output', type=str, help='Write JSON results here instead of stdout')
+    parser.add_argument('--baseline', type=str, help='Earlier JSON result to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before failing')
+    args = parser.parse_args()
+
+    result = run(args)
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload)
+    else:
+        print(payload)
+
+    failed = False
+    for name, scenario in result['scenarios'].items():
+        if scenario['forbidden']:
+            print(f"HEAVY IMPORT {name}: {', '.join(scenario['forbidden'])}", file=sys.stderr)
+            failed = True
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        for name, before, after, ratio in compare(result, baseline, args.tolerance):
+            print(f"REGRESSION {name}: import_ms {before} -> {after} ({ratio:.2f}x)", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Synthetic desktop generator for the benchmarks
+
+Builds reproducible configs, rule sets and cluttered desktops so pipeline
+stages can be timed on realistic file counts without touching a real
+desktop.
+"""
+
+import os
+import random
+import string
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_EXTENSION_MIX = {
+    '.pdf': 3, '.docx': 2, '.txt': 3, '.xlsx': 1,
+    '.mp4': 1, '.mp3': 1, '.exe': 1, '.msi': 0.2,
+    '.zip': 1, '': 0.5
+}
+
+def word(rng: random.Random, low: int = 3, high: int = 9) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(low, high)))
+
+def parse_extension_mix(spec: str) -> Dict[str, float]:
+    """Parse 'pdf:3,mp4:1,none:0.5' into an extension weight map"""
+    mix = {}
+    for part in spec.split(','):
+        ext, _, weight = part.partition(':')
+        ext = ext.strip().lstrip('.')
+        mix['' if ext == 'none' else f".{ext}"] = float(weight or 1)
+    return mix
+
+def make_config(rng: random.Random, n_categories: int, n_patterns: int) -> Dict:
+    """Categories config with the stock categories plus generated ones"""
+    categories = {
+        'Documents': {'extensions': ['.pdf', '.doc', '.docx', '.txt', '.xlsx', '.pptx'], 'color': '#4CAF50', 'icon': ''},
+        'Media': {'extensions': ['.mp4', '.mov', '.avi', '.mp3', '.wav'], 'color': '#FF5722', 'icon': ''},
+        'Executables': {'extensions': ['.exe', '.msi'], 'color': '#2196F3', 'icon': ''}
+    }
+    for i in range(max(0, n_categories - len(categories))):
+        categories[f"Category{i}"] = {
+            'extensions': [f".{word(rng, 2, 4)}" for _ in range(rng.randint(2, 8))],
+            'color': '#000000',
+            'icon': ''
+        }
+
+    executable_rules = {}
+    n_rule_groups = max(1, n_categories // 2)
+    for i in range(n_patterns):
+        executable_rules.setdefault(f"Apps{i % n_rule_groups}", []).append(word(rng, 5, 10))
+    return {'categories': categories, 'executable_rules': executable_rules}
+
+def make_rules(rng: random.Random, count: int) -> List[Dict]:
+    """Rule set mixing name, extension and size conditions with move actions"""
+    rules = []
+    for i in range(count):
+        conditions = {}
+        kind = i % 3
+        if kind == 0:
+            conditions['name_pattern'] = '|'.join(word(rng, 2, 3) for _ in range(2))
+        elif kind == 1:
+            conditions['extensions'] = rng.sample(['.pdf', '.txt', '.mp4', '.zip', '.exe', '.log'], 2)
+        else:
+            conditions['min_size'] = rng.randint(1, 64) * 1024
+            conditions['extensions'] = ['.mp4']
+        rules.append({
+            'name': f"Rule {i}",
+            'conditions': conditions,
+            'action': {'type': 'move', 'destination': f"Archive{i % 5}"}
+        })
+    return rules
+
+def file_size(rng: random.Random, distribution: str, mean: int) -> int:
+    if distribution == 'fixed':
+        return mean
+    if distribution == 'uniform':
+        return rng.randint(0, 2 * mean)
+    # Log-normal: many small files and a long tail of large ones
+    return int(rng.lognormvariate(0, 1.2) * mean / 2.05)
+
+def make_names(rng: random.Random, count: int, extension_mix: Dict[str, float],
+               patterns: List[str] = None) -> List[str]:
+    extensions = list(extension_mix)
+    weights = list(extension_mix.values())
+    names = set()
+    while len(names) < count:
+        ext = rng.choices(extensions, weights)[0]
+        stem = word(rng, 6, 16)
+        if ext == '.exe' and patterns and rng.random() < 0.5:
+            stem = f"{stem[:3]}{rng.choice(patterns)}{stem[3:]}"
+        names.add(f"{stem}{ext}")
+    return sorted(names)
+
+def generate_desktop(root: Path, count: int, extension_mix: Dict[str, float] = None,
+                     size_distribution: str = 'lognormal', mean_size: int = 16 * 1024,
+                     seed: int = 0, patterns: List[str] = None) -> List[Path]:
+    """Fill ``root`` with ``count`` loose files; sizes are sparse so generation is fast"""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in make_names(rng, count, extension_mix or DEFAULT_EXTENSION_MIX, patterns):
+        path = root / name
+        with open(path, 'wb') as f:
+            f.truncate(file_size(rng, size_distribution, mean_size))
+        paths.append(path)
+    return paths
+
+def scratch_dir(prefix: str = 'desktop-bench-') -> Path:
+    """Temp directory, on tmpfs when one is available"""
+    shm = Path('/dev/shm')
+    base = str(shm) if shm.is_dir() and os.access(shm, os.W_OK) else None
+    return Path(tempfile.mkdtemp(prefix=prefix, dir=base))
\ No newline at end of file
@@ -3,8 +3,23 @@ Desktop Organizer GUI Package
 Contains all graphical interface components
 """
 
-from .main_window import DesktopOrganizerGUI
-from .launchpad_view import LaunchpadView
-from .notification_manager import NotificationManager
+import importlib
 
-__all__ = ['DesktopOrganizerGUI', 'LaunchpadView', 'NotificationManager']
\ No newline at end of file
+# Loaded on first access so tkinter and Pillow stay out of headless runs
+_LAZY = {
+    'DesktopOrganizerGUI': 'main_window',
+    'LaunchpadView': 'launchpad_view',
+    'NotificationManager': 'notification_manager'
+}
+
+__all__ = ['DesktopOrganizerGUI', 'LaunchpadView', 'NotificationManager']
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
\ No newline at end of file
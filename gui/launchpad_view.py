@@ -1,63 +1,339 @@
+import os
+import queue
+import hashlib
+import logging
+import threading
 import tkinter as tk
 from tkinter import ttk
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 from PIL import Image, ImageTk
 
+ICON_EXTENSIONS = ('.exe', '.lnk')
+# (path, mtime_ns, size, icon size)
+ThumbKey = Tuple[str, int, int, int]
+
+def _default_cache_dir() -> Path:
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'desktop_organizer' / 'thumbnails'
+
+class ThumbnailCache:
+    """Resized icons in a memory LRU backed by PNG files on disk, keyed by (path, mtime, size)"""
+    
+    def __init__(self, directory: Path = None, max_entries: int = 2048, max_disk_entries: int = 20000):
+        self.directory = Path(directory) if directory else _default_cache_dir()
+        self.max_entries = max(1, max_entries)
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: 'OrderedDict[ThumbKey, Image.Image]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _file(self, key: ThumbKey) -> Path:
+        digest = hashlib.sha1('|'.join(map(str, key)).encode()).hexdigest()
+        return self.directory / digest[:2] / f'{digest}.png'
+    
+    def peek(self, key: ThumbKey) -> Optional[Image.Image]:
+        """Memory-only lookup, cheap enough for the Tk thread"""
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            return image
+    
+    def get(self, key: ThumbKey) -> Optional[Image.Image]:
+        image = self.peek(key)
+        if image is not None:
+            return image
+        try:
+            with Image.open(self._file(key)) as f:
+                image = f.copy()
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(key, image)
+        return image
+    
+    def put(self, key: ThumbKey, image: Image.Image) -> None:
+        self._remember(key, image)
+        path = self._file(key)
+        tmp_path = path.with_name(f'{path.stem}.{threading.get_ident()}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            image.save(tmp_path, 'PNG')
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk cache is best effort; the memory copy still serves this session
+            tmp_path.unlink(missing_ok=True)
+    
+    def _remember(self, key: ThumbKey, image: Image.Image) -> None:
+        with self._lock:
+            self._memory[key] = image
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+    
+    def prune(self) -> int:
+        """Delete the oldest thumbnails beyond ``max_disk_entries``; returns how many went"""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    files.append((os.stat(path).st_mtime, path))
+                except OSError:
+                    continue
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return 0
+        files.sort()
+        for _, path in files[:excess]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        return excess
+
+class ThumbnailLoader:
+    """Decodes and resizes icons on a thread pool.
+    
+    Finished thumbnails are handed back through a queue that the Tk thread
+    drains with ``poll()``, since Tk objects may only be touched there.
+    """
+    
+    def __init__(self, size: int, cache: ThumbnailCache, max_workers: int = 4,
+                 source: Callable[[Path], Path] = None):
+        self.size = size
+        self.cache = cache
+        self.source = source or (lambda path: path)
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix='thumbnails')
+        self._results: 'queue.Queue[Tuple[Path, ThumbKey, Optional[Image.Image]]]' = queue.Queue()
+        self._inflight: Dict[ThumbKey, Future] = {}
+        self._lock = threading.Lock()
+        self._pool.submit(cache.prune)
+    
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inflight) + self._results.qsize()
+    
+    def request(self, path: Path, key: ThumbKey) -> None:
+        with self._lock:
+            if key not in self._inflight:
+                self._inflight[key] = self._pool.submit(self._load, path, key)
+    
+    def cancel(self, key: ThumbKey) -> None:
+        """Drop a request that has not started yet, e.g. for a tile scrolled out of view"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None and future.cancel():
+                del self._inflight[key]
+    
+    def poll(self) -> List[Tuple[Path, ThumbKey, Optional[Image.Image]]]:
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+    
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _load(self, path: Path, key: ThumbKey) -> None:
+        try:
+            image = self.cache.get(key)
+            if image is None:
+                image = self._render(path)
+                if image is not None:
+                    self.cache.put(key, image)
+            self._results.put((path, key, image))
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def _render(self, path: Path) -> Optional[Image.Image]:
+        try:
+            with Image.open(self.source(path)) as img:
+                # Lets JPEG decode at a reduced scale instead of full size
+                img.draft('RGB', (self.size, self.size))
+                return img.convert('RGBA').resize((self.size, self.size), Image.LANCZOS)
+        except (OSError, ValueError) as e:
+            logging.getLogger(__name__).debug(f"Error loading icon for {path.name}: {e}")
+            return None
+
+class _Tile:
+    __slots__ = ('index', 'key', 'image_id', 'text_id', 'photo')
+    
+    def __init__(self, index: int, key: ThumbKey, image_id: int, text_id: int, photo):
+        self.index = index
+        self.key = key
+        self.image_id = image_id
+        self.text_id = text_id
+        self.photo = photo
+
 class LaunchpadView:
-    def __init__(self, parent):
+    """Grid of application icons drawn straight onto a canvas.
+    
+    Only the rows in view (plus one either side) have canvas items; the
+    rest exist as list entries. Icons load in the background through
+    ``ThumbnailLoader`` and a placeholder is shown until they arrive.
+    """
+    
+    def __init__(self, parent, cache_dir: Path = None, workers: int = 4):
         self.parent = parent
         self.icon_size = 64
         self.padding = 10
+        self.directory = None
+        self._items: List[Tuple[Path, ThumbKey]] = []
+        self._tiles: Dict[Path, _Tile] = {}
+        self._columns = 0
+        self._poll_id = None
+        self.cache = ThumbnailCache(cache_dir)
+        self.loader = ThumbnailLoader(self.icon_size, self.cache, workers, self._get_icon_path)
         self._setup_view()
-        
+    
+    @property
+    def _tile_width(self) -> int:
+        return self.icon_size + 4 * self.padding
+    
+    @property
+    def _tile_height(self) -> int:
+        return self.icon_size + 2 * self.padding + 24
+    
     def _setup_view(self):
         self.canvas = tk.Canvas(self.parent, bg='white')
-        self.scrollbar = ttk.Scrollbar(self.parent, orient="vertical", command=self.canvas.yview)
-        self.icon_frame = ttk.Frame(self.canvas)
-        
-        self.icon_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(
-                scrollregion=self.canvas.bbox("all")
-            )
-        )
-        
-        self.canvas.create_window((0, 0), window=self.icon_frame, anchor="nw")
+        self.scrollbar = ttk.Scrollbar(self.parent, orient="vertical", command=self._on_scroll)
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.bind("<Configure>", lambda e: self._layout())
+        self.canvas.bind("<MouseWheel>", lambda e: self._on_scroll('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind("<Button-4>", lambda e: self._on_scroll('scroll', -1, 'units'))
+        self.canvas.bind("<Button-5>", lambda e: self._on_scroll('scroll', 1, 'units'))
+        self._placeholder = ImageTk.PhotoImage(Image.new('RGBA', (self.icon_size, self.icon_size), (220, 220, 220, 255)))
         
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
+    
     def load_icons(self, directory: Path):
-        """Load application icons from directory"""
-        for widget in self.icon_frame.winfo_children():
-            widget.destroy()
-            
-        for idx, item in enumerate(directory.iterdir()):
-            if item.is_file() and item.suffix.lower() in ['.exe', '.lnk']:
-                self._create_icon(item, idx)
-                
-    def _create_icon(self, path: Path, position: int):
-        frame = ttk.Frame(self.icon_frame)
-        row = position // 4
-        col = position % 4
-        
+        """Show the application icons in ``directory``, updating only what changed since the last load"""
+        items = []
         try:
-            img = Image.open(self._get_icon_path(path))
-            img = img.resize((self.icon_size, self.icon_size), Image.ANTIALIAS)
-            icon = ImageTk.PhotoImage(img)
-            
-            label = ttk.Label(frame, image=icon)
-            label.image = icon
-            label.pack()
-            
-            text = ttk.Label(frame, text=path.stem)
-            text.pack()
-            
-            frame.grid(row=row, column=col, padx=self.padding, pady=self.padding)
-        except Exception as e:
-            print(f"Error loading icon for {path.name}: {e}")
-            
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in ICON_EXTENSIONS:
+                        stat = entry.stat()
+                        items.append((Path(entry.path), (entry.path, stat.st_mtime_ns, stat.st_size, self.icon_size)))
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Cannot list {directory}: {e}")
+        items.sort(key=lambda item: item[0].name.lower())
+        
+        self.directory = Path(directory)
+        if items == self._items:
+            return
+        self._items = items
+        positions = {path: (index, key) for index, (path, key) in enumerate(items)}
+        for path, tile in list(self._tiles.items()):
+            index, key = positions.get(path, (None, None))
+            if key != tile.key:
+                # Gone, or changed on disk so its thumbnail is stale
+                self._drop(path)
+            elif index != tile.index:
+                tile.index = index
+                self._place(tile)
+        self._layout(force=True)
+    
+    def close(self):
+        """Stop background loading; call before destroying the parent"""
+        if self._poll_id is not None:
+            self.canvas.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.loader.shutdown()
+    
+    def _on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self._render_visible()
+    
+    def _layout(self, force: bool = False):
+        columns = max(1, self.canvas.winfo_width() // self._tile_width)
+        if columns != self._columns:
+            self._columns = columns
+            for tile in self._tiles.values():
+                self._place(tile)
+        elif not force:
+            self._render_visible()
+            return
+        rows = -(-len(self._items) // columns)
+        self.canvas.configure(scrollregion=(0, 0, columns * self._tile_width, rows * self._tile_height))
+        self._render_visible()
+    
+    def _render_visible(self):
+        """Create tiles for the rows in view and drop the ones scrolled away"""
+        columns = self._columns or 1
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(0, int(top // self._tile_height) - 1) * columns
+        last = min(len(self._items), (int(bottom // self._tile_height) + 2) * columns)
+        visible = {path for path, _ in self._items[first:last]}
+        
+        for path in [path for path in self._tiles if path not in visible]:
+            self._drop(path)
+        for index in range(first, last):
+            path, key = self._items[index]
+            if path not in self._tiles:
+                self._create_tile(index, path, key)
+    
+    def _create_tile(self, index: int, path: Path, key: ThumbKey):
+        image = self.cache.peek(key)
+        photo = ImageTk.PhotoImage(image) if image is not None else None
+        name = path.stem if len(path.stem) <= 16 else path.stem[:15] + '…'
+        tile = _Tile(
+            index, key,
+            self.canvas.create_image(0, 0, image=photo or self._placeholder, anchor='n'),
+            self.canvas.create_text(0, 0, text=name, anchor='n'),
+            photo
+        )
+        self._tiles[path] = tile
+        self._place(tile)
+        if photo is None:
+            self.loader.request(path, key)
+            self._schedule_poll()
+    
+    def _place(self, tile: _Tile):
+        columns = self._columns or 1
+        x = (tile.index % columns) * self._tile_width + self._tile_width // 2
+        y = (tile.index // columns) * self._tile_height + self.padding
+        self.canvas.coords(tile.image_id, x, y)
+        self.canvas.coords(tile.text_id, x, y + self.icon_size + 4)
+    
+    def _drop(self, path: Path):
+        tile = self._tiles.pop(path)
+        self.canvas.delete(tile.image_id, tile.text_id)
+        if tile.photo is None:
+            self.loader.cancel(tile.key)
+    
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.canvas.after(30, self._drain)
+    
+    def _drain(self):
+        """Swap finished thumbnails into their tiles; runs on the Tk thread"""
+        self._poll_id = None
+        for path, key, image in self.loader.poll():
+            tile = self._tiles.get(path)
+            if tile is None or tile.key != key or image is None:
+                continue
+            tile.photo = ImageTk.PhotoImage(image)
+            self.canvas.itemconfigure(tile.image_id, image=tile.photo)
+        if self.loader.pending:
+            self._schedule_poll()
+    
     def _get_icon_path(self, path: Path) -> Path:
         # Implement icon extraction logic
         return Path("default_icon.png")
\ No newline at end of file
@@ -1,9 +1,17 @@
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
+from typing import Dict, Iterable, Tuple
 from PIL import Image, ImageTk
 from modules.core_organizer import DesktopOrganizer
 from modules.workspace_manager import WorkspaceManager
+from modules.progress import ProgressEvent
+
+POLL_MS = 100
+TILE_COLUMNS = 4
 
 class DesktopOrganizerGUI:
     def __init__(self, master):
@@ -11,6 +19,11 @@ class DesktopOrganizerGUI:
         self.organizer = DesktopOrganizer()
         self.workspace_mgr = WorkspaceManager()
         self.current_workspace = "default"
+        self.desktop = Path.home() / "Desktop"
+        self._worker = None
+        self._events = queue.Queue()
+        self._cancel = threading.Event()
+        self._tiles: Dict[str, Tuple[tk.Label, int]] = {}
         
         self._setup_ui()
         self._load_current_state()
@@ -46,8 +59,15 @@ class DesktopOrganizerGUI:
         
         # Toolbar
         toolbar = ttk.Frame(org_frame)
-        ttk.Button(toolbar, text="Organize Now", command=self.organize_now).pack(side=tk.LEFT)
+        self.organize_button = ttk.Button(toolbar, text="Organize Now", command=self.organize_now)
+        self.organize_button.pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(toolbar, text="Cancel", command=self.cancel_organize, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT)
         ttk.Button(toolbar, text="Add Rule", command=self.add_rule).pack(side=tk.LEFT)
+        self.progress_bar = ttk.Progressbar(toolbar, mode='indeterminate', length=200)
+        self.progress_bar.pack(side=tk.LEFT, padx=10)
+        self.status = ttk.Label(toolbar, text="")
+        self.status.pack(side=tk.LEFT)
         
         toolbar.pack(fill=tk.X)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -56,16 +76,108 @@ class DesktopOrganizerGUI:
         self.notebook.add(org_frame, text="Organization")
     
     def organize_now(self):
-        desktop = Path.home() / "Desktop"
+        """Start organizing on a worker thread; progress comes back through a queue"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._cancel.clear()
+        self.organize_button.configure(state=tk.DISABLED)
+        self.cancel_button.configure(state=tk.NORMAL)
+        self.progress_bar.configure(mode='indeterminate')
+        self.progress_bar.start()
+        self.status.configure(text="Starting...")
+        self._worker = threading.Thread(target=self._organize_worker, name='organize', daemon=True)
+        self._worker.start()
+        self.master.after(POLL_MS, self._poll_progress)
+        
+    def cancel_organize(self):
+        self._cancel.set()
+        self.cancel_button.configure(state=tk.DISABLED)
+        self.status.configure(text="Cancelling...")
+        
+    def _organize_worker(self):
+        # Runs off the Tk thread, so it only talks to the GUI through the queue
         try:
-            self.organizer.organize(desktop)
-            messagebox.showinfo("Success", "Desktop organized successfully!")
-            self._refresh_view()
+            report = self.organizer.organize(self.desktop, progress=self._events.put, cancel=self._cancel)
+            self._events.put(('done', report))
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            self._events.put(('error', e))
+            
+    def _poll_progress(self):
+        latest = None
+        outcome = None
+        while True:
+            try:
+                item = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, ProgressEvent):
+                latest = item
+            else:
+                outcome = item
+        if latest is not None:
+            self._show_progress(latest)
+        if outcome is None:
+            self.master.after(POLL_MS, self._poll_progress)
+            return
             
-    def _refresh_view(self):
-        # Update visual representation
-        pass
+        self.progress_bar.stop()
+        self.organize_button.configure(state=tk.NORMAL)
+        self.cancel_button.configure(state=tk.DISABLED)
+        kind, value = outcome
+        if kind == 'error':
+            self.status.configure(text="Failed")
+            messagebox.showerror("Error", str(value))
+            self._refresh_view()
+            return
+        moved = value.moved
+        self._refresh_view({r.category for r in moved} | {r.src.parent.name for r in moved})
+        if value.cancelled:
+            self.status.configure(text=f"Cancelled after {len(moved)} file(s)")
+        else:
+            self.status.configure(text=f"Organized {len(moved)} file(s)")
+            messagebox.showinfo("Success", "Desktop organized successfully!")
+            
+    def _show_progress(self, event: ProgressEvent):
+        if event.total:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode='determinate', maximum=event.total, value=event.done)
+        text = f"{event.stage.capitalize()}: {event.done}"
+        if event.total:
+            text += f"/{event.total}"
+        text += f" files ({event.rate:.0f}/s)"
+        if event.path is not None:
+            text += f" - {event.path.name}"
+        self.status.configure(text=text)
+        
+    def _load_current_state(self):
+        self._refresh_view()
+        
+    def _refresh_view(self, categories: Iterable[str] = None):
+        """Redraw the category tiles, only touching those whose file count changed"""
+        names = list(self.organizer.config['categories'])
+        if categories is not None:
+            names = [name for name in names if name in categories]
+        for name in names:
+            count = self._count_files(self.desktop / name)
+            tile = self._tiles.get(name)
+            if tile is not None and tile[1] == count:
+                continue
+            if tile is None:
+                index = len(self._tiles)
+                color = self.organizer.config['categories'][name].get('color', '#dddddd')
+                label = tk.Label(self.scrollable_frame, bg=color, width=18, height=4, relief=tk.RIDGE)
+                label.grid(row=index // TILE_COLUMNS, column=index % TILE_COLUMNS, padx=10, pady=10)
+            else:
+                label = tile[0]
+            label.configure(text=f"{name}\n{count} file(s)")
+            self._tiles[name] = (label, count)
+            
+    @staticmethod
+    def _count_files(folder: Path) -> int:
+        try:
+            with os.scandir(folder) as entries:
+                return sum(1 for entry in entries if not entry.name.startswith('.') and entry.is_file())
+        except OSError:
+            return 0
     
     # Additional UI components and methods would follow...
\ No newline at end of file
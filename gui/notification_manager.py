@@ -1,8 +1,5 @@
-import tkinter as tk
-from tkinter import messagebox
-from plyer import notification
-import winsound
-
+# plyer, winsound and tkinter are imported on first use so headless
+# callers that never show a notification don't pay for them
 class NotificationManager:
     def __init__(self):
         self.enabled = True
@@ -11,17 +8,29 @@ class NotificationManager:
     def show_notification(self, title: str, message: str, duration: int = 5):
         if self.enabled:
             try:
+                from plyer import notification
                 notification.notify(
                     title=title,
                     message=message,
                     timeout=duration
                 )
                 if self.sound_enabled:
-                    winsound.MessageBeep()
+                    self._beep()
             except Exception as e:
                 self._fallback_notification(title, message)
                 
+    @staticmethod
+    def _beep():
+        try:
+            import winsound
+        except ImportError:
+            # Windows only
+            return
+        winsound.MessageBeep()
+                
     def _fallback_notification(self, title: str, message: str):
+        import tkinter as tk
+        from tkinter import messagebox
         root = tk.Tk()
         root.withdraw()
         messagebox.showinfo(title, message)
@@ -1,24 +1,103 @@
 import sys
+import signal
 import argparse
+import threading
 from pathlib import Path
-from gui.main_window import DesktopOrganizerGUI
-import tkinter as tk
+
+def run_monitor(organizer, paths, metrics_port=None) -> int:
+    """Watch ``paths`` until SIGINT/SIGTERM, optionally serving metrics"""
+    from modules.metrics import REGISTRY
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+        
+    organizer.start_monitoring(paths)
+    watched = organizer.monitor.paths
+    if not watched:
+        print("None of the given folders exist", file=sys.stderr)
+        organizer.stop_monitoring()
+        return 1
+    if metrics_port:
+        REGISTRY.serve(metrics_port)
+    print(f"Watching {', '.join(map(str, watched))}", file=sys.stderr)
+    try:
+        while not stop.wait(1.0):
+            pass
+    finally:
+        organizer.stop_monitoring()
+        REGISTRY.stop_serving()
+    return 0
 
 def main():
     parser = argparse.ArgumentParser(description="Desktop Organization Suite")
     parser.add_argument('--gui', action='store_true', help='Launch graphical interface')
-    parser.add_argument('--workspace', type=str, help='Set active workspace')
+    parser.add_argument('--workspace', type=str, help='Set active workspace, moving files into its saved layout')
+    parser.add_argument('--save-workspace', type=str, metavar='NAME', help='Save the current Desktop layout as this workspace')
+    parser.add_argument('--rebuild', action='store_true', help='Empty all categories and re-sort from scratch')
+    parser.add_argument('--monitor', nargs='*', metavar='PATH', help='Run headless, organizing new files in these folders (default: Desktop)')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this port while monitoring')
+    parser.add_argument('--undo', action='store_true', help='Reverse the moves of the last organize run')
+    parser.add_argument('--recursive', action='store_true', default=None, help='Also collect files from subfolders')
+    parser.add_argument('--dry-run', action='store_true', help='Print the plan instead of changing anything')
+    parser.add_argument('--plan-format', choices=['diff', 'json'], default='diff', help='Output format for --dry-run')
+    parser.add_argument('--plan-out', type=str, metavar='FILE', help='Save the dry-run plan as JSON')
+    parser.add_argument('--apply-plan', type=str, metavar='FILE', help='Carry out a plan saved with --plan-out')
+    parser.add_argument('--profile', type=str, metavar='FILE', help="Profile the run with cProfile; '-' prints the top entries")
+    parser.add_argument('--metrics-json', type=str, metavar='FILE', help='Write run metrics to a JSON file')
     args = parser.parse_args()
     
     if args.gui:
+        # The GUI stack is only imported when asked for; cron runs never load it
+        import tkinter as tk
+        from gui.main_window import DesktopOrganizerGUI
         root = tk.Tk()
         app = DesktopOrganizerGUI(root)
         root.mainloop()
     else:
         from modules.core_organizer import DesktopOrganizer
+        from modules.metrics import REGISTRY, profile_run
         organizer = DesktopOrganizer()
         desktop_path = Path.home() / "Desktop"
-        organizer.organize(desktop_path)
+        if args.monitor is not None:
+            return run_monitor(organizer, [Path(p) for p in args.monitor] or [desktop_path], args.metrics_port)
+        if args.undo:
+            report = organizer.undo(desktop_path)
+            for result in report.failed:
+                print(f"Failed to restore {result.src.name}: {result.error}", file=sys.stderr)
+            return 1 if report.failed else 0
+        if args.save_workspace:
+            from modules.workspace_manager import WorkspaceManager
+            with WorkspaceManager() as workspaces:
+                count = workspaces.save_layout(args.save_workspace, desktop_path)
+            print(f"Saved the layout of {count} files as {args.save_workspace}", file=sys.stderr)
+            return 0
+        if args.dry_run or args.plan_out:
+            plan = organizer.plan(desktop_path, rebuild=args.rebuild, recursive=args.recursive)
+            if args.plan_out:
+                Path(args.plan_out).write_text(plan.to_json())
+            if args.dry_run:
+                print(plan.to_json() if args.plan_format == 'json' else plan.render())
+            return 0
+        if args.apply_plan:
+            from modules.planner import MovePlan
+            report = organizer.apply_plan(MovePlan.from_json(Path(args.apply_plan).read_text()))
+        elif args.workspace:
+            try:
+                report = organizer.switch_workspace(desktop_path, args.workspace)
+            except ValueError as e:
+                print(str(e), file=sys.stderr)
+                return 1
+        elif args.profile:
+            output = None if args.profile == '-' else args.profile
+            report = profile_run(organizer.organize, desktop_path, rebuild=args.rebuild,
+                                 recursive=args.recursive, output=output)
+        else:
+            report = organizer.organize(desktop_path, rebuild=args.rebuild, recursive=args.recursive)
+        if args.metrics_json:
+            REGISTRY.export_json(Path(args.metrics_json))
+        for result in report.failed:
+            print(f"Failed to move {result.src.name}: {result.error}", file=sys.stderr)
+        return 1 if report.failed else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -2,12 +2,17 @@
 Desktop Organizer Core Modules
 """
 
-from .core_organizer import DesktopOrganizer
-from .security import FileVault
-from .rule_engine import RuleEngine
-from .scheduler import TaskScheduler
-from .workspace_manager import WorkspaceManager
-from modules import file_handler
+import importlib
+
+# Public names resolve on first access, so importing the package (or one
+# submodule) doesn't drag in watchdog, cryptography or sqlite3
+_LAZY = {
+    'DesktopOrganizer': 'core_organizer',
+    'FileVault': 'security',
+    'RuleEngine': 'rule_engine',
+    'TaskScheduler': 'scheduler',
+    'WorkspaceManager': 'workspace_manager'
+}
 
 __all__ = [
     'DesktopOrganizer',
@@ -15,4 +20,16 @@ __all__ = [
     'RuleEngine',
     'TaskScheduler',
     'WorkspaceManager'
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    if name == 'file_handler':
+        return importlib.import_module('.file_handler', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
\ No newline at end of file
@@ -0,0 +1,108 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+UNCATEGORIZED = 'Uncategorized'
+EXECUTABLE_FALLBACK = 'Executables'
+_NO_MATCH = float('inf')
+
+def split_name(name: str) -> Tuple[str, str]:
+    """Split a file name into (stem, suffix) the same way pathlib does"""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ''
+
+class PatternMatcher:
+    """Aho-Corasick automaton over substring patterns.
+
+    Each pattern carries a priority; ``best`` returns the lowest priority of
+    any pattern found in the text, so scanning cost depends on the text
+    length and not on how many patterns were compiled in.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[float] = [_NO_MATCH]
+        self._fail: List[int] = [0]
+
+        for pattern, priority in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._out.append(_NO_MATCH)
+                    self._fail.append(0)
+                    self._goto[state][ch] = nxt
+                state = nxt
+            if priority < self._out[state]:
+                self._out[state] = priority
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]] < self._out[nxt]:
+                    self._out[nxt] = self._out[self._fail[nxt]]
+
+    def best(self, text: str) -> float:
+        goto, fail, out = self._goto, self._fail, self._out
+        best = out[0]
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state] < best:
+                best = out[state]
+                if best == 0:
+                    break
+        return best
+
+class CategoryClassifier:
+    """Lookup structures compiled once from the categories config.
+
+    Gives the same first-match-wins answers as walking ``categories`` and
+    ``executable_rules`` in order.
+    """
+
+    def __init__(self, config: Dict):
+        self.suffix_map: Dict[str, str] = {}
+        for category, data in config.get('categories', {}).items():
+            for ext in data.get('extensions', []):
+                self.suffix_map.setdefault(ext, category)
+
+        self.executable_categories = list(config.get('executable_rules', {}))
+        self.executable_matcher = PatternMatcher(
+            (pattern, idx)
+            for idx, patterns in enumerate(config.get('executable_rules', {}).values())
+            for pattern in patterns
+        )
+
+    def classify(self, file: Path) -> str:
+        return self.classify_name(file.name)
+
+    def classify_name(self, name: str) -> str:
+        stem, suffix = split_name(name)
+        suffix = suffix.lower()
+        if suffix == '.exe':
+            return self.classify_executable(stem)
+        return self.suffix_map.get(suffix, UNCATEGORIZED)
+
+    def classify_executable(self, stem: str) -> str:
+        idx = self.executable_matcher.best(stem.lower())
+        if idx == _NO_MATCH:
+            return EXECUTABLE_FALLBACK
+        return self.executable_categories[idx]
\ No newline at end of file
@@ -0,0 +1,203 @@
+import re
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+from .classifier import CategoryClassifier
+from .rule_engine import RulePlan
+from .manifest import DirectoryManifest
+
+# Defaults resolve against the package, not the working directory, so cron
+# jobs and services started elsewhere find the same files
+CONFIG_DIR = Path(__file__).resolve().parent.parent / 'config'
+CATEGORIES_FILE = 'categories.json'
+RULES_FILE = 'rules.json'
+WORKSPACES_FILE = 'workspace_settings.json'
+ACTION_TYPES = ('move', 'encrypt', 'duplicate', 'notify')
+
+class ConfigError(RuntimeError):
+    """A config file is missing, unreadable or fails validation"""
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One consistent, validated view of all config files plus what is compiled from them"""
+    version: int
+    config: Dict
+    rules: Tuple[Dict, ...]
+    workspaces: Dict
+    classifier: CategoryClassifier = field(repr=False)
+    rule_plan: RulePlan = field(repr=False)
+    fingerprint: str = ''
+    loaded_at: float = 0.0
+
+def _read_json(path: Path, default=None):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        if default is not None:
+            return default
+        raise ConfigError(f"Config load failed: {path} not found")
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"Config load failed: {path}: {str(e)}")
+
+def validate_categories(config: Dict) -> None:
+    if not isinstance(config, dict) or not isinstance(config.get('categories'), dict):
+        raise ConfigError("categories config needs a 'categories' object")
+    for name, data in config['categories'].items():
+        if not isinstance(data, dict):
+            raise ConfigError(f"Category {name!r} must be an object")
+        extensions = data.get('extensions', [])
+        if not isinstance(extensions, list) or not all(isinstance(e, str) and e.startswith('.') for e in extensions):
+            raise ConfigError(f"Category {name!r}: extensions must be a list like ['.pdf']")
+        for key in ('color', 'icon'):
+            if key not in data:
+                raise ConfigError(f"Category {name!r} is missing {key!r}")
+    for name, patterns in config.get('executable_rules', {}).items():
+        if not isinstance(patterns, list) or not all(isinstance(p, str) and p for p in patterns):
+            raise ConfigError(f"Executable rule {name!r} must be a list of non-empty strings")
+    workers = config.get('move_workers', 4)
+    if not isinstance(workers, int) or workers < 1:
+        raise ConfigError("move_workers must be a positive integer")
+
+def validate_rules(rules: List[Dict]) -> None:
+    if not isinstance(rules, list):
+        raise ConfigError("rules config must be a list")
+    for i, rule in enumerate(rules):
+        name = rule.get('name', f'#{i}') if isinstance(rule, dict) else f'#{i}'
+        action = rule.get('action') if isinstance(rule, dict) else None
+        if not isinstance(action, dict) or action.get('type') not in ACTION_TYPES:
+            raise ConfigError(f"Rule {name!r}: action type must be one of {', '.join(ACTION_TYPES)}")
+        if action['type'] in ('move', 'duplicate') and action.get('mode', 'move') == 'move' and not action.get('destination'):
+            raise ConfigError(f"Rule {name!r}: {action['type']} action needs a destination")
+        if action['type'] == 'notify' and 'message' not in action:
+            raise ConfigError(f"Rule {name!r}: notify action needs a message")
+        pattern = rule.get('conditions', {}).get('name_pattern')
+        if pattern is not None:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ConfigError(f"Rule {name!r}: bad name_pattern: {str(e)}")
+
+def validate_workspaces(workspaces: Dict, rules: List[Dict]) -> None:
+    if not isinstance(workspaces, dict):
+        raise ConfigError("workspace settings must be an object")
+    rule_names = {rule.get('name') for rule in rules}
+    for name, workspace in workspaces.items():
+        if not isinstance(workspace, dict):
+            raise ConfigError(f"Workspace {name!r} must be an object")
+        if not isinstance(workspace.get('rules', []), list):
+            raise ConfigError(f"Workspace {name!r}: rules must be a list of rule names")
+        # Rules files are swapped independently, so a dangling name is only worth a warning
+        unknown = [rule for rule in workspace.get('rules', []) if rule not in rule_names]
+        if unknown:
+            logging.getLogger(__name__).warning(f"Workspace {name!r} refers to unknown rules: {', '.join(unknown)}")
+
+class ConfigService:
+    """Loads, validates and compiles the config files, and reloads them on change.
+
+    Readers take ``snapshot`` and use it for a whole operation; a reload
+    builds and validates a complete new snapshot before swapping it in with
+    a single assignment, so nobody ever sees half-updated config. A reload
+    that fails validation is logged and the previous snapshot stays live.
+    Instances are shared per set of paths through ``shared``.
+    """
+
+    _shared: Dict[Tuple[Path, Path, Path], 'ConfigService'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, categories_path: str = None, rules_path: str = None, workspaces_path: str = None):
+        self.categories_path = Path(categories_path) if categories_path else CONFIG_DIR / CATEGORIES_FILE
+        self.rules_path = Path(rules_path) if rules_path else CONFIG_DIR / RULES_FILE
+        self.workspaces_path = Path(workspaces_path) if workspaces_path else CONFIG_DIR / WORKSPACES_FILE
+        self._lock = threading.Lock()
+        self._stamps = self._stat_all()
+        self._snapshot = self._build(1)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def shared(cls, categories_path: str = None, rules_path: str = None,
+               workspaces_path: str = None) -> 'ConfigService':
+        """The process-wide service for these paths, created on first use"""
+        key = tuple(
+            Path(path).resolve() if path else CONFIG_DIR / default
+            for path, default in ((categories_path, CATEGORIES_FILE), (rules_path, RULES_FILE),
+                                  (workspaces_path, WORKSPACES_FILE))
+        )
+        with cls._shared_lock:
+            service = cls._shared.get(key)
+            if service is None:
+                service = cls._shared[key] = cls(*key)
+        return service
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    def _stat_all(self) -> Tuple:
+        stamps = []
+        for path in (self.categories_path, self.rules_path, self.workspaces_path):
+            try:
+                stat = path.stat()
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _build(self, version: int) -> ConfigSnapshot:
+        categories = _read_json(self.categories_path)
+        validate_categories(categories)
+        rules = _read_json(self.rules_path, [])
+        validate_rules(rules)
+        workspaces = _read_json(self.workspaces_path, {})
+        validate_workspaces(workspaces, rules)
+        return ConfigSnapshot(
+            version=version,
+            config=categories,
+            rules=tuple(rules),
+            workspaces=workspaces,
+            classifier=CategoryClassifier(categories),
+            rule_plan=RulePlan.compile(rules),
+            fingerprint=DirectoryManifest.fingerprint(categories),
+            loaded_at=time.time()
+        )
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild the snapshot if any file changed; returns True if a new one was swapped in"""
+        with self._lock:
+            stamps = self._stat_all()
+            if stamps == self._stamps and not force:
+                return False
+            self._stamps = stamps
+            try:
+                snapshot = self._build(self._snapshot.version + 1)
+            except ConfigError as e:
+                logging.getLogger(__name__).error(f"Keeping previous config: {str(e)}")
+                return False
+            self._snapshot = snapshot
+        logging.getLogger(__name__).info(f"Config reloaded (version {snapshot.version})")
+        return True
+
+    def watch(self, interval: float = 5.0) -> None:
+        """Poll the files every ``interval`` seconds on a daemon thread; idempotent"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll, args=(interval,), name='config-watch', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread:
+            thread.join()
+
+    def _poll(self, interval: float) -> None:
+        # One stat per file per interval; nothing is parsed unless a stamp moved
+        while not self._stop.wait(interval):
+            self.reload()
\ No newline at end of file
@@ -0,0 +1,191 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from .metrics import REGISTRY
+
+CACHE_NAME = '.organizer_sniff.json'
+CACHE_VERSION = 1
+READ_BYTES = 4096
+
+# (parts, extension): every (offset, magic) part must match
+SIGNATURES: List[Tuple[Tuple[Tuple[int, bytes], ...], str]] = [
+    (((0, b'%PDF-'),), '.pdf'),
+    (((0, b'{\\rtf'),), '.rtf'),
+    (((0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),), '.doc'),
+    (((0, b'PK\x03\x04'),), '.zip'),
+    (((0, b'Rar!\x1a\x07'),), '.rar'),
+    (((0, b"7z\xbc\xaf'\x1c"),), '.7z'),
+    (((0, b'\x1f\x8b\x08'),), '.gz'),
+    (((0, b'\x89PNG\r\n\x1a\n'),), '.png'),
+    (((0, b'\xff\xd8\xff'),), '.jpg'),
+    (((0, b'GIF87a'),), '.gif'),
+    (((0, b'GIF89a'),), '.gif'),
+    (((0, b'RIFF'), (8, b'WEBP')), '.webp'),
+    (((0, b'RIFF'), (8, b'WAVE')), '.wav'),
+    (((0, b'RIFF'), (8, b'AVI ')), '.avi'),
+    (((0, b'ID3'),), '.mp3'),
+    (((0, b'\xff\xfb'),), '.mp3'),
+    (((0, b'\xff\xf3'),), '.mp3'),
+    (((0, b'OggS'),), '.ogg'),
+    (((0, b'fLaC'),), '.flac'),
+    (((0, b'\x1a\x45\xdf\xa3'),), '.mkv'),
+    (((4, b'ftypqt'),), '.mov'),
+    (((4, b'ftyp'),), '.mp4'),
+    (((0, b'MZ'),), '.exe'),
+]
+
+# Office Open XML files are zips whose first entries name their part folders
+ZIP_MEMBERS = ((b'word/', '.docx'), (b'xl/', '.xlsx'), (b'ppt/', '.pptx'))
+
+SNIFF_LOOKUPS = REGISTRY.counter('organizer_sniff_lookups_total', 'Content sniff lookups, by cache result')
+SNIFF_DETECTED = REGISTRY.counter('organizer_sniff_detected_total', 'Files typed from their content, by extension')
+
+def _build_table(signatures) -> Tuple[Dict[bytes, List], List]:
+    """Index signatures by their first two bytes at offset 0, most specific first"""
+    table: Dict[bytes, List] = {}
+    floating = []
+    for parts, ext in signatures:
+        lead = next((magic[:2] for offset, magic in parts if offset == 0 and len(magic) >= 2), None)
+        if lead is None:
+            floating.append((parts, ext))
+        else:
+            table.setdefault(lead, []).append((parts, ext))
+    specificity = lambda sig: -sum(len(magic) for _, magic in sig[0])
+    for candidates in table.values():
+        candidates.sort(key=specificity)
+    floating.sort(key=specificity)
+    return table, floating
+
+_TABLE, _FLOATING = _build_table(SIGNATURES)
+
+def detect(head: bytes) -> str:
+    """Extension implied by a file's leading bytes, or '' when unknown"""
+    for candidates in (_TABLE.get(head[:2], ()), _FLOATING):
+        for parts, ext in candidates:
+            if all(head[offset:offset + len(magic)] == magic for offset, magic in parts):
+                if ext == '.zip':
+                    for member, office_ext in ZIP_MEMBERS:
+                        if member in head:
+                            return office_ext
+                return ext
+    return ''
+
+class SniffCache:
+    """Sniff results for one directory keyed by inode, size and mtime.
+
+    A rename keeps the inode, so files moved into containers stay cached.
+    Entries are kept in least-recently-used order and trimmed on save.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 50000):
+        self.path = directory / CACHE_NAME
+        self.max_entries = max_entries
+        self.entries: Dict[str, str] = {}
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def key(stat: os.stat_result) -> str:
+        return f"{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.entries = data.get('entries', {})
+
+    def get(self, key: str) -> Optional[str]:
+        ext = self.entries.pop(key, None)
+        if ext is not None:
+            self.entries[key] = ext
+        return ext
+
+    def put(self, key: str, ext: str) -> None:
+        self.entries[key] = ext
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        excess = len(self.entries) - self.max_entries
+        if excess > 0:
+            for key in list(self.entries)[:excess]:
+                del self.entries[key]
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+class ContentSniffer:
+    """Detects file types from magic bytes for files the name can't classify"""
+
+    def __init__(self, read_bytes: int = READ_BYTES, max_workers: int = 4, max_cache_entries: int = 50000):
+        self.read_bytes = read_bytes
+        self.max_workers = max(1, max_workers)
+        self.max_cache_entries = max_cache_entries
+        self._caches: Dict[Path, SniffCache] = {}
+        self._lock = threading.Lock()
+
+    def _cache(self, directory: Path) -> SniffCache:
+        with self._lock:
+            cache = self._caches.get(directory)
+            if cache is None:
+                cache = self._caches[directory] = SniffCache(directory, self.max_cache_entries)
+            return cache
+
+    def _read(self, file: Path) -> Optional[str]:
+        """Detected extension, or None if the file couldn't be read this time"""
+        try:
+            with open(file, 'rb') as f:
+                return detect(f.read(self.read_bytes))
+        except OSError:
+            return None
+
+    def sniff_many(self, directory: Path, files: Iterable[Tuple[Path, os.stat_result]]) -> Dict[Path, str]:
+        """Map each file to its detected extension ('' if unknown), reading only cache misses"""
+        cache = self._cache(directory)
+        results: Dict[Path, str] = {}
+        misses = []
+        with self._lock:
+            for file, stat in files:
+                key = SniffCache.key(stat)
+                ext = cache.get(key)
+                if ext is None:
+                    misses.append((file, key))
+                else:
+                    results[file] = ext
+        SNIFF_LOOKUPS.inc(len(results), result='hit')
+        if not misses:
+            return results
+        SNIFF_LOOKUPS.inc(len(misses), result='miss')
+
+        if len(misses) == 1 or self.max_workers == 1:
+            detected = [self._read(file) for file, _ in misses]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(misses))) as pool:
+                detected = list(pool.map(self._read, [file for file, _ in misses]))
+
+        with self._lock:
+            for (file, key), ext in zip(misses, detected):
+                if ext is None:
+                    # Locked or unreadable for now: leave it uncached so the next run retries
+                    results[file] = ''
+                    continue
+                cache.put(key, ext)
+                results[file] = ext
+                if ext:
+                    SNIFF_DETECTED.inc(ext=ext)
+        return results
+
+    def save(self) -> None:
+        """Persist every cache that picked up new results"""
+        with self._lock:
+            for cache in self._caches.values():
+                cache.save()
\ No newline at end of file
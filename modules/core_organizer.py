@@ -1,67 +1,354 @@
+import os
 import json
 import shutil
 import logging
+import contextlib
+import functools
+import threading
+from stat import S_ISREG
 from pathlib import Path
-from typing import Dict, List, Callable
-from watchdog.observers import Observer
+from typing import Dict, Iterator, List, Callable, Optional, Tuple
 from .security import FileVault
 from .rule_engine import RuleEngine
-from .file_handler import FileMonitor
+from .duplicates import DuplicateReport
+from .manifest import DirectoryManifest
+from .classifier import CategoryClassifier, UNCATEGORIZED
+from .config_service import ConfigService, ConfigSnapshot
+from .content_sniffer import ContentSniffer, READ_BYTES
+from .move_executor import MoveExecutor, MoveReport, MoveResult
+from .journal import ActiveRun, JournalEntry, MoveJournal, UNDO_PREFIX
+from .planner import MovePlan, Planner
+from .progress import ProgressEvent, ProgressTracker
+from .notifications import NotificationDispatcher
+from .reconciler import Reconciler
+from .scheduler import TaskScheduler
+from .scanner import IGNORE_FILE, IgnoreRules, scan_tree
+from .metrics import REGISTRY
+
+FILES_SCANNED = REGISTRY.counter('organizer_files_scanned_total', 'Directory entries examined')
+FILES_CLASSIFIED = REGISTRY.counter('organizer_files_classified_total', 'Files classified, by category')
+FILES_MOVED = REGISTRY.counter('organizer_files_moved_total', 'Files moved into a category, by category')
+MOVE_FAILURES = REGISTRY.counter('organizer_move_failures_total', 'Category moves that failed')
+ERRORS = REGISTRY.counter('organizer_errors_total', 'Reset, rule and encryption errors, by stage')
+STAGE_SECONDS = REGISTRY.histogram('organizer_stage_seconds', 'Wall time per organize stage')
+CLASSIFY_BATCH = 256
+
+def _pinned(method):
+    """Run ``method`` against one config snapshot even if a reload lands midway"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self._local, 'snapshot', None) is not None:
+            return method(self, *args, **kwargs)
+        self._local.snapshot = self.config_service.snapshot
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._local.snapshot = None
+    return wrapper
 
 class DesktopOrganizer:
-    def __init__(self, config_path: str = "config/categories.json"):
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path: str = None, config_service: ConfigService = None):
+        # Worker counts, collision policy, notifications and the like are read
+        # once here; categories, rules and scan options follow config reloads
+        self.config_service = config_service or ConfigService.shared(config_path)
+        self._local = threading.local()
+        self.sniffer = self._create_sniffer(self.config.get('content_sniffing', {}))
+        self.executor = MoveExecutor(
+            self.config.get('move_workers', 4),
+            self.config.get('collision_policy', 'rename')
+        )
         self.vault = FileVault()
-        self.rule_engine = RuleEngine()
+        notifications = self.config.get('notifications', {})
+        self.notifier = NotificationDispatcher(
+            notifications.get('backend', 'auto'),
+            notifications.get('window', 2.0),
+            notifications.get('max_per_minute', 6)
+        )
+        duplicates = self.config.get('duplicates', {})
+        self.rule_engine = RuleEngine(
+            hash_workers=duplicates.get('hash_workers', 4),
+            hash_cache=duplicates.get('hash_cache'),
+            notifier=self.notifier,
+            config=self
+        )
         self.logger = self._setup_logger()
         self.monitor = None
+        self.reconciler = None
+        self.scheduler = None
+        
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """The config in effect for the current operation on this thread"""
+        return getattr(self._local, 'snapshot', None) or self.config_service.snapshot
+        
+    @property
+    def config(self) -> Dict:
+        return self.snapshot.config
+        
+    @property
+    def classifier(self) -> CategoryClassifier:
+        return self.snapshot.classifier
         
     def start_monitoring(self, paths: List[Path], notification_callback: Callable = None):
         """Start monitoring specified paths for changes"""
+        # watchdog is only needed once monitoring starts
+        from .file_handler import FileMonitor
         if self.monitor:
-            self.monitor.stop()
+            self.stop_monitoring()
             
         self.monitor = FileMonitor(self, paths)
         self.monitor.start(notification_callback)
         
+        # Catch files whose events the OS dropped under bursts
+        monitor_config = self.config.get('monitor', {})
+        # Long-running monitors pick up config pushes without a restart
+        poll = monitor_config.get('config_poll_seconds', 5)
+        if poll:
+            self.config_service.watch(poll)
+        interval = monitor_config.get('reconcile_seconds', 60)
+        if interval:
+            self.reconciler = Reconciler(self.monitor, monitor_config.get('reconcile_grace', 10.0))
+            self.scheduler = TaskScheduler()
+            self.scheduler.add_interval_task(self.reconciler.run, interval / 60)
+            self.scheduler.start()
+        
     def stop_monitoring(self):
         """Stop all file monitoring"""
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+            self.reconciler = None
         if self.monitor:
             self.monitor.stop()
             self.monitor = None
+        self.notifier.close()
         
-    def _load_config(self, path: str) -> Dict:
-        try:
-            with open(path) as f:
-                return json.load(f)
-        except Exception as e:
-            raise RuntimeError(f"Config load failed: {str(e)}")
-    
-    def organize(self, directory: Path, rules: List[Dict] = None) -> None:
-        """Main organization workflow"""
+    def _setup_logger(self) -> logging.Logger:
+        return logging.getLogger(__name__)
+
+    @staticmethod
+    def _create_sniffer(options: Dict) -> Optional[ContentSniffer]:
+        if not options.get('enabled', False):
+            return None
+        return ContentSniffer(
+            options.get('read_bytes', READ_BYTES),
+            options.get('workers', 4),
+            options.get('max_cache_entries', 50000)
+        )
+
+    def _journal(self, directory: Path) -> Optional[MoveJournal]:
+        options = self.config.get('journal', {})
+        if not options.get('enabled', True):
+            return None
+        return MoveJournal.for_directory(
+            directory,
+            sync_every=options.get('sync_every', 256),
+            max_bytes=options.get('max_bytes', 8 * 1024 * 1024),
+            keep_runs=options.get('keep_runs', 1000)
+        )
+
+    @staticmethod
+    def _run_lock(journal: Optional[MoveJournal]):
+        # Journaled runs on one directory never overlap within this process, so
+        # a run that finds an unfinished one knows it crashed rather than racing it
+        return journal.lock if journal else contextlib.nullcontext()
+
+    @_pinned
+    def organize(self, directory: Path, rules: List[Dict] = None, rebuild: bool = False,
+                 recursive: bool = None, progress: Callable[[ProgressEvent], None] = None,
+                 cancel: threading.Event = None) -> MoveReport:
+        """Main organization workflow
+
+        By default only files that are new or changed since the last run are
+        touched. ``rebuild`` empties every container and re-sorts from scratch.
+        ``recursive`` also collects files from subfolders (defaults to the
+        ``scan`` config). ``progress`` receives throttled ProgressEvents,
+        possibly from worker threads; setting ``cancel`` stops the run before
+        the next file, leaving ``report.cancelled`` set. Returns the per-file
+        report of the category moves.
+        """
         self._validate_path(directory)
-        self._reset_desktop(directory)
-        self._create_containers(directory)
-        self._process_files(directory, rules)
+        manifest = DirectoryManifest(directory, self.snapshot.fingerprint)
+        if rules:
+            rules = self.rule_engine.plan_for(rules)
+        if recursive is None:
+            recursive = self.config.get('scan', {}).get('recursive', False)
+
+        journal = self._journal(directory)
+        tracker = ProgressTracker(progress, cancel) if progress or cancel else None
+        with self._run_lock(journal):
+            if journal:
+                self._resume(journal)
+            rebuild = rebuild or not manifest.load()
+            run = journal.begin('rebuild' if rebuild else 'organize') if journal else None
+            try:
+                if rebuild:
+                    report = self._rebuild(directory, rules, manifest, recursive, run, tracker)
+                else:
+                    report = self._organize_incremental(directory, rules, manifest, recursive, run, tracker)
+            finally:
+                if run:
+                    run.end()
+
+            try:
+                manifest.save()
+            except OSError as e:
+                self.logger.error(f"Manifest save failed: {str(e)}")
+        self._save_sniff_cache()
+        if tracker:
+            tracker.finish()
+        return report
+
+    @_pinned
+    def plan(self, directory: Path, rules: List[Dict] = None, rebuild: bool = False,
+             recursive: bool = None) -> MovePlan:
+        """Work out what ``organize`` would do with the same arguments, without touching the disk"""
+        return Planner(self).build(directory, rules, rebuild, recursive)
+
+    @_pinned
+    def apply_plan(self, plan: MovePlan) -> MoveReport:
+        """Carry out a plan from ``plan``, possibly made earlier and loaded from JSON"""
+        return Planner(self).apply(plan)
+
+    def _rebuild(self, directory: Path, rules: List[Dict], manifest: DirectoryManifest,
+                 recursive: bool = False, journal: ActiveRun = None,
+                 tracker: ProgressTracker = None) -> MoveReport:
+        if tracker:
+            tracker.stage('reset')
+        with STAGE_SECONDS.time(stage='reset'):
+            # A recursive scan collects subfolders itself, honouring the ignore rules
+            self._reset_desktop(directory, self._container_names() if recursive else None, journal)
+        with STAGE_SECONDS.time(stage='containers'):
+            self._create_containers(directory)
+        report = self._process_files(directory, rules, recursive, journal, tracker)
+
+        manifest.entries = {}
+        for category in self._container_names():
+            container = directory / category
+            if not container.is_dir():
+                continue
+            with os.scandir(container) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    manifest.record(f"{category}/{entry.name}", entry.stat(), category)
+        return report
+
+    def _organize_incremental(self, directory: Path, rules: List[Dict], manifest: DirectoryManifest,
+                              recursive: bool = False, journal: ActiveRun = None,
+                              tracker: ProgressTracker = None) -> MoveReport:
+        with STAGE_SECONDS.time(stage='containers'):
+            self._create_containers(directory)
+        if tracker:
+            tracker.stage('classify')
+        with STAGE_SECONDS.time(stage='classify'):
+            seen, moves = self._classify_incremental(directory, manifest, recursive)
+
+        report = self._execute_moves(moves, None, journal, tracker)
+        with STAGE_SECONDS.time(stage='rules'):
+            moved = report.moved
+            if tracker and rules:
+                tracker.stage('rules', len(moved))
+            try:
+                for result in moved:
+                    # A cancelled run still records what it moved, it just stops applying rules
+                    cancelled = tracker is not None and tracker.cancelled
+                    self._record_placed(report, manifest, seen, result.dest, result.category, result.stat,
+                                        None if cancelled else rules, journal)
+                    if tracker and rules:
+                        tracker.advance(path=result.dest, category=result.category)
+            finally:
+                duplicates = self._flush_rule_actions(journal)
+                self._forget_duplicates(manifest, duplicates, seen)
+
+        manifest.prune(seen)
+        return report
+
+    def _classify_incremental(self, directory: Path, manifest: DirectoryManifest,
+                              recursive: bool = False) -> Tuple[set, List[Tuple]]:
+        seen = set()
+        moves = []
+        changed = []
+
+        # Re-check files already sitting in containers; unchanged ones are skipped
+        for container in self._container_names():
+            container_path = directory / container
+            if not container_path.is_dir():
+                continue
+            with os.scandir(container_path) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    FILES_SCANNED.inc()
+                    rel_path = f"{container}/{entry.name}"
+                    stat = entry.stat()
+                    if manifest.is_current(rel_path, stat) == container:
+                        seen.add(rel_path)
+                        continue
+
+                    file = Path(entry.path)
+                    if self.vault.is_encrypted(file):
+                        continue
+                    changed.append((file, stat))
+
+        for (file, stat), category in zip(changed, self._categorize(directory, changed)):
+            container = file.parent.name
+            if category == container:
+                rel_path = f"{container}/{file.name}"
+                manifest.record(rel_path, stat, category)
+                seen.add(rel_path)
+                continue
+            moves.append((file, directory / category, category, stat))
+
+        # Loose files outside the containers are always new
+        moves.extend(self._classify_files(directory, recursive))
+        return seen, moves
+
+    def _record_placed(self, report: MoveReport, manifest: DirectoryManifest, seen: set, dest: Path,
+                       category: str, stat: os.stat_result, rules: List[Dict],
+                       journal: ActiveRun = None) -> None:
+        if rules and self._apply_rules(report, dest, rules, stat, journal) != dest:
+            # A rule moved or encrypted the file out of its container, or failed
+            return
+        rel_path = f"{category}/{dest.name}"
+        manifest.record(rel_path, stat, category)
+        seen.add(rel_path)
+
+    def _container_names(self) -> List[str]:
+        names = list(self.config['categories'])
+        names.extend(self.config.get('executable_rules', {}))
+        names.extend(['Executables', 'Uncategorized'])
+        return list(dict.fromkeys(names))
         
     def _validate_path(self, path: Path) -> None:
         if not path.exists() or not path.is_dir():
             raise ValueError(f"Invalid directory: {path}")
             
-    def _reset_desktop(self, directory: Path) -> None:
+    def _reset_desktop(self, directory: Path, only: List[str] = None, journal: ActiveRun = None) -> None:
         for item in directory.iterdir():
+            if only is not None and item.name not in only:
+                continue
             if item.is_dir() and item.name != 'System Volume Information':
-                self._empty_folder(item)
+                self._empty_folder(item, journal)
                 
-    def _empty_folder(self, folder: Path) -> None:
-        for file in folder.glob('*'):
+    def _empty_folder(self, folder: Path, journal: ActiveRun = None) -> None:
+        files = list(folder.glob('*'))
+        seqs = journal.planned([(file, folder.parent / file.name) for file in files]) if journal else None
+        done = []
+        for i, file in enumerate(files):
             try:
                 shutil.move(str(file), str(folder.parent))
+                if journal:
+                    done.append(seqs[i])
             except Exception as e:
+                ERRORS.inc(stage='reset')
                 self.logger.error(f"Reset failed for {file.name}: {str(e)}")
+        if journal:
+            journal.done(done)
         try:
             folder.rmdir()
         except Exception as e:
+            ERRORS.inc(stage='reset')
             self.logger.error(f"Folder removal failed: {str(e)}")
     
     def _create_containers(self, directory: Path) -> None:
@@ -73,50 +360,279 @@ class DesktopOrganizer:
                 'icon': self.config['categories'][category]['icon']
             }))
     
-    def _process_files(self, directory: Path, rules: List[Dict]) -> None:
-        for file in directory.iterdir():
-            if file.is_dir() or file.name.startswith('.'):
+    def _process_files(self, directory: Path, rules: List[Dict], recursive: bool = False,
+                       journal: ActiveRun = None, tracker: ProgressTracker = None) -> MoveReport:
+        # Classification is lazy and overlaps with the moves stage
+        return self._execute_moves(self._classify_files(directory, recursive), rules, journal, tracker)
+    
+    @_pinned
+    def process_batch(self, directory: Path, files: List[Path], rules: List[Dict] = None) -> MoveReport:
+        """Organize only the given loose files of a directory"""
+        pending = []
+        for file in files:
+            FILES_SCANNED.inc()
+            if file.name.startswith('.') or self.vault.is_encrypted(file):
                 continue
-                
+            try:
+                stat = file.stat()
+            except OSError:
+                # Already moved or deleted before the batch ran
+                continue
+            if not S_ISREG(stat.st_mode):
+                continue
+            pending.append((file, stat))
+        moves = list(self._classified(directory, pending))
+        self._save_sniff_cache()
+        if not moves:
+            return MoveReport()
+        journal = self._journal(directory)
+        with self._run_lock(journal):
+            run = journal.begin('batch') if journal else None
+            try:
+                return self._execute_moves(moves, rules, run)
+            finally:
+                if run:
+                    run.end()
+    
+    def _classify_files(self, directory: Path, recursive: bool = False) -> Iterator[Tuple[Path, Path, str, os.stat_result]]:
+        """Lazily classify the loose files of a directory, and of its subfolders when ``recursive``"""
+        options = self.config.get('scan', {})
+        ignore = IgnoreRules.from_file(directory / IGNORE_FILE, options.get('ignore', ()))
+        entries = scan_tree(
+            directory,
+            max_depth=options.get('max_depth') if recursive else 0,
+            ignore=ignore,
+            symlinks=options.get('symlinks', 'files'),
+            skip_dirs=self._container_names()
+        )
+        batch = []
+        for entry, _ in entries:
+            FILES_SCANNED.inc()
+            file = Path(entry.path)
             if self.vault.is_encrypted(file):
                 continue
                 
-            category = self._determine_category(file)
-            self._move_file(file, directory / category)
-            
-            if rules:
-                self.rule_engine.apply_rules(file, rules)
+            try:
+                stat = entry.stat()
+            except OSError:
+                # Deleted or renamed since it was listed
+                continue
+            batch.append((file, stat))
+            if len(batch) >= CLASSIFY_BATCH:
+                yield from self._classified(directory, batch)
+                batch = []
+        yield from self._classified(directory, batch)
+
+    def _classified(self, directory: Path, files: List[Tuple[Path, os.stat_result]]) -> Iterator[Tuple[Path, Path, str, os.stat_result]]:
+        for (file, stat), category in zip(files, self._categorize(directory, files)):
+            yield file, directory / category, category, stat
+
+    def _categorize(self, directory: Path, files: List[Tuple[Path, os.stat_result]]) -> List[str]:
+        """Categorize by name, sniffing the content of files the name doesn't place"""
+        categories = [self.classifier.classify(file) for file, _ in files]
+        if self.sniffer:
+            unknown = [item for item, category in zip(files, categories) if category == UNCATEGORIZED]
+            if unknown:
+                detected = self.sniffer.sniff_many(directory, unknown)
+                for i, (file, _) in enumerate(files):
+                    ext = detected.get(file) if categories[i] == UNCATEGORIZED else None
+                    if ext:
+                        categories[i] = self.classifier.classify_name(file.name + ext)
+        for category in categories:
+            FILES_CLASSIFIED.inc(category=category)
+        return categories
+
+    def _save_sniff_cache(self) -> None:
+        if not self.sniffer:
+            return
+        try:
+            self.sniffer.save()
+        except OSError as e:
+            self.logger.error(f"Sniff cache save failed: {str(e)}")
     
-    def _determine_category(self, file: Path) -> str:
-        # Categorization logic with fallback
-        if file.suffix.lower() == '.exe':
-            return self._categorize_executable(file)
-            
-        for category, data in self.config['categories'].items():
-            if file.suffix.lower() in data['extensions']:
-                return category
+    def _execute_moves(self, moves: List[Tuple], rules: List[Dict], journal: ActiveRun = None,
+                       tracker: ProgressTracker = None) -> MoveReport:
+        if tracker:
+            tracker.stage('moves', len(moves) if isinstance(moves, list) else None)
+        with STAGE_SECONDS.time(stage='moves'):
+            report = self.executor.execute(moves, journal=journal, tracker=tracker)
+        for result in report.results:
+            if result.ok:
+                FILES_MOVED.inc(category=result.category)
+            elif result.status == 'failed':
+                MOVE_FAILURES.inc()
                 
-        return 'Uncategorized'
+        if rules:
+            with STAGE_SECONDS.time(stage='rules'):
+                rules = self.rule_engine.plan_for(rules)
+                moved = report.moved
+                if tracker:
+                    tracker.stage('rules', len(moved))
+                try:
+                    for result in moved:
+                        if tracker and tracker.cancelled:
+                            break
+                        self._apply_rules(report, result.dest, rules, result.stat, journal)
+                        if tracker:
+                            tracker.advance(path=result.dest, category=result.category)
+                finally:
+                    self._flush_rule_actions(journal)
+        return report
+
+    def _apply_rules(self, report: MoveReport, file: Path, rules: List[Dict], stat: os.stat_result,
+                     journal: ActiveRun = None) -> Optional[Path]:
+        """Run the rules on one placed file; returns where it ended up, None if consumed or failed
+
+        A rule action that fails is added to ``report`` and the run moves on
+        to the next file.
+        """
+        try:
+            return self.rule_engine.apply_rules(file, rules, stat, journal)
+        except OSError as e:
+            ERRORS.inc(stage='rule')
+            self.logger.error(f"Rule action failed for {file.name}: {str(e)}")
+            report.results.append(MoveResult(src=file, category=file.parent.name, status='failed', error=str(e)))
+            return None
     
-    def _categorize_executable(self, file: Path) -> str:
-        name = file.stem.lower()
-        for category, patterns in self.config['executable_rules'].items():
-            if any(p in name for p in patterns):
-                return category
-        return 'Executables'
+    def _flush_rule_actions(self, journal: ActiveRun = None) -> DuplicateReport:
+        """Run the duplicate checks and encryptions rules queued during this batch"""
+        duplicates = self.rule_engine.flush_duplicates(journal)
+        for result in duplicates.results:
+            if result.ok:
+                self.logger.info(f"{result.path.name} duplicates {result.original.name} ({result.action})")
+            else:
+                ERRORS.inc(stage='duplicate')
+                self.logger.error(f"Duplicate {result.action} failed for {result.path.name}: {result.error}")
+        for result in self.rule_engine.flush().failed:
+            ERRORS.inc(stage='encrypt')
+            self.logger.error(f"Encryption failed for {result.path.name}: {result.error}")
+        return duplicates
+
+    @staticmethod
+    def _forget_duplicates(manifest: DirectoryManifest, duplicates: DuplicateReport, seen: set = None) -> None:
+        """Drop manifest entries of copies that were moved aside or deleted"""
+        for result in duplicates.results:
+            if result.ok and result.action != 'report':
+                rel_path = f"{result.path.parent.name}/{result.path.name}"
+                manifest.forget(rel_path)
+                if seen is not None:
+                    seen.discard(rel_path)
     
-    def _move_file(self, src: Path, dest_dir: Path) -> None:
+    def _resume(self, journal: MoveJournal) -> None:
+        """Roll an interrupted run forward by finishing the moves it had logged
+
+        Called with ``journal.lock`` held, so no other process is mid-run and
+        an unfinished run not open in this process has crashed.
+        """
+        last = journal.last_run()
+        if last is None or last.finished or journal.is_open(last.id):
+            return
+        self.logger.warning(f"Resuming interrupted {last.kind} run {last.id}")
+        run = ActiveRun(journal, last.id)
+        done = []
+        for entry in last.pending:
+            if os.path.lexists(entry.src) and not os.path.lexists(entry.dest):
+                try:
+                    entry.dest.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.move(str(entry.src), str(entry.dest))
+                except OSError as e:
+                    ERRORS.inc(stage='resume')
+                    self.logger.error(f"Resume failed for {entry.src.name}: {str(e)}")
+                    continue
+            elif os.path.lexists(entry.src) or not os.path.lexists(entry.dest):
+                continue
+            done.append(entry.seq)
+        run.done(done)
+        run.end()
+
+    def switch_workspace(self, directory: Path, name: str, workspaces=None) -> MoveReport:
+        """Rearrange ``directory`` into the layout saved for workspace ``name``
+
+        Only files that sit somewhere else than in that layout are moved, as
+        one journaled run that ``undo`` can reverse.
+        """
+        self._validate_path(directory)
+        if workspaces is None:
+            # sqlite3 stays out of runs that never touch workspaces
+            from .workspace_manager import WorkspaceManager
+            with WorkspaceManager() as workspaces:
+                return self.switch_workspace(directory, name, workspaces)
+        journal = self._journal(directory)
+        with self._run_lock(journal):
+            if journal:
+                self._resume(journal)
+            run = journal.begin(f"workspace:{name}") if journal else None
+            try:
+                return workspaces.switch(name, directory, self.executor, run)
+            finally:
+                if run:
+                    run.end()
+
+    def undo(self, directory: Path) -> MoveReport:
+        """Move the files of the last run that moved anything back to where they came from
+
+        Only that run's journaled moves are reversed, newest first. Files that
+        were removed or replaced since, or whose size or mtime no longer match
+        what was journaled, are reported as failed. Repeated calls step
+        further back through the journal.
+        """
+        self._validate_path(directory)
+        report = MoveReport()
+        journal = self._journal(directory)
+        if journal is None:
+            return report
+        with journal.lock:
+            self._resume(journal)
+            last = journal.last_run(undoable=True)
+            if last is None:
+                return report
+
+            entries = list(reversed(last.completed))
+            report.results = [
+                MoveResult(src=entry.dest, category=entry.dest.parent.name, dest=entry.src)
+                for entry in entries
+            ]
+            run = journal.begin(f"{UNDO_PREFIX}{last.id}")
+            try:
+                seqs = run.planned([(r.src, r.dest) for r in report.results])
+                done = []
+                # Checked one by one: a file may pass through several moves in a run
+                for seq, entry, result in zip(seqs, entries, report.results):
+                    result.status = 'failed'
+                    result.error = self._undo_blocker(entry, result)
+                    if result.error:
+                        continue
+                    try:
+                        result.dest.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.move(str(result.src), str(result.dest))
+                    except OSError as e:
+                        result.error = str(e)
+                        continue
+                    result.status = 'moved'
+                    done.append(seq)
+                run.done(done)
+            finally:
+                run.end()
+        return report
+
+    @staticmethod
+    def _undo_blocker(entry: JournalEntry, result: MoveResult) -> Optional[str]:
+        """Why a journaled move can't be reversed, or None if it can"""
         try:
-            if not dest_dir.exists():
-                dest_dir.mkdir()
-            shutil.move(str(src), str(dest_dir / src.name))
-        except Exception as e:
-            self.logger.error(f"Move failed: {src.name} -> {dest_dir}: {str(e)}")
+            stat = os.lstat(result.src)
+        except OSError:
+            return f"{result.src.name} no longer exists"
+        if entry.size is not None and (stat.st_size != entry.size or stat.st_mtime_ns != entry.mtime):
+            return f"{result.src.name} changed since it was moved"
+        if os.path.lexists(result.dest):
+            return f"{result.dest} is occupied"
+        return None
+
+    def _determine_category(self, file: Path) -> str:
+        # Categorization logic with fallback
+        category = self.classifier.classify(file)
+        FILES_CLASSIFIED.inc(category=category)
+        return category
     
-    def start_monitoring(self, directory: Path) -> None:
-        from .file_handler import FileEventHandler
-        event_handler = FileEventHandler(self)
-        observer = Observer()
-        observer.schedule(event_handler, str(directory), recursive=False)
-        observer.start()
-        observer.join()
\ No newline at end of file
+    def _categorize_executable(self, file: Path) -> str:
+        return self.classifier.classify_executable(file.stem)
\ No newline at end of file
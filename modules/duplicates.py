@@ -0,0 +1,247 @@
+import os
+import json
+import mmap
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from .metrics import REGISTRY
+from .journal import ActiveRun
+from .move_executor import MoveExecutor
+
+PARTIAL_CHUNK = 64 * 1024
+MMAP_SLICE = 16 * 1024 * 1024
+DUPLICATE_MODES = ('report', 'move', 'delete')
+
+HASHED_BYTES = REGISTRY.counter('duplicate_hashed_bytes_total', 'Bytes read for duplicate hashing, by stage')
+HASH_LOOKUPS = REGISTRY.counter('duplicate_hash_lookups_total', 'Hash cache lookups, by stage and result')
+DUPLICATES_FOUND = REGISTRY.counter('duplicate_files_total', 'Duplicate copies found, by action')
+
+@dataclass
+class DuplicateGroup:
+    digest: str
+    size: int
+    files: List[Path] = field(default_factory=list)
+
+    @property
+    def original(self) -> Path:
+        return self.files[0]
+
+    @property
+    def copies(self) -> List[Path]:
+        return self.files[1:]
+
+@dataclass
+class DuplicateResult:
+    path: Path
+    original: Path
+    action: str
+    target: Optional[Path] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class DuplicateReport:
+    groups: List[DuplicateGroup] = field(default_factory=list)
+    results: List[DuplicateResult] = field(default_factory=list)
+
+    @property
+    def failed(self) -> List[DuplicateResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def wasted_bytes(self) -> int:
+        return sum(group.size * len(group.copies) for group in self.groups)
+
+class HashCache:
+    """LRU of (partial, full) digests keyed by device, inode, size and mtime"""
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 100000):
+        self.path = Path(path).expanduser() if path else None
+        self.max_entries = max(1, max_entries)
+        self._entries: 'OrderedDict[str, List[Optional[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def key(stat: os.stat_result) -> str:
+        return f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                self._entries = OrderedDict(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def get(self, key: str, stage: int) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[stage]
+
+    def put(self, key: str, stage: int, digest: str) -> None:
+        with self._lock:
+            entry = self._entries.setdefault(key, [None, None])
+            entry[stage] = digest
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(list(self._entries.items()), f, separators=(',', ':'))
+            self.dirty = False
+        os.replace(tmp_path, self.path)
+
+class DuplicateFinder:
+    """Finds identical files in stages so most files are never fully read.
+
+    Candidates are grouped by size; files sharing a size are compared by a
+    hash of their first and last ``partial_chunk`` bytes, and only those
+    still colliding are hashed in full through a memory map. Hashing runs
+    on a thread pool (hashlib releases the GIL on large buffers) and every
+    digest is cached by device, inode, size and mtime.
+    """
+
+    PARTIAL, FULL = 0, 1
+
+    def __init__(self, max_workers: int = 4, cache: HashCache = None, partial_chunk: int = PARTIAL_CHUNK):
+        self.max_workers = max(1, max_workers)
+        self.cache = cache or HashCache()
+        self.partial_chunk = partial_chunk
+
+    def find(self, files: Iterable[Tuple[Path, os.stat_result]]) -> List[DuplicateGroup]:
+        """Group identical non-empty files; each group is ordered oldest first"""
+        by_size: Dict[int, List[Tuple[Path, os.stat_result]]] = {}
+        inodes = set()
+        for file, stat in files:
+            if stat.st_size == 0:
+                continue
+            # Hard links share their data, so they are not copies of each other
+            inode = (stat.st_dev, stat.st_ino)
+            if inode in inodes:
+                continue
+            inodes.add(inode)
+            by_size.setdefault(stat.st_size, []).append((file, stat))
+
+        candidates = [item for group in by_size.values() if len(group) > 1 for item in group]
+        if not candidates:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            partial = self._refine(pool, candidates, self.PARTIAL)
+            # Files up to two chunks long were read whole by the partial pass
+            settled = [(d, group) for d, group in partial if group[0][1].st_size <= 2 * self.partial_chunk]
+            full_needed = [item for d, group in partial if group[0][1].st_size > 2 * self.partial_chunk for item in group]
+            groups = settled + self._refine(pool, full_needed, self.FULL)
+
+        result = []
+        for digest, group in groups:
+            group.sort(key=lambda item: (item[1].st_mtime_ns, item[0].name))
+            result.append(DuplicateGroup(digest, group[0][1].st_size, [file for file, _ in group]))
+        return result
+
+    def _refine(self, pool: ThreadPoolExecutor, items: List[Tuple[Path, os.stat_result]],
+                stage: int) -> List[Tuple[str, List[Tuple[Path, os.stat_result]]]]:
+        """Split same-size items by digest, keeping only (digest, group) pairs that still collide"""
+        digests = pool.map(lambda item: self._digest(item[0], item[1], stage), items)
+        buckets: Dict[Tuple[int, str], List] = {}
+        for item, digest in zip(items, digests):
+            if digest is not None:
+                buckets.setdefault((item[1].st_size, digest), []).append(item)
+        return [(digest, group) for (_, digest), group in buckets.items() if len(group) > 1]
+
+    def _digest(self, file: Path, stat: os.stat_result, stage: int) -> Optional[str]:
+        key = HashCache.key(stat)
+        label = 'partial' if stage == self.PARTIAL else 'full'
+        digest = self.cache.get(key, stage)
+        if digest is not None:
+            HASH_LOOKUPS.inc(stage=label, result='hit')
+            return digest
+        HASH_LOOKUPS.inc(stage=label, result='miss')
+        try:
+            if stage == self.PARTIAL:
+                digest = self._partial_hash(file, stat.st_size)
+            else:
+                digest = self._full_hash(file)
+        except (OSError, ValueError):
+            # Vanished or unreadable: it can't be part of a group
+            return None
+        self.cache.put(key, stage, digest)
+        return digest
+
+    def _partial_hash(self, file: Path, size: int) -> str:
+        h = hashlib.blake2b()
+        with open(file, 'rb') as f:
+            head = f.read(self.partial_chunk)
+            h.update(head)
+            read = len(head)
+            if size > 2 * self.partial_chunk:
+                f.seek(-self.partial_chunk, os.SEEK_END)
+            tail = f.read(self.partial_chunk)
+            h.update(tail)
+            read += len(tail)
+        HASHED_BYTES.inc(read, stage='partial')
+        return h.hexdigest()
+
+    @staticmethod
+    def _full_hash(file: Path) -> str:
+        h = hashlib.blake2b()
+        with open(file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            with memoryview(m) as view:
+                for offset in range(0, len(view), MMAP_SLICE):
+                    h.update(view[offset:offset + MMAP_SLICE])
+            HASHED_BYTES.inc(len(m), stage='full')
+        return h.hexdigest()
+
+def resolve_duplicates(groups: List[DuplicateGroup], targets: Dict[Path, Dict],
+                       journal: ActiveRun = None) -> List[DuplicateResult]:
+    """Apply each target's action ('report', 'move' or 'delete') to the copies among ``targets``
+
+    Moves are logged to ``journal`` when one is given; deletions can't be undone.
+    """
+    results = []
+    for group in groups:
+        for copy in group.copies:
+            action = targets.get(copy)
+            if action is None:
+                continue
+            mode = action.get('mode', 'report')
+            result = DuplicateResult(copy, group.original, mode)
+            try:
+                if mode == 'delete':
+                    os.unlink(copy)
+                elif mode == 'move':
+                    dest = copy.parent / action.get('destination', 'Duplicates')
+                    dest.mkdir(exist_ok=True)
+                    taken = set(os.listdir(dest))
+                    name = MoveExecutor._free_name(copy.name, taken) if copy.name in taken else copy.name
+                    result.target = dest / name
+                    seqs = journal.planned([(copy, result.target)]) if journal else None
+                    shutil.move(str(copy), str(result.target))
+                    if journal:
+                        journal.done(seqs)
+            except OSError as e:
+                result.error = str(e)
+            DUPLICATES_FOUND.inc(action=mode)
+            results.append(result)
+    return results
\ No newline at end of file
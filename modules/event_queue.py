@@ -0,0 +1,145 @@
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from .metrics import REGISTRY
+
+EVENTS_RECEIVED = REGISTRY.counter('monitor_events_total', 'File events queued, by queue')
+EVENTS_MERGED = REGISTRY.counter('monitor_events_merged_total', 'Events folded into an already-queued path, by queue')
+EVENTS_DROPPED = REGISTRY.counter('monitor_events_dropped_total', 'Events dropped because the queue was full, by queue')
+QUEUE_DEPTH = REGISTRY.gauge('monitor_queue_depth', 'Distinct paths waiting for the next batch, by queue')
+BATCH_SIZE = REGISTRY.histogram(
+    'monitor_batch_size', 'Paths per released batch',
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+
+class CoalescingQueue:
+    """Collects file paths and hands them to a callback in debounced batches.
+
+    Repeated events for the same path inside a batch are merged. A batch is
+    released once no new event has arrived for ``quiet_window`` seconds, or
+    after ``max_delay`` seconds so a steady stream of events cannot starve
+    processing. The callback runs on the queue's own worker thread.
+
+    With ``max_pending`` set the queue is bounded: a full queue releases its
+    batch straight away and drops new paths, and ``on_overflow`` runs on the
+    worker after that batch so the owner can rescan for what was dropped.
+    """
+
+    def __init__(self, callback: Callable[[List[Path]], None],
+                 quiet_window: float = 0.5, max_delay: float = 5.0, name: str = 'coalescer',
+                 max_pending: int = 0, on_overflow: Optional[Callable[[], None]] = None):
+        self.callback = callback
+        self.name = name
+        self.quiet_window = quiet_window
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.on_overflow = on_overflow
+        self.received = 0
+        self.merged = 0
+        self.batches = 0
+        self.dropped = 0
+        self._overflowed = False
+        self._pending: Dict[Path, float] = {}
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def add(self, path: Path) -> bool:
+        """Queue a path; returns False if it was dropped because the queue is full"""
+        now = time.monotonic()
+        with self._cond:
+            self.received += 1
+            if self.max_pending and len(self._pending) >= self.max_pending and path not in self._pending:
+                self.dropped += 1
+                self._overflowed = True
+                EVENTS_DROPPED.inc(queue=self.name)
+                return False
+            if path in self._pending:
+                self.merged += 1
+                EVENTS_MERGED.inc(queue=self.name)
+            elif not self._pending:
+                self._first_event = now
+            self._pending[path] = now
+            self._last_event = now
+            QUEUE_DEPTH.set(len(self._pending), queue=self.name)
+            self._cond.notify()
+        EVENTS_RECEIVED.inc(queue=self.name)
+        return True
+
+    @property
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                'received': self.received,
+                'merged': self.merged,
+                'batches': self.batches,
+                'dropped': self.dropped,
+                'pending': len(self._pending)
+            }
+
+    def stop(self, flush: bool = True) -> None:
+        with self._cond:
+            self._running = False
+            if not flush:
+                self._pending.clear()
+            self._cond.notify()
+        self._thread.join()
+
+    def _take_overflow(self) -> bool:
+        with self._cond:
+            overflowed, self._overflowed = self._overflowed, False
+            return overflowed
+
+    def _take_batch(self) -> List[Path]:
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if not self._running:
+                        return []
+                    if self._overflowed:
+                        return []
+                    self._cond.wait()
+                    continue
+                if not self._running or self._overflowed:
+                    break
+                if self.max_pending and len(self._pending) >= self.max_pending:
+                    break
+                now = time.monotonic()
+                quiet_at = self._last_event + self.quiet_window
+                deadline = self._first_event + self.max_delay
+                release_at = min(quiet_at, deadline)
+                if now >= release_at:
+                    break
+                self._cond.wait(release_at - now)
+
+            batch = list(self._pending)
+            self._pending.clear()
+            self.batches += 1
+            QUEUE_DEPTH.set(0, queue=self.name)
+            BATCH_SIZE.observe(len(batch))
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch:
+                try:
+                    self.callback(batch)
+                except Exception:
+                    logging.getLogger(__name__).exception("Batch callback failed")
+            if self._take_overflow() and self.on_overflow:
+                try:
+                    self.on_overflow()
+                except Exception:
+                    logging.getLogger(__name__).exception("Overflow callback failed")
+            elif not batch:
+                return
\ No newline at end of file
@@ -1,16 +1,107 @@
+import os
 import time
+import logging
+import threading
+from collections import OrderedDict
 from watchdog.observers import Observer
+from watchdog.observers.api import ObservedWatch
 from watchdog.events import FileSystemEventHandler
 from pathlib import Path
-from typing import Callable, List
-from ..gui.notification_manager import NotificationManager
+from typing import Callable, Dict, List, Optional, Tuple
+from .event_queue import CoalescingQueue
+from .metrics import REGISTRY
+
+HANDLER_ERRORS = REGISTRY.counter('monitor_errors_total', 'Batches or files the monitor failed to organize')
+BATCH_SECONDS = REGISTRY.histogram('monitor_batch_seconds', 'Time to organize one coalesced batch')
+THROTTLED = REGISTRY.counter('monitor_throttled_total', 'Queued paths skipped because a recent batch handled them')
+RESCANS = REGISTRY.counter('monitor_rescans_total', 'Full rescans of a watched folder after its queue overflowed')
+WATCHED_ROOTS = REGISTRY.gauge('monitor_watched_roots', 'Folders currently being watched')
+
+class ThrottleTable:
+    """Bounded LRU of recently handled paths whose entries expire after ``window`` seconds"""
+    
+    def __init__(self, window: float = 5.0, max_entries: int = 4096):
+        self.window = window
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def allow(self, key: str, now: float = None) -> bool:
+        """Record an attempt and return False if the key was handled within the window"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            last = self._entries.get(key)
+            if last is not None and now - last < self.window:
+                self.hits += 1
+                return False
+                
+            self.misses += 1
+            self._entries[key] = now
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+            
+    def _expire(self, now: float) -> None:
+        # Entries are kept in insertion-time order, so expired ones sit at the front
+        while self._entries:
+            key, last = next(iter(self._entries.items()))
+            if now - last < self.window:
+                break
+            del self._entries[key]
+            self.expirations += 1
+            
+    def __len__(self) -> int:
+        return len(self._entries)
+        
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
 
 class FileEventHandler(FileSystemEventHandler):
-    def __init__(self, organizer, notification_callback: Callable = None):
+    def __init__(self, organizer, notification_callback: Callable = None, path: Path = None):
         self.organizer = organizer
-        self.notifier = NotificationManager()
+        self.path = path
+        self.notifier = organizer.notifier
         self.notification_callback = notification_callback
-        self.last_handled = {}
+        monitor_config = organizer.config.get('monitor', {})
+        self.last_handled = ThrottleTable(
+            monitor_config.get('throttle_seconds', 5),
+            monitor_config.get('throttle_max_entries', 4096)
+        )
+        self.queue = CoalescingQueue(
+            self._handle_batch,
+            quiet_window=monitor_config.get('quiet_window', 0.5),
+            max_delay=monitor_config.get('max_batch_delay', 5.0),
+            name=f"monitor-{path.name if path else 'events'}",
+            max_pending=monitor_config.get('max_queue', 10000),
+            on_overflow=self._rescan
+        )
+        
+    @property
+    def throttle_stats(self) -> Dict[str, int]:
+        return self.last_handled.stats()
+        
+    @property
+    def merged_events(self) -> int:
+        """Number of events folded into an already-queued path"""
+        return self.queue.merged
+        
+    def close(self) -> None:
+        """Flush queued events and stop the worker thread"""
+        self.queue.stop()
         
     def on_modified(self, event):
         """Handle file modification events"""
@@ -45,85 +136,147 @@ class FileEventHandler(FileSystemEventHandler):
         if path.name.startswith('.') or path.name.startswith('~'):
             return False
             
-        # Skip recently handled files
-        current_time = time.time()
-        last_handled = self.last_handled.get(path.name, 0)
-        
-        # Throttle handling to once per 5 seconds per file
-        if current_time - last_handled < 5:
-            return False
-            
-        self.last_handled[path.name] = current_time
-        return True
+        # Only loose files in the watched folder; moves into containers echo back here
+        return self.path is None or path.parent == self.path
         
     def _handle_file(self, path: Path) -> None:
-        """Process a file that needs handling"""
+        """Queue a file for the next batch; runs on the observer thread
+
+        Every event is queued, so repeated writes to a file keep extending its
+        quiet window instead of being dropped before the queue can merge them.
+        """
+        self.queue.add(path)
+        
+    def _rescan(self) -> None:
+        """Pick up the loose files whose events were dropped while the queue was full"""
+        if self.path is None:
+            return
+        RESCANS.inc()
+        logging.getLogger(__name__).warning(f"Event queue for {self.path} overflowed; rescanning")
         try:
-            # Organize the file
-            self.organizer._process_files(path.parent, None)
+            with os.scandir(self.path) as entries:
+                files = [Path(entry.path) for entry in entries if entry.is_file() and not entry.name.startswith('.')]
+        except OSError:
+            return
+        if files:
+            self._handle_batch(files)
             
-            # Notify about the change
-            message = f"File {path.name} was organized"
-            self.notifier.show_notification("File Organized", message)
+    def _handle_batch(self, paths: List[Path]) -> None:
+        """Organize a coalesced batch of files on the queue's worker thread"""
+        by_parent = {}
+        for path in paths:
+            # Skip files a recent batch already handled, keyed by full path so
+            # same-named files in different watched folders don't throttle each other
+            if not self.last_handled.allow(str(path)):
+                THROTTLED.inc()
+                continue
+            by_parent.setdefault(path.parent, []).append(path)
             
-            if self.notification_callback:
-                self.notification_callback(path)
+        for parent, files in by_parent.items():
+            try:
+                with BATCH_SECONDS.time():
+                    report = self.organizer.process_batch(parent, files)
+            except Exception as e:
+                HANDLER_ERRORS.inc()
+                self.notifier.error(
+                    "Organization Error",
+                    f"Failed to process {len(files)} file(s) in {parent.name}: {str(e)}"
+                )
+                continue
+                
+            # Queued, not shown: the dispatcher merges bursts on its own thread
+            moved = report.moved
+            for result in moved:
+                self.notifier.file_organized(result.src, result.category)
+                
+            for result in report.failed:
+                HANDLER_ERRORS.inc()
+                self.notifier.error(
+                    "Organization Error",
+                    f"Failed to process {result.src.name}: {result.error}"
+                )
                 
-        except Exception as e:
-            self.notifier.show_notification(
-                "Organization Error",
-                f"Failed to process {path.name}: {str(e)}"
-            )
+            if self.notification_callback:
+                for result in moved:
+                    self.notification_callback(result.src)
 
 class FileMonitor:
-    def __init__(self, organizer, paths: List[Path]):
+    """Watches several folders through one shared observer.
+
+    Each root gets its own handler with a bounded worker queue, so a slow
+    folder (e.g. a network share) only delays its own batches. Roots can be
+    added and removed while the monitor is running.
+    """
+    
+    def __init__(self, organizer, paths: List[Path] = ()):
         self.organizer = organizer
-        self.paths = paths
         self.observer = Observer()
-        self.handlers = []
+        self.notification_callback = None
+        self._initial = [Path(p) for p in paths]
+        self._roots: Dict[Path, Tuple[FileEventHandler, ObservedWatch]] = {}
+        self._lock = threading.Lock()
         
-    def start(self, notification_callback: Callable = None):
-        """Start monitoring the specified paths"""
-        for path in self.paths:
-            if not path.exists():
-                continue
-                
-            event_handler = FileEventHandler(
-                self.organizer,
-                notification_callback
-            )
+    @property
+    def paths(self) -> List[Path]:
+        with self._lock:
+            return list(self._roots)
             
-            self.handlers.append(event_handler)
-            self.observer.schedule(
-                event_handler,
-                str(path),
-                recursive=False
-            )
+    @property
+    def handlers(self) -> List[FileEventHandler]:
+        with self._lock:
+            return [handler for handler, _ in self._roots.values()]
             
+    def handler_for(self, path: Path) -> Optional[FileEventHandler]:
+        with self._lock:
+            entry = self._roots.get(Path(path))
+        return entry[0] if entry else None
+        
+    def start(self, notification_callback: Callable = None):
+        """Start monitoring the specified paths"""
+        self.notification_callback = notification_callback
+        for path in self._initial:
+            self.add_path(path)
         self.observer.start()
         
     def stop(self):
-        """Stop all monitoring"""
+        """Stop all monitoring, letting each root finish its queued batch"""
         self.observer.stop()
         self.observer.join()
+        with self._lock:
+            roots, self._roots = self._roots, {}
+            WATCHED_ROOTS.set(0)
+        for handler, _ in roots.values():
+            handler.close()
         
-    def add_path(self, path: Path):
-        """Add a new path to monitor"""
-        if not path.exists():
-            return
-            
-        event_handler = FileEventHandler(self.organizer)
-        self.handlers.append(event_handler)
-        self.observer.schedule(
-            event_handler,
-            str(path),
-            recursive=False
-        )
+    def add_path(self, path: Path) -> bool:
+        """Add a new path to monitor; returns False if it is missing or already watched"""
+        path = Path(path)
+        if not path.is_dir():
+            return False
+        with self._lock:
+            if path in self._roots:
+                return False
+            event_handler = FileEventHandler(self.organizer, self.notification_callback, path)
+            watch = self.observer.schedule(event_handler, str(path), recursive=False)
+            self._roots[path] = (event_handler, watch)
+            WATCHED_ROOTS.set(len(self._roots))
+        return True
+        
+    def remove_path(self, path: Path) -> bool:
+        """Remove a path from monitoring; its queued events are still processed"""
+        with self._lock:
+            entry = self._roots.pop(Path(path), None)
+            WATCHED_ROOTS.set(len(self._roots))
+        if entry is None:
+            return False
+        handler, watch = entry
+        self.observer.unschedule(watch)
+        handler.close()
+        return True
         
-    def remove_path(self, path: Path):
-        """Remove a path from monitoring"""
-        for handler in self.handlers:
-            if handler.path == path:
-                self.observer.unschedule(handler)
-                self.handlers.remove(handler)
-                break
\ No newline at end of file
+    def stats(self) -> Dict[str, Dict]:
+        """Queue and throttle counters per watched root"""
+        return {
+            str(path): {'queue': handler.queue.stats(), 'throttle': handler.throttle_stats}
+            for path, (handler, _) in list(self._roots.items())
+        }
\ No newline at end of file
@@ -0,0 +1,388 @@
+import os
+import time
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+JOURNAL_NAME = '.organizer_journal'
+LOCK_NAME = '.organizer_journal.lock'
+READ_BLOCK = 64 * 1024
+UNDO_PREFIX = 'undo:'
+
+# One record per line, tab separated, paths relative to the journal's directory:
+#   B <run> <unix time> <kind>      run began
+#   P <run> <seq> <src> <dest> [<size> <mtime>]
+#                                   move planned, with the file's stat when known
+#   D <run> <seq>[,<seq>...]        moves completed
+#   E <run>                         run finished
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n'})
+
+def _escape(text: str) -> str:
+    return text.translate(_ESCAPES)
+
+def _unescape(text: str) -> str:
+    if '\\' not in text:
+        return text
+    out = []
+    chars = iter(text)
+    for ch in chars:
+        if ch == '\\':
+            nxt = next(chars, '')
+            out.append({'t': '\t', 'n': '\n'}.get(nxt, nxt))
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+@dataclass
+class JournalEntry:
+    seq: int
+    src: Path
+    dest: Path
+    done: bool = False
+    size: Optional[int] = None
+    mtime: Optional[int] = None
+
+@dataclass
+class JournalRun:
+    id: int
+    kind: str
+    started: int
+    finished: bool = False
+    entries: List[JournalEntry] = field(default_factory=list)
+
+    @property
+    def completed(self) -> List[JournalEntry]:
+        return [e for e in self.entries if e.done]
+
+    @property
+    def pending(self) -> List[JournalEntry]:
+        return [e for e in self.entries if not e.done]
+
+class DirectoryLock:
+    """Reentrant lock shared by the threads of this process and, through an OS
+    lock on a sidecar file, by every process organizing the same directory
+
+    The OS releases the file lock when its holder dies, so a journaled run
+    found unfinished while holding this lock was not merely slow: it crashed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if not _lock_file(fd, blocking):
+                    os.close(fd)
+                    self._lock.release()
+                    return False
+            except BaseException:
+                self._lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            _unlock_file(fd)
+            os.close(fd)
+        self._lock.release()
+
+    def __enter__(self) -> 'DirectoryLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+def _lock_file(fd: int, blocking: bool) -> bool:
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return False
+        return True
+    while True:
+        try:
+            # Locks the first byte; LK_LOCK itself gives up after ten seconds
+            msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+
+def _unlock_file(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+class ActiveRun:
+    """Write handle for one run; moves are logged as planned before they happen.
+
+    The run's B record, and its id, only come with the first planned move,
+    so a run that moves nothing leaves no trace for ``undo`` to pick up.
+    """
+
+    def __init__(self, journal: 'MoveJournal', run_id: int = None, kind: str = None):
+        self.journal = journal
+        self.id = run_id
+        self.kind = kind
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def planned(self, moves: Sequence[Tuple]) -> List[int]:
+        """Log (src, dest) or (src, dest, stat) entries about to be moved; returns their sequence numbers"""
+        if not moves:
+            return []
+        with self._lock:
+            if self.id is None:
+                self.id = self.journal._begin(self.kind)
+            first = self._seq
+            self._seq += len(moves)
+        seqs = list(range(first, first + len(moves)))
+        self.journal._write(''.join(
+            f"P\t{self.id}\t{seq}\t{self.journal._rel(move[0])}\t{self.journal._rel(move[1])}"
+            + (f"\t{move[2].st_size}\t{move[2].st_mtime_ns}\n" if len(move) > 2 and move[2] is not None else "\n")
+            for seq, move in zip(seqs, moves)
+        ), len(moves))
+        return seqs
+
+    def done(self, seqs: Sequence[int]) -> None:
+        if seqs:
+            self.journal._write(f"D\t{self.id}\t{','.join(map(str, seqs))}\n", len(seqs))
+
+    def end(self) -> None:
+        if self.id is None:
+            return
+        self.journal._write(f"E\t{self.id}\n", 0, sync=True)
+        self.journal._finished(self.id)
+        # Another process may compact the file before our next run; reopen it then
+        self.journal.close()
+        self.journal._maybe_compact()
+
+class MoveJournal:
+    """Append-only log of the moves made by organize runs, kept in the organized directory.
+
+    Each write is flushed to the OS straight away so a crashed process loses
+    nothing; fsync is batched every ``sync_every`` records and at run
+    boundaries. Runs are located by reading the file backwards, so resuming
+    or undoing the last run costs time proportional to that run, not to the
+    journal's history. Once the file outgrows ``max_bytes`` it is rewritten
+    keeping the newest ``keep_runs`` runs.
+
+    Callers hold ``lock`` around each journaled run. It excludes other
+    threads and other processes alike, so run ids, taken from the newest B
+    record under it, stay unique and unfinished runs seen under it have
+    crashed. Use ``for_directory`` to get the process-wide instance of a
+    directory; the runs open in this process are only known to that one.
+    """
+
+    _instances: Dict[Path, 'MoveJournal'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: Path, sync_every: int = 256, max_bytes: int = 8 * 1024 * 1024,
+                 keep_runs: int = 1000):
+        self.directory = Path(directory)
+        self.path = self.directory / JOURNAL_NAME
+        self.sync_every = max(1, sync_every)
+        self.max_bytes = max_bytes
+        self.keep_runs = keep_runs
+        self._file = None
+        self._unsynced = 0
+        self._lock = threading.RLock()
+        self._open: Set[int] = set()
+        self.lock = DirectoryLock(self.directory / LOCK_NAME)
+
+    @classmethod
+    def for_directory(cls, directory: Path, **options) -> 'MoveJournal':
+        """The journal of ``directory`` shared by this process; ``options`` apply on first use"""
+        key = Path(directory).resolve()
+        with cls._instances_lock:
+            journal = cls._instances.get(key)
+            if journal is None:
+                journal = cls._instances[key] = cls(directory, **options)
+        return journal
+
+    def _rel(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            path = path.relative_to(self.directory)
+        except ValueError:
+            pass
+        return _escape(str(path))
+
+    def _abs(self, text: str) -> Path:
+        return self.directory / _unescape(text)
+
+    def _write(self, data: str, records: int, sync: bool = False) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8', newline='\n')
+                if self._file.tell() and not self._ends_with_newline():
+                    # A crash left a torn record; start ours on a fresh line
+                    self._file.write('\n')
+            self._file.write(data)
+            self._file.flush()
+            self._unsynced += records
+            if sync or self._unsynced >= self.sync_every:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def begin(self, kind: str) -> ActiveRun:
+        return ActiveRun(self, kind=kind)
+
+    def _begin(self, kind: str) -> int:
+        with self._lock:
+            # Re-read every time: another process may have begun runs since ours
+            run_id = max(self._last_begun(), max(self._open, default=0)) + 1
+            self._open.add(run_id)
+            self._write(f"B\t{run_id}\t{int(time.time())}\t{_escape(kind)}\n", 0, sync=True)
+        return run_id
+
+    def _finished(self, run_id: int) -> None:
+        with self._lock:
+            self._open.discard(run_id)
+
+    def is_open(self, run_id: int) -> bool:
+        """Whether the run is still in progress in this process, as opposed to crashed"""
+        with self._lock:
+            return run_id in self._open
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+                self._unsynced = 0
+
+    def _read_back(self) -> Iterator[str]:
+        """Yield the journal's lines newest first"""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b''
+            while position > 0:
+                step = min(READ_BLOCK, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + remainder).split(b'\n')
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line:
+                        yield line.decode('utf-8')
+            if remainder:
+                yield remainder.decode('utf-8')
+
+    def _last_begun(self) -> int:
+        # Run ids only grow, so the newest B record holds the highest one
+        for line in self._read_back():
+            if line.startswith('B\t'):
+                return int(line.split('\t')[1])
+        return 0
+
+    def last_run(self, undoable: bool = False) -> Optional[JournalRun]:
+        """The most recently begun run; with ``undoable``, the newest one that moved
+        something and is neither undone nor an undo itself"""
+        # Records of a run are always newer than its B record, so by the time
+        # the B is reached everything belonging to that run has been seen
+        records: Dict[str, List[List[str]]] = {}
+        undone = set()
+        for line in self._read_back():
+            fields = line.split('\t')
+            if fields[0] != 'B':
+                if len(fields) >= 2:
+                    records.setdefault(fields[1], []).append(fields)
+                continue
+            _, run_id, started, kind = line.split('\t', 3)
+            kind = _unescape(kind)
+            if undoable:
+                if kind.startswith(UNDO_PREFIX):
+                    undone.add(int(kind[len(UNDO_PREFIX):]))
+                    continue
+                if int(run_id) in undone:
+                    continue
+            target = self._build_run(JournalRun(int(run_id), kind, int(started)), records.pop(run_id, []))
+            if undoable and not target.completed:
+                continue
+            return target
+        return None
+
+    def _build_run(self, target: JournalRun, records: List[List[str]]) -> JournalRun:
+        entries: Dict[int, JournalEntry] = {}
+        done = set()
+        for fields in records:
+            if fields[0] == 'E':
+                target.finished = True
+            elif fields[0] == 'D' and len(fields) == 3:
+                done.update(int(seq) for seq in fields[2].split(','))
+            elif fields[0] == 'P' and len(fields) in (5, 7):
+                seq = int(fields[2])
+                entry = entries[seq] = JournalEntry(seq, self._abs(fields[3]), self._abs(fields[4]))
+                if len(fields) == 7:
+                    entry.size, entry.mtime = int(fields[5]), int(fields[6])
+        for seq in done:
+            if seq in entries:
+                entries[seq].done = True
+        target.entries = [entries[seq] for seq in sorted(entries)]
+        return target
+
+    def _maybe_compact(self) -> None:
+        try:
+            if self.path.stat().st_size > self.max_bytes:
+                self.compact()
+        except OSError:
+            pass
+
+    def compact(self) -> None:
+        """Rewrite the journal keeping only the newest ``keep_runs`` runs"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            offsets = []
+            with open(self.path, 'rb') as f:
+                position = 0
+                for line in f:
+                    if line.startswith(b'B\t'):
+                        offsets.append(position)
+                    position += len(line)
+                if len(offsets) <= self.keep_runs:
+                    return
+                f.seek(offsets[-self.keep_runs])
+                tmp_path = self.path.with_name(self.path.name + '.tmp')
+                with open(tmp_path, 'wb') as out:
+                    while True:
+                        block = f.read(READ_BLOCK)
+                        if not block:
+                            break
+                        out.write(block)
+                    out.flush()
+                    os.fsync(out.fileno())
+            os.replace(tmp_path, self.path)
\ No newline at end of file
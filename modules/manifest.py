@@ -0,0 +1,94 @@
+import json
+import os
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_NAME = '.organizer_manifest.json'
+MANIFEST_VERSION = 1
+
+class DirectoryManifest:
+    """Record of the files placed by the last organize run.
+
+    Entries are keyed by path relative to the organized directory and hold
+    the size, mtime and assigned category seen when the file was placed.
+    """
+
+    def __init__(self, directory: Path, config_fingerprint: str = ''):
+        self.directory = directory
+        self.path = directory / MANIFEST_NAME
+        self.config_fingerprint = config_fingerprint
+        self.entries: Dict[str, Dict] = {}
+        self.stale = True
+
+    @staticmethod
+    def fingerprint(config: Dict) -> str:
+        """Hash of the settings that decide a file's category, so changing them invalidates the manifest
+
+        Tuning options sharing the file (workers, monitor, notifications...)
+        are left out so adjusting them doesn't force a full re-classification.
+        """
+        relevant = {
+            'categories': config.get('categories', {}),
+            'executable_rules': config.get('executable_rules', {}),
+            'content_sniffing': bool(config.get('content_sniffing', {}).get('enabled', False))
+        }
+        payload = json.dumps(relevant, sort_keys=True).encode()
+        return hashlib.sha256(payload).hexdigest()
+
+    def load(self) -> bool:
+        """Load the manifest, returning False if it is missing or unusable"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+            self.stale = True
+            return False
+
+        if data.get('version') != MANIFEST_VERSION:
+            self.entries = {}
+            self.stale = True
+            return False
+
+        self.entries = data.get('entries', {})
+        self.stale = data.get('config') != self.config_fingerprint
+        return True
+
+    def save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'config': self.config_fingerprint,
+                'entries': self.entries
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.stale = False
+
+    def is_current(self, rel_path: str, stat: os.stat_result) -> Optional[str]:
+        """Return the recorded category if the entry is unchanged since the last run"""
+        if self.stale:
+            return None
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            return None
+        if entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns:
+            return None
+        return entry['category']
+
+    def record(self, rel_path: str, stat: os.stat_result, category: str) -> None:
+        self.entries[rel_path] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'category': category
+        }
+
+    def forget(self, rel_path: str) -> None:
+        self.entries.pop(rel_path, None)
+
+    def prune(self, seen: set) -> None:
+        """Drop entries for files that no longer exist"""
+        for rel_path in list(self.entries):
+            if rel_path not in seen:
+                del self.entries[rel_path]
\ No newline at end of file
@@ -0,0 +1,216 @@
+import os
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .metrics import REGISTRY
+from .journal import ActiveRun
+from .progress import ProgressTracker
+
+COLLISION_POLICIES = ('rename', 'skip', 'overwrite')
+MOVE_LATENCY = REGISTRY.histogram('organizer_move_latency_seconds', 'Time per file move')
+COLLISIONS = REGISTRY.counter('organizer_move_collisions_total', 'Name collisions in destination folders, by policy')
+
+@dataclass
+class MoveResult:
+    src: Path
+    category: str
+    dest: Optional[Path] = None
+    status: str = 'pending'
+    error: Optional[str] = None
+    collision: bool = False
+    stat: Optional[os.stat_result] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('moved', 'renamed', 'overwritten')
+
+@dataclass
+class MoveReport:
+    results: List[MoveResult] = field(default_factory=list)
+    cancelled: bool = False
+
+    @property
+    def moved(self) -> List[MoveResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[MoveResult]:
+        return [r for r in self.results if r.status == 'failed']
+
+    @property
+    def collisions(self) -> List[MoveResult]:
+        return [r for r in self.results if r.collision]
+
+    def by_category(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for result in self.moved:
+            counts[result.category] = counts.get(result.category, 0) + 1
+        return counts
+
+    def extend(self, other: 'MoveReport') -> None:
+        self.results.extend(other.results)
+
+    def summary(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+class MoveExecutor:
+    """Runs a batch of file moves on a bounded thread pool.
+
+    Moves are grouped by destination folder so each folder is created and
+    listed once, and name collisions are resolved up front according to
+    ``collision_policy`` ('rename', 'skip' or 'overwrite').
+    """
+
+    def __init__(self, max_workers: int = 4, collision_policy: str = 'rename'):
+        if collision_policy not in COLLISION_POLICIES:
+            raise ValueError(f"Unknown collision policy: {collision_policy}")
+        self.max_workers = max(1, max_workers)
+        self.collision_policy = collision_policy
+
+    def execute(self, moves: Iterable[Tuple[Path, Path, str, Optional[os.stat_result]]],
+                chunk_size: int = 2048, journal: ActiveRun = None,
+                tracker: ProgressTracker = None) -> MoveReport:
+        """Move (src, dest_dir, category, stat) entries and report per-file results
+
+        ``moves`` may be a lazy iterable; it is consumed ``chunk_size``
+        entries at a time so a huge scan never has to be materialised.
+        With a ``journal`` each chunk is logged as planned before it moves.
+        A ``tracker`` is advanced per file; once it is cancelled no further
+        entries are read and queued moves are skipped.
+        """
+        report = MoveReport()
+        taken_by_dir: Dict[Path, Set[str]] = {}
+        unavailable: Dict[Path, str] = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+        stopped = False
+        try:
+            chunk = []
+            for src, dest_dir, category, stat in moves:
+                if tracker and tracker.cancelled:
+                    stopped = True
+                    break
+                result = MoveResult(src=src, category=category, stat=stat)
+                report.results.append(result)
+                chunk.append((dest_dir, result))
+                if len(chunk) >= chunk_size:
+                    self._execute_chunk(chunk, taken_by_dir, unavailable, pool, journal, tracker)
+                    chunk = []
+            if chunk:
+                self._execute_chunk(chunk, taken_by_dir, unavailable, pool, journal, tracker)
+        finally:
+            if pool:
+                pool.shutdown()
+        if tracker and tracker.cancelled:
+            report.cancelled = stopped or any(r.error == 'Cancelled' for r in report.results)
+        return report
+
+    def _execute_chunk(self, chunk: List[Tuple[Path, MoveResult]], taken_by_dir: Dict[Path, Set[str]],
+                       unavailable: Dict[Path, str], pool: Optional[ThreadPoolExecutor],
+                       journal: ActiveRun = None, tracker: ProgressTracker = None) -> None:
+        groups: Dict[Path, List[MoveResult]] = {}
+        for dest_dir, result in chunk:
+            groups.setdefault(dest_dir, []).append(result)
+
+        ready = []
+        for dest_dir, results in groups.items():
+            if dest_dir not in taken_by_dir and dest_dir not in unavailable:
+                try:
+                    dest_dir.mkdir(exist_ok=True)
+                    taken_by_dir[dest_dir] = set(os.listdir(dest_dir))
+                except OSError as e:
+                    unavailable[dest_dir] = f"Destination unavailable: {str(e)}"
+            if dest_dir in unavailable:
+                for result in results:
+                    result.status = 'failed'
+                    result.error = unavailable[dest_dir]
+                continue
+            for result in results:
+                if self._reserve(result, dest_dir, taken_by_dir[dest_dir]):
+                    ready.append(result)
+
+        self.move_all(ready, pool, journal, tracker)
+
+    def move_all(self, results: List[MoveResult], pool: Optional[ThreadPoolExecutor] = None,
+                 journal: ActiveRun = None, tracker: ProgressTracker = None) -> None:
+        """Carry out moves whose ``dest`` is already decided, in parallel when a pool is given"""
+        seqs = journal.planned([(r.src, r.dest, r.stat) for r in results]) if journal else None
+        move = self._move if tracker is None else lambda result: self._tracked_move(result, tracker)
+        if pool is None or len(results) <= 1:
+            for result in results:
+                move(result)
+        else:
+            list(pool.map(move, results))
+        if journal:
+            journal.done([seq for seq, result in zip(seqs, results) if result.ok])
+
+    def _tracked_move(self, result: MoveResult, tracker: ProgressTracker) -> None:
+        if tracker.cancelled:
+            result.status = 'skipped'
+            result.error = 'Cancelled'
+            return
+        self._move(result)
+        tracker.advance(path=result.src, category=result.category)
+
+    def _reserve(self, result: MoveResult, dest_dir: Path, taken: Set[str]) -> bool:
+        name = result.src.name
+        if name in taken:
+            result.collision = True
+            if self.collision_policy == 'skip':
+                result.status = 'skipped'
+                result.error = f"{name} already exists in {dest_dir}"
+                return False
+            if self.collision_policy == 'rename':
+                name = self._free_name(name, taken)
+        taken.add(name)
+        result.dest = dest_dir / name
+        return True
+
+    @staticmethod
+    def _free_name(name: str, taken: Set[str]) -> str:
+        stem, suffix = os.path.splitext(name)
+        counter = 1
+        while f"{stem} ({counter}){suffix}" in taken:
+            counter += 1
+        return f"{stem} ({counter}){suffix}"
+
+    @staticmethod
+    def _replace(src: Path, dest: Path) -> None:
+        try:
+            os.replace(src, dest)
+        except OSError:
+            # Cross-device: copy over the existing file, then drop the source
+            shutil.copy2(str(src), str(dest))
+            os.unlink(src)
+
+    def _move(self, result: MoveResult) -> None:
+        start = time.perf_counter()
+        try:
+            if os.path.lexists(result.dest) and not (result.collision and self.collision_policy == 'overwrite'):
+                # Something appeared in the destination after it was listed
+                result.status = 'failed'
+                result.collision = True
+                result.error = f"{result.dest.name} appeared in {result.dest.parent} during the move"
+                return
+            if result.collision and self.collision_policy == 'overwrite':
+                self._replace(result.src, result.dest)
+            else:
+                shutil.move(str(result.src), str(result.dest))
+            if not result.collision:
+                result.status = 'moved'
+            elif self.collision_policy == 'overwrite':
+                result.status = 'overwritten'
+            else:
+                result.status = 'renamed'
+        except Exception as e:
+            result.status = 'failed'
+            result.error = str(e)
+        finally:
+            MOVE_LATENCY.observe(time.perf_counter() - start)
+            if result.collision:
+                COLLISIONS.inc(policy=self.collision_policy)
\ No newline at end of file
@@ -0,0 +1,173 @@
+import os
+import sys
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from .metrics import REGISTRY
+
+NOTIFY_BACKENDS = ('auto', 'desktop', 'log', 'null')
+
+NOTIFICATIONS_QUEUED = REGISTRY.counter('notifications_queued_total', 'Messages handed to the dispatcher, by kind')
+NOTIFICATIONS_SHOWN = REGISTRY.counter('notifications_shown_total', 'Aggregated notifications delivered, by backend')
+NOTIFICATIONS_DROPPED = REGISTRY.counter('notifications_dropped_total', 'Messages dropped because the dispatcher queue was full')
+
+@dataclass
+class Notification:
+    title: str
+    message: str
+    kind: str = 'info'
+    category: Optional[str] = None
+
+class NullBackend:
+    name = 'null'
+
+    def show(self, title: str, message: str) -> None:
+        pass
+
+class LogBackend:
+    name = 'log'
+
+    def show(self, title: str, message: str) -> None:
+        logging.getLogger(__name__).info(f"{title}: {message}")
+
+class DesktopBackend:
+    """Desktop popups through plyer; never opens a Tk window, so it is safe off the main thread"""
+
+    name = 'desktop'
+
+    def __init__(self, sound: bool = True):
+        self.sound = sound
+        self._fallback = LogBackend()
+
+    def show(self, title: str, message: str) -> None:
+        try:
+            from plyer import notification
+            notification.notify(title=title, message=message, timeout=5)
+        except Exception:
+            self._fallback.show(title, message)
+            return
+        if self.sound:
+            try:
+                import winsound
+                winsound.MessageBeep()
+            except ImportError:
+                pass
+
+def create_backend(name: str = 'auto'):
+    """Backend by name; 'auto' picks desktop popups only where a desktop session exists"""
+    if name not in NOTIFY_BACKENDS:
+        raise ValueError(f"Unknown notification backend: {name}")
+    if name == 'auto':
+        headless = sys.platform.startswith('linux') and not (
+            os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')
+        )
+        name = 'log' if headless else 'desktop'
+    return {'desktop': DesktopBackend, 'log': LogBackend, 'null': NullBackend}[name]()
+
+class NotificationDispatcher:
+    """Delivers notifications from its own thread, merging bursts into summaries.
+
+    ``notify`` never blocks: messages go onto a bounded list and the worker
+    collects everything that arrives within ``window`` seconds of the first
+    one before showing a summary per kind, e.g. "132 files organized into
+    4 categories". At most ``max_per_minute`` notifications are shown; while
+    over the limit messages keep merging instead of queueing more popups.
+    """
+
+    def __init__(self, backend=None, window: float = 2.0, max_per_minute: int = 6,
+                 max_queue: int = 10000):
+        if backend is None or isinstance(backend, str):
+            backend = create_backend(backend or 'auto')
+        self.backend = backend
+        self.window = window
+        self.min_interval = 60.0 / max_per_minute if max_per_minute else 0.0
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.shown = 0
+        self._pending: List[Notification] = []
+        self._last_shown = float('-inf')
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def notify(self, title: str, message: str, kind: str = 'info', category: str = None) -> bool:
+        """Queue a message; returns False if it was dropped because the queue is full"""
+        with self._cond:
+            if len(self._pending) >= self.max_queue:
+                self.dropped += 1
+                NOTIFICATIONS_DROPPED.inc()
+                return False
+            self._pending.append(Notification(title, message, kind, category))
+            if self._thread is None:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name='notifications', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        NOTIFICATIONS_QUEUED.inc(kind=kind)
+        return True
+
+    def file_organized(self, path: Path, category: str) -> bool:
+        return self.notify("File Organized", f"File {Path(path).name} was organized", 'organized', category)
+
+    def error(self, title: str, message: str) -> bool:
+        return self.notify(title, message, 'error')
+
+    def close(self, flush: bool = True) -> None:
+        """Stop the worker, first showing whatever is still queued when ``flush``"""
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._running = False
+            if not flush:
+                self._pending = []
+            self._cond.notify()
+        if thread:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Let the burst build up, and stay under the rate limit
+                deadline = max(time.monotonic() + self.window, self._last_shown + self.min_interval)
+                while self._running:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                self._last_shown = time.monotonic()
+            for title, message in self.summarize(batch):
+                try:
+                    self.backend.show(title, message)
+                    self.shown += 1
+                    NOTIFICATIONS_SHOWN.inc(backend=self.backend.name)
+                except Exception as e:
+                    logging.getLogger(__name__).error(f"Notification failed: {str(e)}")
+
+    @staticmethod
+    def summarize(batch: List[Notification]) -> List[tuple]:
+        """One (title, message) per kind, in the order each kind first appeared"""
+        groups: Dict[str, List[Notification]] = {}
+        for note in batch:
+            groups.setdefault(note.kind, []).append(note)
+        summaries = []
+        for kind, notes in groups.items():
+            if len(notes) == 1:
+                summaries.append((notes[0].title, notes[0].message))
+            elif kind == 'organized':
+                categories = {note.category for note in notes if note.category}
+                message = f"{len(notes)} files organized"
+                if categories:
+                    message += f" into {len(categories)} categor{'y' if len(categories) == 1 else 'ies'}"
+                summaries.append((notes[0].title, message))
+            elif kind == 'error':
+                summaries.append((notes[0].title, f"{len(notes)} errors, the first: {notes[0].message}"))
+            else:
+                summaries.append((notes[0].title, f"{len(notes)} notifications, the latest: {notes[-1].message}"))
+        return summaries
\ No newline at end of file
@@ -0,0 +1,420 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .manifest import DirectoryManifest
+from .move_executor import MoveExecutor, MoveReport, MoveResult
+
+PLAN_VERSION = 1
+# Phase each operation runs in; rule actions keep their relative order
+OP_PHASE = {'reset': 0, 'rmdir': 1, 'mkdir': 2, 'move': 3, 'skip': 3,
+            'rule_move': 4, 'encrypt': 4, 'duplicate': 4, 'notify': 4}
+_PATH_FIELDS = ('src', 'dest')
+
+@dataclass
+class PlannedOp:
+    op: str
+    src: Optional[Path] = None
+    dest: Optional[Path] = None
+    category: Optional[str] = None
+    rule: Optional[str] = None
+    action: Optional[Dict] = None
+    size: Optional[int] = None
+    mtime: Optional[int] = None
+    conflict: Optional[str] = None
+
+@dataclass
+class MovePlan:
+    directory: Path
+    rebuild: bool = False
+    config: str = ''
+    created: float = field(default_factory=time.time)
+    ops: List[PlannedOp] = field(default_factory=list)
+
+    @property
+    def conflicts(self) -> List[PlannedOp]:
+        return [op for op in self.ops if op.conflict]
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for op in self.ops:
+            counts[op.op] = counts.get(op.op, 0) + 1
+        return counts
+
+    def _rel(self, path: Optional[Path]) -> Optional[str]:
+        if path is None:
+            return None
+        try:
+            return str(path.relative_to(self.directory))
+        except ValueError:
+            return str(path)
+
+    def render(self) -> str:
+        """One line per operation, diff style, with conflicts flagged"""
+        symbols = {'reset': '<', 'rmdir': '-', 'mkdir': '+', 'move': '>', 'skip': '=',
+                   'rule_move': '>>', 'encrypt': '*', 'duplicate': '?', 'notify': '!'}
+        lines = []
+        for op in self.ops:
+            text = f"{symbols.get(op.op, ' '):<2} {op.op:<9} {self._rel(op.src) or ''}"
+            if op.dest is not None and op.op not in ('mkdir', 'rmdir'):
+                text += f" -> {self._rel(op.dest)}"
+            elif op.op == 'mkdir':
+                text = f"{symbols['mkdir']:<2} {op.op:<9} {self._rel(op.dest)}/"
+            if op.rule:
+                text += f"  [{op.rule}]"
+            if op.conflict:
+                text += f"  CONFLICT: {op.conflict}"
+            lines.append(text)
+        summary = ', '.join(f"{count} {name}" for name, count in self.counts().items())
+        lines.append(f"# {summary or 'nothing to do'}; {len(self.conflicts)} conflicts")
+        return '\n'.join(lines)
+
+    def to_json(self) -> str:
+        ops = []
+        for op in self.ops:
+            data = {k: v for k, v in asdict(op).items() if v is not None}
+            for key in _PATH_FIELDS:
+                if key in data:
+                    data[key] = self._rel(data[key])
+            ops.append(data)
+        return json.dumps({
+            'version': PLAN_VERSION,
+            'directory': str(self.directory),
+            'rebuild': self.rebuild,
+            'config': self.config,
+            'created': self.created,
+            'ops': ops
+        }, indent=1)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'MovePlan':
+        data = json.loads(text)
+        if data.get('version') != PLAN_VERSION:
+            raise ValueError(f"Unsupported plan version: {data.get('version')}")
+        directory = Path(data['directory'])
+        plan = cls(directory, data.get('rebuild', False), data.get('config', ''), data.get('created', 0))
+        for item in data['ops']:
+            for key in _PATH_FIELDS:
+                if key in item:
+                    item[key] = directory / item[key]
+            plan.ops.append(PlannedOp(**item))
+        return plan
+
+class _VirtualTree:
+    """Directory listings read from disk on first use and then updated in memory
+
+    Folders moved in the plan are listed from where they still sit on disk,
+    and folders moved away or removed read as empty.
+    """
+
+    def __init__(self):
+        self._dirs: Dict[Path, Set[str]] = {}
+        # Planned location -> where it is on disk, for folders moved as a whole
+        self._moved: Dict[Path, Path] = {}
+
+    def names(self, directory: Path) -> Set[str]:
+        names = self._dirs.get(directory)
+        if names is None:
+            names = set()
+            if not self._vacated(directory):
+                try:
+                    names = set(os.listdir(self._disk(directory)))
+                except OSError:
+                    pass
+            self._dirs[directory] = names
+        return names
+
+    def _disk(self, path: Path) -> Path:
+        for ancestor in (path, *path.parents):
+            origin = self._moved.get(ancestor)
+            if origin is not None:
+                return origin / path.relative_to(ancestor)
+        return path
+
+    def _vacated(self, directory: Path) -> bool:
+        # The nearest listing we already hold decides whether the folder is still there
+        child = directory
+        for ancestor in directory.parents:
+            names = self._dirs.get(ancestor)
+            if names is not None:
+                return child.name not in names
+            child = ancestor
+        return False
+
+    def exists(self, path: Path) -> bool:
+        return path.name in self.names(path.parent)
+
+    def is_dir(self, path: Path) -> bool:
+        return self.exists(path) and (path in self._dirs or self._disk(path).is_dir())
+
+    def add(self, path: Path) -> None:
+        self.names(path.parent).add(path.name)
+
+    def remove(self, path: Path) -> None:
+        self.names(path.parent).discard(path.name)
+
+    def move(self, src: Path, dest: Path) -> None:
+        """Move a file or folder, along with whatever is known of its contents"""
+        origin = self._disk(src)
+        for table in (self._dirs, self._moved):
+            for path in [p for p in table if p == src or src in p.parents]:
+                table[dest / path.relative_to(src)] = table.pop(path)
+        self._moved[dest] = origin
+        self.remove(src)
+        self.add(dest)
+
+    def mkdir(self, path: Path) -> None:
+        self.add(path)
+        self._dirs.setdefault(path, set())
+
+    def rmdir(self, path: Path) -> None:
+        self.remove(path)
+        self._dirs[path] = set()
+
+class Planner:
+    """Works out everything ``organize`` would do without changing the disk.
+
+    The plan covers resets, container creation, category moves with their
+    collision handling, and the rule actions that would follow, all
+    simulated against an in-memory copy of the directory listings. A plan
+    can be saved as JSON and applied later; stale entries are skipped.
+    """
+
+    def __init__(self, organizer):
+        self.organizer = organizer
+
+    def build(self, directory: Path, rules: List[Dict] = None, rebuild: bool = False,
+              recursive: bool = None) -> MovePlan:
+        org = self.organizer
+        org._validate_path(directory)
+        manifest = DirectoryManifest(directory, org.snapshot.fingerprint)
+        rebuild = rebuild or not manifest.load()
+        if recursive is None:
+            recursive = org.config.get('scan', {}).get('recursive', False)
+        plan = MovePlan(directory, rebuild, manifest.config_fingerprint)
+        tree = _VirtualTree()
+
+        if rebuild:
+            reset = self._plan_reset(plan, tree, org._container_names() if recursive else None)
+            self._plan_containers(plan, tree)
+            # Classified where they sit now so content sniffing can still read them
+            categories = org._categorize(directory, [(child, stat) for child, _, stat in reset])
+            moves = [
+                (dest, directory / category, category, stat)
+                for (_, dest, stat), category in zip(reset, categories)
+            ]
+            moves.extend(org._classify_files(directory, recursive))
+        else:
+            self._plan_containers(plan, tree)
+            _, moves = org._classify_incremental(directory, manifest, recursive)
+
+        placed = self._plan_moves(plan, tree, moves)
+        if rules:
+            self._plan_rules(plan, tree, placed, org.rule_engine.plan_for(rules))
+        plan.ops.sort(key=lambda op: OP_PHASE.get(op.op, 4))
+        return plan
+
+    def _plan_reset(self, plan: MovePlan, tree: _VirtualTree,
+                    only: Optional[List[str]]) -> List[Tuple[Path, Path, os.stat_result]]:
+        """Mirror _reset_desktop; returns (current path, new path, stat) for the files it brings up"""
+        directory = plan.directory
+        loose = []
+        for item in sorted(directory.iterdir()):
+            if only is not None and item.name not in only:
+                continue
+            if not item.is_dir() or item.name == 'System Volume Information':
+                continue
+            emptied = True
+            for child in sorted(item.glob('*')):
+                dest = directory / child.name
+                stat = child.stat()
+                op = PlannedOp('reset', child, dest, size=stat.st_size, mtime=stat.st_mtime_ns)
+                if tree.exists(dest):
+                    op.conflict = f"{child.name} already exists in {directory.name}"
+                    emptied = False
+                else:
+                    tree.move(child, dest)
+                    if child.is_file() and not child.name.startswith('.'):
+                        loose.append((child, dest, stat))
+                plan.ops.append(op)
+            if emptied:
+                plan.ops.append(PlannedOp('rmdir', item))
+                tree.rmdir(item)
+        return loose
+
+    def _plan_containers(self, plan: MovePlan, tree: _VirtualTree) -> None:
+        for category in self.organizer.config['categories']:
+            container = plan.directory / category
+            if not tree.is_dir(container):
+                plan.ops.append(PlannedOp('mkdir', dest=container, category=category))
+                tree.mkdir(container)
+
+    def _plan_moves(self, plan: MovePlan, tree: _VirtualTree,
+                    moves: Iterable[Tuple]) -> List[Tuple[Path, os.stat_result]]:
+        """Resolve category moves the way MoveExecutor would; returns where files land"""
+        policy = self.organizer.executor.collision_policy
+        placed = []
+        for src, dest_dir, category, stat in moves:
+            if not tree.is_dir(dest_dir):
+                plan.ops.append(PlannedOp('mkdir', dest=dest_dir, category=category))
+                tree.mkdir(dest_dir)
+            name = src.name
+            op = PlannedOp('move', src, None, category, size=stat.st_size, mtime=stat.st_mtime_ns)
+            if tree.exists(dest_dir / name):
+                if policy == 'skip':
+                    op.op = 'skip'
+                    op.dest = dest_dir / name
+                    op.conflict = f"{name} already exists in {dest_dir.name}"
+                    plan.ops.append(op)
+                    continue
+                if policy == 'rename':
+                    name = MoveExecutor._free_name(name, tree.names(dest_dir))
+                    op.conflict = f"renamed to {name}"
+                else:
+                    op.conflict = f"overwrites {dest_dir.name}/{name}"
+            op.dest = dest_dir / name
+            tree.remove(src)
+            tree.add(op.dest)
+            plan.ops.append(op)
+            placed.append((op.dest, stat))
+        return placed
+
+    def _plan_rules(self, plan: MovePlan, tree: _VirtualTree, placed: List[Tuple[Path, os.stat_result]],
+                    rule_plan) -> None:
+        engine = self.organizer.rule_engine
+        for file, stat in placed:
+            current = file
+            for rule, target in engine.simulate(file, rule_plan, stat):
+                action = rule.action
+                action_type = action['type']
+                if action_type == 'move':
+                    op = PlannedOp('rule_move', current, target, rule=rule.name, action=action)
+                    if tree.exists(target):
+                        op.conflict = f"rule move after the {file.parent.name} move would replace {target.name}"
+                    tree.remove(current)
+                    tree.add(target)
+                    current = target
+                elif action_type == 'encrypt':
+                    op = PlannedOp('encrypt', current, current.with_name(current.name + '.enc'),
+                                   rule=rule.name, action=action)
+                    if tree.exists(op.dest):
+                        op.conflict = f"{op.dest.name} already exists"
+                elif action_type == 'duplicate':
+                    op = PlannedOp('duplicate', current, rule=rule.name, action=action)
+                else:
+                    op = PlannedOp(action_type, current, rule=rule.name, action=action)
+                plan.ops.append(op)
+
+    def apply(self, plan: MovePlan) -> MoveReport:
+        """Carry out a plan, skipping entries whose source changed since it was made"""
+        org = self.organizer
+        directory = plan.directory
+        org._validate_path(directory)
+        report = MoveReport()
+        if plan.config and plan.config != org.snapshot.fingerprint:
+            org.logger.warning("Applying a plan made with a different configuration")
+        journal = org._journal(directory)
+        with org._run_lock(journal):
+            if journal:
+                org._resume(journal)
+            run = journal.begin('plan') if journal else None
+            manifest = DirectoryManifest(directory, org.snapshot.fingerprint)
+            manifest.load()
+            if plan.rebuild:
+                manifest.entries = {}
+            try:
+                self._apply_resets(plan, report, run)
+                org._create_containers(directory)
+                for op in plan.ops:
+                    if op.op == 'mkdir':
+                        op.dest.mkdir(parents=True, exist_ok=True)
+                self._apply_moves(plan, report, manifest, run)
+                self._apply_rules(plan, report, manifest, run)
+            finally:
+                org._forget_duplicates(manifest, org._flush_rule_actions(run))
+                if run:
+                    run.end()
+            try:
+                manifest.save()
+            except OSError as e:
+                org.logger.error(f"Manifest save failed: {str(e)}")
+        return report
+
+    @staticmethod
+    def _unchanged(op: PlannedOp) -> Optional[str]:
+        try:
+            stat = op.src.stat()
+        except OSError:
+            return f"{op.src.name} no longer exists"
+        if op.size is not None and (stat.st_size != op.size or stat.st_mtime_ns != op.mtime):
+            return f"{op.src.name} changed since the plan was made"
+        return None
+
+    def _apply_resets(self, plan: MovePlan, report: MoveReport, run) -> None:
+        resets = []
+        for op in plan.ops:
+            if op.op == 'reset' and not op.conflict:
+                result = MoveResult(src=op.src, category=op.src.parent.name, dest=op.dest)
+                result.error = self._unchanged(op)
+                if result.error:
+                    result.status = 'failed'
+                else:
+                    resets.append(result)
+                report.results.append(result)
+        self.organizer.executor.move_all(resets, journal=run)
+        for op in plan.ops:
+            if op.op == 'rmdir':
+                try:
+                    op.src.rmdir()
+                except OSError as e:
+                    self.organizer.logger.error(f"Folder removal failed: {str(e)}")
+
+    def _apply_moves(self, plan: MovePlan, report: MoveReport, manifest: DirectoryManifest, run) -> None:
+        executor = self.organizer.executor
+        ready = []
+        for op in plan.ops:
+            if op.op != 'move':
+                continue
+            result = MoveResult(src=op.src, category=op.category, dest=op.dest,
+                                collision=op.conflict is not None)
+            result.error = self._unchanged(op)
+            if result.error:
+                result.status = 'failed'
+            else:
+                ready.append(result)
+            report.results.append(result)
+        with ThreadPoolExecutor(max_workers=executor.max_workers) as pool:
+            executor.move_all(ready, pool, run)
+        for result in ready:
+            if result.ok:
+                manifest.record(f"{result.category}/{result.dest.name}", result.dest.stat(), result.category)
+
+    def _apply_rules(self, plan: MovePlan, report: MoveReport, manifest: DirectoryManifest, run) -> None:
+        engine = self.organizer.rule_engine
+        for op in plan.ops:
+            if op.op not in ('rule_move', 'encrypt', 'duplicate', 'notify'):
+                continue
+            if not op.src.exists():
+                # Its category move didn't happen
+                continue
+            if op.op == 'rule_move':
+                result = MoveResult(src=op.src, category=op.src.parent.name, dest=op.dest)
+                report.results.append(result)
+                if op.dest.exists():
+                    result.status = 'failed'
+                    result.error = f"{op.dest.name} already exists"
+                    continue
+            if op.op not in ('notify', 'duplicate'):
+                manifest.forget(f"{op.src.parent.name}/{op.src.name}")
+            try:
+                engine._execute_action(op.src, op.action, run)
+            except OSError as e:
+                if op.op == 'rule_move':
+                    result.status = 'failed'
+                    result.error = str(e)
+                continue
+            if op.op == 'rule_move':
+                result.status = 'moved'
\ No newline at end of file
@@ -0,0 +1,78 @@
+import time
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+@dataclass
+class ProgressEvent:
+    stage: str
+    done: int
+    total: Optional[int]
+    elapsed: float
+    path: Optional[Path] = None
+    category: Optional[str] = None
+    finished: bool = False
+
+    @property
+    def rate(self) -> float:
+        """Files per second in the current stage"""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+class ProgressTracker:
+    """Counts files through each organize stage and reports them to ``callback``.
+
+    ``advance`` may be called from worker threads; events are throttled to
+    one per ``interval`` seconds, plus one at every stage change, so the
+    callback can safely be something like ``queue.put`` feeding a GUI.
+    Setting ``cancel`` asks the run to stop before the next file.
+    """
+
+    def __init__(self, callback: Callable[[ProgressEvent], None] = None,
+                 cancel: threading.Event = None, interval: float = 0.1):
+        self.callback = callback
+        self.cancel = cancel
+        self.interval = interval
+        self.stage_name = ''
+        self.total: Optional[int] = None
+        self.done = 0
+        self._started = time.perf_counter()
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def stage(self, name: str, total: int = None) -> None:
+        with self._lock:
+            self.stage_name = name
+            self.total = total
+            self.done = 0
+            self._started = time.perf_counter()
+            event = self._event()
+        self._emit(event)
+
+    def advance(self, count: int = 1, path: Path = None, category: str = None) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self.done += count
+            if now - self._last_emit < self.interval:
+                return
+            self._last_emit = now
+            event = self._event(path, category)
+        self._emit(event)
+
+    def finish(self) -> None:
+        with self._lock:
+            event = self._event()
+            event.finished = True
+        self._emit(event)
+
+    def _event(self, path: Path = None, category: str = None) -> ProgressEvent:
+        return ProgressEvent(self.stage_name, self.done, self.total,
+                             time.perf_counter() - self._started, path, category)
+
+    def _emit(self, event: ProgressEvent) -> None:
+        if self.callback:
+            self.callback(event)
\ No newline at end of file
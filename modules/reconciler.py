@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+import logging
+import platform
+import threading
+import contextlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from .scanner import IGNORE_FILE, IgnoreRules
+from .metrics import REGISTRY
+
+RECONCILE_PASSES = REGISTRY.counter('reconcile_passes_total', 'Reconciliation checks per root, by result')
+RECONCILE_MISSED = REGISTRY.counter('reconcile_missed_files_total', 'Loose files the watcher missed and reconciliation queued')
+
+# (ioprio_set, ioprio_get) syscall numbers; there is no libc wrapper for them
+IOPRIO_SYSCALLS = {
+    'x86_64': (251, 252), 'i386': (289, 290), 'i686': (289, 290),
+    'aarch64': (30, 31), 'riscv64': (30, 31), 'armv7l': (314, 315),
+    'ppc64le': (273, 274), 's390x': (282, 283),
+}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_IDLE = 3 << 13
+NICE_STEP = 10
+
+@dataclass
+class _RootState:
+    dir_mtime: Optional[int] = None
+    count: int = 0
+    max_mtime: int = 0
+    entries: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+class Reconciler:
+    """Periodic check that re-queues loose files whose watch events were dropped.
+
+    Each pass works in three steps per watched root: an unchanged directory
+    mtime ends the check with a single stat; otherwise the entry count and
+    newest mtime are compared; only if those differ is each entry diffed
+    against the last pass. Files younger than ``grace`` seconds are left to
+    the watcher. Roots whose queue is busy are skipped until the next pass.
+    """
+
+    def __init__(self, monitor, grace: float = 10.0):
+        self.monitor = monitor
+        self.grace = grace
+        self._states: Dict[Path, _RootState] = {}
+        self._lock = threading.Lock()
+
+    def run(self) -> int:
+        """Check every watched root; returns how many missed files were queued"""
+        if not self._lock.acquire(blocking=False):
+            # The previous pass is still going
+            return 0
+        try:
+            with background_priority():
+                return self._run()
+        finally:
+            self._lock.release()
+
+    def _run(self) -> int:
+        roots = self.monitor.paths
+        for root in list(self._states):
+            if root not in roots:
+                del self._states[root]
+        queued = 0
+        for root in roots:
+            handler = self.monitor.handler_for(root)
+            if handler is None:
+                continue
+            if handler.queue.depth:
+                RECONCILE_PASSES.inc(result='busy')
+                continue
+            missed = self.reconcile(root)
+            for path in missed:
+                handler.queue.add(path)
+            queued += len(missed)
+        return queued
+
+    def reconcile(self, root: Path) -> List[Path]:
+        """Loose files in ``root`` that are new or changed since the last pass"""
+        try:
+            dir_mtime = os.stat(root).st_mtime_ns
+        except OSError:
+            return []
+        state = self._states.get(root)
+        if state is not None and state.dir_mtime == dir_mtime:
+            RECONCILE_PASSES.inc(result='unchanged')
+            return []
+
+        ignore = IgnoreRules.from_file(root / IGNORE_FILE, self.monitor.organizer.config.get('scan', {}).get('ignore', ()))
+        cutoff = time.time_ns() - int(self.grace * 1e9)
+        current: Dict[str, Tuple[int, int]] = {}
+        count = 0
+        max_mtime = 0
+        settled = True
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.name.startswith(('.', '~')) or not entry.is_file() or ignore.ignored(entry.name, False):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    count += 1
+                    max_mtime = max(max_mtime, stat.st_mtime_ns)
+                    if stat.st_mtime_ns > cutoff:
+                        # Too fresh to call missed; look again next pass
+                        settled = False
+                        continue
+                    current[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return []
+
+        new_state = _RootState(dir_mtime if settled else None, count, max_mtime, current)
+        self._states[root] = new_state
+        if state is None:
+            # First sight of this root: the baseline, nothing was missed yet
+            RECONCILE_PASSES.inc(result='baseline')
+            return []
+        if settled and (count, max_mtime) == (state.count, state.max_mtime):
+            RECONCILE_PASSES.inc(result='fingerprint')
+            return []
+
+        RECONCILE_PASSES.inc(result='diffed')
+        missed = [root / name for name, sig in current.items() if state.entries.get(name) != sig]
+        if missed:
+            RECONCILE_MISSED.inc(len(missed))
+            logging.getLogger(__name__).info(f"Reconciliation found {len(missed)} missed file(s) in {root}")
+        return missed
+
+@contextlib.contextmanager
+def background_priority():
+    """Run the block at idle I/O priority on the calling thread, then restore it
+
+    Scheduler pool threads are shared with other jobs, so the previous
+    priority always comes back. Where the I/O class can't be set, the nice
+    value is raised instead, but only if this process may lower it again.
+    """
+    restore = _lower_io_priority() or _lower_cpu_priority()
+    try:
+        yield
+    finally:
+        if restore:
+            restore()
+
+def _lower_io_priority() -> Optional[Callable[[], None]]:
+    calls = IOPRIO_SYSCALLS.get(platform.machine())
+    if not sys.platform.startswith('linux') or calls is None:
+        return None
+    try:
+        import ctypes
+        syscall = ctypes.CDLL(None, use_errno=True).syscall
+    except (OSError, AttributeError):
+        return None
+    set_call, get_call = calls
+    # Linux keeps I/O priority per thread, addressed by its native id
+    tid = threading.get_native_id()
+    previous = syscall(get_call, IOPRIO_WHO_PROCESS, tid)
+    if previous < 0 or syscall(set_call, IOPRIO_WHO_PROCESS, tid, IOPRIO_IDLE) != 0:
+        return None
+    return lambda: syscall(set_call, IOPRIO_WHO_PROCESS, tid, previous)
+
+def _lower_cpu_priority() -> Optional[Callable[[], None]]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import resource
+        tid = threading.get_native_id()
+        previous = os.getpriority(os.PRIO_PROCESS, tid)
+        # RLIMIT_NICE caps how far an unprivileged process may lower nice again
+        floor = 20 - resource.getrlimit(resource.RLIMIT_NICE)[0]
+        if os.geteuid() != 0 and previous < floor:
+            return None
+        os.setpriority(os.PRIO_PROCESS, tid, min(previous + NICE_STEP, 19))
+    except (ImportError, AttributeError, OSError):
+        return None
+
+    def restore() -> None:
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, previous)
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Could not restore thread priority: {str(e)}")
+    return restore
\ No newline at end of file
@@ -1,71 +1,235 @@
-import json
+import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import re
+from .metrics import REGISTRY
+from .journal import ActiveRun
+from .duplicates import DuplicateFinder, DuplicateReport, HashCache, resolve_duplicates
+
+RULE_MATCHES = REGISTRY.counter('rule_matches_total', 'Files matched, by rule name')
+RULES_EVALUATED = REGISTRY.counter('rule_evaluations_total', 'Files run through a rule plan')
+
+class CompiledRule:
+    """A rule with its conditions pre-compiled, checked cheapest first"""
+
+    __slots__ = ('name', 'action', 'extensions', 'pattern', 'min_size', 'max_size')
+
+    def __init__(self, rule: Dict):
+        conditions = rule.get('conditions', {})
+        self.name = rule.get('name', '')
+        self.action = rule['action']
+        self.extensions = frozenset(conditions['extensions']) if 'extensions' in conditions else None
+        self.pattern = re.compile(conditions['name_pattern']) if 'name_pattern' in conditions else None
+        self.min_size = conditions.get('min_size')
+        self.max_size = conditions.get('max_size')
+
+    @property
+    def needs_stat(self) -> bool:
+        return self.min_size is not None or self.max_size is not None
+
+    def matches(self, name: str, suffix: str, size: Optional[int]) -> bool:
+        if self.extensions is not None and suffix not in self.extensions:
+            return False
+        if self.pattern is not None and not self.pattern.search(name):
+            return False
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        return True
+
+class RulePlan:
+    """Ordered, immutable list of compiled rules"""
+
+    def __init__(self, rules: List[CompiledRule]):
+        self.rules = tuple(rules)
+        self.needs_stat = any(rule.needs_stat for rule in self.rules)
+
+    @classmethod
+    def compile(cls, rules: List[Dict]) -> 'RulePlan':
+        return cls([CompiledRule(rule) for rule in rules])
+
+    def __add__(self, other: 'RulePlan') -> 'RulePlan':
+        return RulePlan(list(self.rules) + list(other.rules))
+
+    def __len__(self) -> int:
+        return len(self.rules)
 
 class RuleEngine:
-    def __init__(self, rules_path: str = "config/rules.json"):
-        self.rules = self._load_rules(rules_path)
+    def __init__(self, rules_path: str = None, encrypt_workers: int = None,
+                 hash_workers: int = 4, hash_cache: str = None, notifier: 'NotificationDispatcher' = None,
+                 config: 'ConfigService' = None):
+        # ``config`` is anything with a ``snapshot``; rules follow its reloads
+        if config is None:
+            from .config_service import ConfigService
+            config = ConfigService.shared(rules_path=rules_path)
+        self.config = config
+        self.encrypt_workers = encrypt_workers
+        self.hash_workers = hash_workers
+        self.hash_cache = hash_cache
+        self.notifier = notifier
+        self._vault = None
+        self._finder = None
+        self._pending_encrypts: Dict[str, Dict[Path, None]] = {}
+        self._pending_duplicates: Dict[Path, Dict] = {}
         
-    def _load_rules(self, path: str) -> List[Dict]:
-        try:
-            with open(path) as f:
-                return json.load(f)
-        except Exception:
-            return []
-            
-    def apply_rules(self, file: Path, additional_rules: List[Dict] = None) -> None:
-        all_rules = self.rules + (additional_rules or [])
+    @property
+    def rules(self) -> List[Dict]:
+        return list(self.config.snapshot.rules)
         
-        for rule in all_rules:
-            if self._matches_rule(file, rule):
-                self._execute_action(file, rule['action'])
-                
-    def _matches_rule(self, file: Path, rule: Dict) -> bool:
-        conditions = rule.get('conditions', {})
+    @property
+    def plan(self) -> RulePlan:
+        return self.config.snapshot.rule_plan
         
-        # Name matching
-        if 'name_pattern' in conditions:
-            if not re.search(conditions['name_pattern'], file.name):
-                return False
-                
-        # Extension matching
-        if 'extensions' in conditions:
-            if file.suffix.lower() not in conditions['extensions']:
-                return False
-                
-        # Size conditions
-        if 'min_size' in conditions:
-            if file.stat().st_size < conditions['min_size']:
-                return False
-                
-        if 'max_size' in conditions:
-            if file.stat().st_size > conditions['max_size']:
-                return False
-                
-        return True
+    def plan_for(self, additional_rules: Union[List[Dict], RulePlan, None] = None) -> RulePlan:
+        """Compile the configured rules plus any extra ones into a single plan"""
+        if not additional_rules:
+            return self.plan
+        if isinstance(additional_rules, RulePlan):
+            return additional_rules
+        return self.plan + RulePlan.compile(additional_rules)
+        
+    def apply_rules(self, file: Path, additional_rules: Union[List[Dict], RulePlan, None] = None,
+                    stat: os.stat_result = None, journal: ActiveRun = None) -> Optional[Path]:
+        """Run every matching rule against a file
+
+        ``additional_rules`` may be a plan from ``plan_for`` so batches only
+        compile once; ``stat`` lets callers pass the result they already have
+        (e.g. from ``os.scandir``) so the file is stat'ed at most once.
+        Rule moves are logged to ``journal`` when one is given.
+        Returns where the file ended up, or None if an action consumed it.
+        """
+        plan = self.plan_for(additional_rules)
+        if not plan.rules:
+            return file
+            
+        size = None
+        if plan.needs_stat:
+            size = (stat or file.stat()).st_size
+            
+        RULES_EVALUATED.inc()
+        name = file.name
+        suffix = file.suffix.lower()
+        for rule in plan.rules:
+            if rule.matches(name, suffix, size):
+                RULE_MATCHES.inc(rule=rule.name)
+                file = self._execute_action(file, rule.action, journal)
+                if file is None:
+                    return None
+        return file
+        
+    def simulate(self, file: Path, additional_rules: Union[List[Dict], RulePlan, None] = None,
+                 stat: os.stat_result = None) -> List[Tuple[CompiledRule, Optional[Path]]]:
+        """The steps ``apply_rules`` would take, as (rule, resulting path) pairs, without touching disk
+
+        The path is None once an encrypt action consumes the file.
+        """
+        plan = self.plan_for(additional_rules)
+        steps = []
+        if not plan.rules:
+            return steps
+        size = (stat or file.stat()).st_size if plan.needs_stat else None
+        name = file.name
+        suffix = file.suffix.lower()
+        for rule in plan.rules:
+            if not rule.matches(name, suffix, size):
+                continue
+            action_type = rule.action['type']
+            if action_type == 'move':
+                file = file.parent / rule.action['destination'] / file.name
+            elif action_type == 'encrypt':
+                steps.append((rule, None))
+                break
+            steps.append((rule, file))
+        return steps
         
-    def _execute_action(self, file: Path, action: Dict) -> None:
+    def _execute_action(self, file: Path, action: Dict, journal: ActiveRun = None) -> Optional[Path]:
         action_type = action['type']
         
         if action_type == 'move':
-            self._move_file(file, action['destination'])
+            return self._move_file(file, action['destination'], journal)
         elif action_type == 'encrypt':
             self._encrypt_file(file, action.get('password'))
+            return None
+        elif action_type == 'duplicate':
+            # Checked against its folder in one pass by flush_duplicates(); until
+            # then the file is still in play for later rules
+            self._pending_duplicates[file] = action
         elif action_type == 'notify':
             self._send_notification(file, action['message'])
+        return file
             
-    def _move_file(self, file: Path, destination: str) -> None:
+    def _move_file(self, file: Path, destination: str, journal: ActiveRun = None) -> Path:
         dest_path = file.parent / destination
         dest_path.mkdir(exist_ok=True)
-        file.rename(dest_path / file.name)
+        target = dest_path / file.name
+        seqs = journal.planned([(file, target)]) if journal else None
+        file.rename(target)
+        if journal:
+            journal.done(seqs)
+        if file in self._pending_duplicates:
+            self._pending_duplicates[target] = self._pending_duplicates.pop(file)
+        return target
         
     def _encrypt_file(self, file: Path, password: str = None) -> None:
-        from .security import FileVault
-        vault = FileVault()
-        vault.encrypt_file(file, password or 'default')
+        # Queued so a run's matches are encrypted together by flush()
+        self._pending_duplicates.pop(file, None)
+        self._pending_encrypts.setdefault(password or 'default', {})[file] = None
+        
+    @property
+    def pending_encrypts(self) -> int:
+        return sum(len(files) for files in self._pending_encrypts.values())
+        
+    def flush(self, progress: Callable = None) -> 'EncryptReport':
+        """Encrypt every queued file, one process-pool batch per password"""
+        from .security import FileVault, EncryptReport
+        report = EncryptReport()
+        if not self._pending_encrypts:
+            return report
+        if self._vault is None:
+            self._vault = FileVault()
+            
+        pending, self._pending_encrypts = self._pending_encrypts, {}
+        for password, files in pending.items():
+            batch = self._vault.encrypt_files(files, password, self.encrypt_workers, progress)
+            report.results.extend(batch.results)
+        return report
+        
+    def flush_duplicates(self, journal: ActiveRun = None) -> DuplicateReport:
+        """Compare queued files with the other files in their folders and act on the copies
+
+        Copies moved aside are logged to ``journal`` so ``undo`` can put them back.
+        """
+        report = DuplicateReport()
+        if not self._pending_duplicates:
+            return report
+        if self._finder is None:
+            self._finder = DuplicateFinder(self.hash_workers, HashCache(self.hash_cache))
+            
+        pending, self._pending_duplicates = self._pending_duplicates, {}
+        candidates = []
+        for folder in {file.parent for file in pending}:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if not entry.name.startswith('.') and entry.is_file(follow_symlinks=False):
+                            candidates.append((Path(entry.path), entry.stat()))
+            except OSError:
+                continue
+                
+        report.groups = [
+            group for group in self._finder.find(candidates)
+            if any(file in pending for file in group.files)
+        ]
+        report.results = resolve_duplicates(report.groups, pending, journal)
+        try:
+            self._finder.cache.save()
+        except OSError:
+            pass
+        return report
         
     def _send_notification(self, file: Path, message: str) -> None:
-        from ..gui.notification_manager import NotificationManager
-        notifier = NotificationManager()
-        notifier.show_notification("File Action", message.format(file=file.name))
\ No newline at end of file
+        if self.notifier is None:
+            from .notifications import NotificationDispatcher
+            self.notifier = NotificationDispatcher()
+        self.notifier.notify("File Action", message.format(file=file.name), 'rule')
\ No newline at end of file
@@ -0,0 +1,155 @@
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+IGNORE_FILE = '.organizerignore'
+SYMLINK_POLICIES = ('skip', 'files', 'follow')
+
+class IgnoreRules:
+    """gitignore-style patterns matched against paths relative to the scan root.
+
+    Supports ``#`` comments, ``!`` negation, a trailing ``/`` for
+    directory-only patterns, a leading or inner ``/`` to anchor a pattern to
+    the root, and ``*``, ``?`` and ``**`` wildcards. The last matching
+    pattern wins.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self._rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in patterns:
+            self.add(line)
+
+    @classmethod
+    def from_file(cls, path: Path, extra: Iterable[str] = ()) -> 'IgnoreRules':
+        rules = cls(extra)
+        try:
+            with open(path) as f:
+                for line in f:
+                    rules.add(line)
+        except OSError:
+            pass
+        return rules
+
+    def add(self, line: str) -> None:
+        line = line.rstrip('\n').rstrip()
+        if not line or line.startswith('#'):
+            return
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = '/' in line
+        line = line.lstrip('/')
+        regex = self._translate(line)
+        if not anchored:
+            regex = f"(?:.*/)?{regex}"
+        self._rules.append((re.compile(f"^{regex}$"), negate, dir_only))
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        out = []
+        i = 0
+        while i < len(pattern):
+            ch = pattern[i]
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+                continue
+            if ch == '*':
+                out.append('[^/]*')
+            elif ch == '?':
+                out.append('[^/]')
+            else:
+                out.append(re.escape(ch))
+            i += 1
+        return ''.join(out)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        result = False
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+def scan_tree(root: Path, max_depth: Optional[int] = None, ignore: IgnoreRules = None,
+              symlinks: str = 'skip', skip_dirs: Iterable[str] = (),
+              include_hidden: bool = False) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Stream the files under ``root`` as ``(DirEntry, relative path)`` pairs
+
+    Directories are walked depth-first with ``os.scandir`` and only the
+    pending directory stack is held in memory. ``max_depth`` counts
+    directory levels below the root (0 means top level only). ``skip_dirs``
+    are top-level directory names never descended into. ``symlinks`` is
+    'skip' (ignore links), 'files' (yield linked files, never enter linked
+    directories) or 'follow' (also enter linked directories, guarding
+    against loops).
+    """
+    if symlinks not in SYMLINK_POLICIES:
+        raise ValueError(f"Unknown symlink policy: {symlinks}")
+    skip_dirs = set(skip_dirs)
+    follow = symlinks == 'follow'
+    visited: Set[Tuple[int, int]] = set()
+    if follow:
+        st = os.stat(root)
+        visited.add((st.st_dev, st.st_ino))
+
+    stack: List[Tuple[str, str, int]] = [(str(root), '', 0)]
+    while stack:
+        path, rel_dir, depth = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if not include_hidden and name.startswith('.'):
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    is_link = entry.is_symlink()
+                    if is_link and symlinks == 'skip':
+                        continue
+                    is_dir = entry.is_dir(follow_symlinks=follow)
+                except OSError:
+                    continue
+
+                if is_dir:
+                    if depth == 0 and name in skip_dirs:
+                        continue
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+                    if ignore and ignore.ignored(rel_path, True):
+                        continue
+                    if follow:
+                        # Every directory is recorded so a link back to an ancestor is caught
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        key = (st.st_dev, st.st_ino)
+                        if key in visited:
+                            continue
+                        visited.add(key)
+                    stack.append((entry.path, rel_path, depth + 1))
+                    continue
+
+                try:
+                    if not entry.is_file(follow_symlinks=True):
+                        continue
+                except OSError:
+                    continue
+                if ignore and ignore.ignored(rel_path, False):
+                    continue
+                yield entry, rel_path
\ No newline at end of file
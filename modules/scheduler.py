@@ -1,32 +1,171 @@
-import schedule
+import heapq
 import time
+import logging
 import threading
-from datetime import datetime
-from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+from .metrics import REGISTRY
+
+OVERLAP_POLICIES = ('skip', 'queue', 'concurrent')
+# Upper bound on one sleep, so a wall-clock jump only delays daily jobs briefly
+MAX_SLEEP = 60.0
+
+JOB_RUNS = REGISTRY.counter('scheduler_job_runs_total', 'Scheduled job occurrences, by job and outcome')
+JOB_SECONDS = REGISTRY.histogram('scheduler_job_seconds', 'Time spent running one scheduled job')
+JOB_LATENESS = REGISTRY.histogram('scheduler_start_lateness_seconds', 'Delay between a job falling due and starting')
+
+class Job:
+    """A task plus when it next runs; returned by the add_* methods so it can be cancelled"""
+
+    def __init__(self, task: Callable, overlap: str, interval: float = None,
+                 at: Tuple[int, int, int] = None, name: str = None):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+        self.task = task
+        self.overlap = overlap
+        self.interval = interval
+        self.at = at
+        self.name = name or getattr(task, '__qualname__', repr(task))
+        self.next_run = 0.0
+        self.running = 0
+        self.queued = False
+        self.cancelled = False
+
+    def schedule_next(self, now: float) -> None:
+        if self.at is not None:
+            hour, minute, second = self.at
+            current = datetime.fromtimestamp(now)
+            due = current.replace(hour=hour, minute=minute, second=second, microsecond=0)
+            if due <= current:
+                due += timedelta(days=1)
+            self.next_run = due.timestamp()
+        elif self.next_run:
+            # Keep the cadence, but don't replay runs missed while we were late
+            self.next_run += self.interval
+            if self.next_run <= now:
+                self.next_run = now + self.interval
+        else:
+            self.next_run = now + self.interval
+
+    def __repr__(self) -> str:
+        return f"Job({self.name!r}, next_run={datetime.fromtimestamp(self.next_run):%Y-%m-%d %H:%M:%S})"
 
 class TaskScheduler:
-    def __init__(self):
-        self.jobs = []
+    """Runs timed jobs on a worker pool, sleeping until the next one is due.
+
+    Jobs sit in a min-heap keyed by their next run time; the dispatcher
+    thread waits on a condition until that time or until a job is added or
+    cancelled, so an idle scheduler does no work. Each job's ``overlap``
+    policy decides what happens when it falls due while still running:
+    'skip' drops the occurrence, 'queue' runs it once more afterwards and
+    'concurrent' starts another copy.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self.jobs: List[Job] = []
         self.running = False
         self.thread = None
-        
-    def add_daily_task(self, task: Callable, time_str: str) -> None:
-        schedule.every().day.at(time_str).do(task)
-        
-    def add_interval_task(self, task: Callable, minutes: int) -> None:
-        schedule.every(minutes).minutes.do(task)
-        
+        self._heap: List[Tuple[float, int, Job]] = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def add_daily_task(self, task: Callable, time_str: str, overlap: str = 'skip') -> Job:
+        """Run ``task`` every day at ``time_str`` ('HH:MM' or 'HH:MM:SS', local time)"""
+        parts = [int(part) for part in time_str.split(':')]
+        if len(parts) not in (2, 3) or not (0 <= parts[0] < 24 and 0 <= parts[1] < 60):
+            raise ValueError(f"Invalid time: {time_str}")
+        hour, minute, second = (parts + [0])[:3]
+        return self._add(Job(task, overlap, at=(hour, minute, second)))
+
+    def add_interval_task(self, task: Callable, minutes: float, overlap: str = 'skip') -> Job:
+        """Run ``task`` every ``minutes`` minutes (fractions allowed), first after one interval"""
+        if minutes <= 0:
+            raise ValueError("Interval must be positive")
+        return self._add(Job(task, overlap, interval=minutes * 60))
+
+    def cancel(self, job: Job) -> None:
+        with self._cond:
+            job.cancelled = True
+            job.queued = False
+            if job in self.jobs:
+                self.jobs.remove(job)
+            self._cond.notify()
+
+    def _add(self, job: Job) -> Job:
+        with self._cond:
+            job.schedule_next(time.time())
+            self.jobs.append(job)
+            self._push(job)
+            self._cond.notify()
+        return job
+
+    def _push(self, job: Job) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (job.next_run, self._seq, job))
+
     def start(self) -> None:
-        self.running = True
-        self.thread = threading.Thread(target=self._run_scheduler)
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix='scheduler')
+        self.thread = threading.Thread(target=self._run_scheduler, name='scheduler', daemon=True)
         self.thread.start()
-        
-    def stop(self) -> None:
-        self.running = False
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop dispatching; with ``wait``, let running jobs finish first"""
+        with self._cond:
+            self.running = False
+            self._cond.notify()
         if self.thread:
             self.thread.join()
-            
+            self.thread = None
+        if self._pool:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
     def _run_scheduler(self) -> None:
-        while self.running:
-            schedule.run_pending()
-            time.sleep(1)
\ No newline at end of file
+        with self._cond:
+            while self.running:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                now = time.time()
+                if not self._heap or self._heap[0][0] > now:
+                    timeout = min(self._heap[0][0] - now, MAX_SLEEP) if self._heap else None
+                    self._cond.wait(timeout)
+                    continue
+
+                _, _, job = heapq.heappop(self._heap)
+                JOB_LATENESS.observe(now - job.next_run)
+                if job.running and job.overlap == 'skip':
+                    JOB_RUNS.inc(job=job.name, result='skipped')
+                elif job.running and job.overlap == 'queue':
+                    job.queued = True
+                    JOB_RUNS.inc(job=job.name, result='queued')
+                else:
+                    self._submit(job)
+                job.schedule_next(now)
+                self._push(job)
+
+    def _submit(self, job: Job) -> None:
+        # Called with the condition held
+        job.running += 1
+        self._pool.submit(self._run_job, job)
+
+    def _run_job(self, job: Job) -> None:
+        try:
+            with JOB_SECONDS.time():
+                job.task()
+            JOB_RUNS.inc(job=job.name, result='ok')
+        except Exception:
+            JOB_RUNS.inc(job=job.name, result='error')
+            logging.getLogger(__name__).exception(f"Scheduled job {job.name} failed")
+        finally:
+            with self._cond:
+                job.running -= 1
+                if job.queued and not job.running and self.running and not job.cancelled:
+                    job.queued = False
+                    self._submit(job)
\ No newline at end of file
@@ -1,45 +1,377 @@
+import os
 import json
+import copy
+import shutil
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import sqlite3
+from .config_service import ConfigService
+from .journal import ActiveRun
+from .metrics import REGISTRY
+from .move_executor import MoveExecutor, MoveReport, MoveResult
+
+CREATE_WORKSPACES = """
+    CREATE TABLE IF NOT EXISTS workspaces (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE,
+        config TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+INSERT_WORKSPACE = "INSERT INTO workspaces (name, config) VALUES (?, ?)"
+SELECT_CONFIG = "SELECT config FROM workspaces WHERE name = ?"
+# Named workspaces from either table; ones saved with only a layout date from their first one
+SELECT_ALL = """
+    SELECT name, created_at FROM workspaces
+    UNION ALL
+    SELECT workspace, MIN(taken_at) FROM layouts
+    WHERE workspace != '' AND workspace NOT IN (SELECT name FROM workspaces)
+    GROUP BY workspace
+"""
+DELETE_WORKSPACE = "DELETE FROM workspaces WHERE name = ?"
+
+# A layout is where every file of a root sat when it was recorded: loose
+# files plus files one folder down, the depth organize works at. ``category``
+# is that folder, '' for loose files; the primary key doubles as the path index.
+CREATE_LAYOUTS = """
+    CREATE TABLE IF NOT EXISTS layouts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        workspace TEXT NOT NULL,
+        root TEXT NOT NULL,
+        taken_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (workspace, root)
+    )
+"""
+CREATE_LAYOUT_FILES = """
+    CREATE TABLE IF NOT EXISTS layout_files (
+        layout_id INTEGER NOT NULL,
+        path TEXT NOT NULL,
+        category TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime INTEGER NOT NULL,
+        PRIMARY KEY (layout_id, path)
+    ) WITHOUT ROWID
+"""
+CREATE_CATEGORY_INDEX = "CREATE INDEX IF NOT EXISTS layout_files_category ON layout_files (layout_id, category)"
+CREATE_LAYOUT_DIRS = """
+    CREATE TABLE IF NOT EXISTS layout_dirs (
+        layout_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        mtime INTEGER NOT NULL,
+        PRIMARY KEY (layout_id, category)
+    ) WITHOUT ROWID
+"""
+CREATE_ACTIVE = "CREATE TABLE IF NOT EXISTS active_workspaces (root TEXT PRIMARY KEY, workspace TEXT NOT NULL)"
+SELECT_LAYOUT = "SELECT id FROM layouts WHERE workspace = ? AND root = ?"
+INSERT_LAYOUT = "INSERT INTO layouts (workspace, root) VALUES (?, ?)"
+TOUCH_LAYOUT = "UPDATE layouts SET taken_at = CURRENT_TIMESTAMP WHERE id = ?"
+SELECT_DIRS = "SELECT category, mtime FROM layout_dirs WHERE layout_id = ?"
+UPSERT_DIR = "INSERT OR REPLACE INTO layout_dirs (layout_id, category, mtime) VALUES (?, ?, ?)"
+DELETE_DIR = "DELETE FROM layout_dirs WHERE layout_id = ? AND category = ?"
+INSERT_FILE = "INSERT OR REPLACE INTO layout_files (layout_id, path, category, size, mtime) VALUES (?, ?, ?, ?, ?)"
+DELETE_FILE = "DELETE FROM layout_files WHERE layout_id = ? AND path = ?"
+DELETE_CATEGORY = "DELETE FROM layout_files WHERE layout_id = ? AND category = ?"
+DELETE_FILES = "DELETE FROM layout_files WHERE layout_id = ?"
+COPY_FILES = """
+    INSERT INTO layout_files (layout_id, path, category, size, mtime)
+    SELECT ?, path, category, size, mtime FROM layout_files WHERE layout_id = ?
+"""
+COUNT_FILES = "SELECT COUNT(*) FROM layout_files WHERE layout_id = ?"
+# Entries of the first layout with no file at the same path in the second
+DIFF_LAYOUTS = """
+    SELECT path, category, size, mtime FROM layout_files AS a
+    WHERE a.layout_id = ? AND NOT EXISTS (
+        SELECT 1 FROM layout_files AS b WHERE b.layout_id = ? AND b.path = a.path
+    )
+"""
+SET_ACTIVE = "INSERT OR REPLACE INTO active_workspaces (root, workspace) VALUES (?, ?)"
+SELECT_ACTIVE = "SELECT workspace FROM active_workspaces WHERE root = ?"
+DELETE_LAYOUT_FILES = "DELETE FROM layout_files WHERE layout_id IN (SELECT id FROM layouts WHERE workspace = ?)"
+DELETE_LAYOUT_DIRS = "DELETE FROM layout_dirs WHERE layout_id IN (SELECT id FROM layouts WHERE workspace = ?)"
+DELETE_LAYOUTS = "DELETE FROM layouts WHERE workspace = ?"
+DELETE_ACTIVE = "DELETE FROM active_workspaces WHERE workspace = ?"
+# Layout of what is on disk now, kept per root and refreshed folder by folder
+LIVE_LAYOUT = ''
+# Where versions before the per-user data directory kept the database
+LEGACY_DB_NAME = 'workspaces.db'
+
+SWITCH_SECONDS = REGISTRY.histogram('workspace_switch_seconds', 'Wall time per workspace switch')
+FOLDERS_RESCANNED = REGISTRY.counter('workspace_folders_rescanned_total', 'Folders re-listed to refresh the live layout')
+
+def _default_db_path() -> Path:
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_DATA_HOME') or Path.home() / '.local' / 'share'
+    return Path(base) / 'desktop_organizer' / 'workspaces.db'
+
+def _migrate_legacy_db(target: Path) -> None:
+    """Move the database older versions kept in the working directory to ``target``"""
+    legacy = Path(LEGACY_DB_NAME).resolve()
+    if target.exists() or not legacy.is_file() or legacy == target.resolve():
+        return
+    # WAL sidecars first: the main file arriving last marks the move as done
+    for suffix in ('-wal', '-shm', ''):
+        src = legacy.with_name(legacy.name + suffix)
+        if src.exists():
+            shutil.move(str(src), str(target.with_name(target.name + suffix)))
+    logging.getLogger(__name__).warning(f"Moved workspaces database from {legacy} to {target}")
 
 class WorkspaceManager:
-    def __init__(self, db_path: str = "workspaces.db"):
-        self.db_path = db_path
+    """Workspace store backed by one long-lived SQLite connection.
+
+    The connection runs in WAL mode so readers don't block the writer, is
+    shared between threads under a lock, and reuses sqlite3's statement
+    cache for the fixed queries above. ``get_workspace`` reads through an
+    in-memory cache that every write invalidates. Workspaces defined in
+    ``workspace_settings.json`` are served when the database has no entry
+    of that name, and follow config reloads.
+
+    Workspaces can also carry a saved layout per root. Switching diffs that
+    layout against a live index of the root, which is refreshed by
+    re-listing only the folders whose mtime moved, and applies the
+    difference as one batch of moves, so the work done on disk grows with
+    the number of misplaced files rather than with the size of the desktop.
+    """
+
+    def __init__(self, db_path: str = None, config: ConfigService = None):
+        self.db_path = Path(db_path) if db_path else _default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if db_path is None:
+            _migrate_legacy_db(self.db_path)
+        self.config = config or ConfigService.shared()
+        self._lock = threading.RLock()
+        self._cache: Dict[str, Dict] = {}
+        self._conn = self._connect()
         self._init_db()
-        
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=64)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS workspaces (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE,
-                    config TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
+        with self._lock, self._conn:
+            self._conn.execute(CREATE_WORKSPACES)
+            self._conn.execute(CREATE_LAYOUTS)
+            self._conn.execute(CREATE_LAYOUT_FILES)
+            self._conn.execute(CREATE_CATEGORY_INDEX)
+            self._conn.execute(CREATE_LAYOUT_DIRS)
+            self._conn.execute(CREATE_ACTIVE)
+
     def create_workspace(self, name: str, config: Dict) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO workspaces (name, config) VALUES (?, ?)",
-                (name, json.dumps(config))
-            )
-            
+        with self._lock, self._conn:
+            self._conn.execute(INSERT_WORKSPACE, (name, json.dumps(config)))
+            self._cache.pop(name, None)
+
     def get_workspace(self, name: str) -> Dict:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT config FROM workspaces WHERE name = ?",
-                (name,)
-            )
-            result = cursor.fetchone()
-            return json.loads(result[0]) if result else None
-            
+        with self._lock:
+            if name not in self._cache:
+                row = self._conn.execute(SELECT_CONFIG, (name,)).fetchone()
+                self._cache[name] = json.loads(row['config']) if row else None
+            workspace = self._cache[name]
+            if workspace is None:
+                workspace = self.config.snapshot.workspaces.get(name)
+            # Hand out copies so callers can't mutate the cached entry
+            return copy.deepcopy(workspace)
+
     def list_workspaces(self) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT name, created_at FROM workspaces")
-            return [dict(row) for row in cursor.fetchall()]
-            
+        with self._lock:
+            cursor = self._conn.execute(SELECT_ALL)
+            workspaces = [dict(row) for row in cursor.fetchall()]
+        stored = {workspace['name'] for workspace in workspaces}
+        workspaces.extend(
+            {'name': name, 'created_at': None}
+            for name in self.config.snapshot.workspaces if name not in stored
+        )
+        return workspaces
+
     def delete_workspace(self, name: str) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM workspaces WHERE name = ?", (name,))
\ No newline at end of file
+        """Remove a workspace's settings and every layout saved under it"""
+        if name == LIVE_LAYOUT:
+            raise ValueError("Workspace name must not be empty")
+        with self._lock, self._conn:
+            self._conn.execute(DELETE_WORKSPACE, (name,))
+            self._conn.execute(DELETE_LAYOUT_FILES, (name,))
+            self._conn.execute(DELETE_LAYOUT_DIRS, (name,))
+            self._conn.execute(DELETE_LAYOUTS, (name,))
+            self._conn.execute(DELETE_ACTIVE, (name,))
+            self._cache.pop(name, None)
+
+    def active_workspace(self, root: Path) -> Optional[str]:
+        """The workspace whose layout was last saved or switched to in ``root``"""
+        with self._lock:
+            row = self._conn.execute(SELECT_ACTIVE, (str(Path(root).resolve()),)).fetchone()
+        return row['workspace'] if row else None
+
+    def save_layout(self, name: str, root: Path) -> int:
+        """Record where every file in ``root`` is now as the layout of ``name``; returns the file count"""
+        if name == LIVE_LAYOUT:
+            raise ValueError("Workspace name must not be empty")
+        root = Path(root).resolve()
+        with self._lock:
+            live = self.refresh(root)
+            with self._conn:
+                layout = self._layout_id(name, root, create=True)
+                self._conn.execute(DELETE_FILES, (layout,))
+                self._conn.execute(COPY_FILES, (layout, live))
+                self._conn.execute(TOUCH_LAYOUT, (layout,))
+                self._conn.execute(SET_ACTIVE, (str(root), name))
+            return self._conn.execute(COUNT_FILES, (layout,)).fetchone()[0]
+
+    def switch(self, name: str, root: Path, executor: MoveExecutor, journal: ActiveRun = None) -> MoveReport:
+        """Move the files of ``root`` that are not where the layout of ``name`` has them
+
+        Files are matched by name, size and mtime, then by name alone. Files
+        the layout doesn't know stay put, and layout entries whose file is
+        gone are ignored.
+        """
+        root = Path(root).resolve()
+        with SWITCH_SECONDS.time(), self._lock:
+            layout = self._layout_id(name, root)
+            if layout is None:
+                raise ValueError(f"Workspace {name!r} has no saved layout for {root}")
+            live = self.refresh(root)
+            wanted = self._conn.execute(DIFF_LAYOUTS, (layout, live)).fetchall()
+            misplaced = self._conn.execute(DIFF_LAYOUTS, (live, layout)).fetchall()
+            moves = self._match(wanted, misplaced)
+
+            report = MoveReport()
+            for target, current in moves:
+                report.results.append(MoveResult(
+                    src=root / current['path'], category=target['category'], dest=root / target['path']
+                ))
+            created = False
+            for category in {target['category'] for target, _ in moves}:
+                if category and not (root / category).is_dir():
+                    (root / category).mkdir()
+                    created = True
+            with ThreadPoolExecutor(max_workers=executor.max_workers) as pool:
+                executor.move_all(report.results, pool, journal)
+            self._record_moves(live, root, moves, report.results, created)
+            with self._conn:
+                self._conn.execute(SET_ACTIVE, (str(root), name))
+            return report
+
+    @staticmethod
+    def _match(wanted: List[sqlite3.Row], misplaced: List[sqlite3.Row]) -> List[Tuple[sqlite3.Row, sqlite3.Row]]:
+        """Pair layout entries with the files now elsewhere that belong there"""
+        exact: Dict[Tuple, List[sqlite3.Row]] = {}
+        by_name: Dict[str, List[sqlite3.Row]] = {}
+        for row in misplaced:
+            name = os.path.basename(row['path'])
+            exact.setdefault((name, row['size'], row['mtime']), []).append(row)
+            by_name.setdefault(name, []).append(row)
+
+        taken = set()
+        moves = []
+        unmatched = []
+        for row in wanted:
+            name = os.path.basename(row['path'])
+            candidates = [c for c in exact.get((name, row['size'], row['mtime']), ()) if c['path'] not in taken]
+            if candidates:
+                taken.add(candidates[0]['path'])
+                moves.append((row, candidates[0]))
+            else:
+                unmatched.append(row)
+        # Files edited since the layout was saved still go back where they were
+        for row in unmatched:
+            name = os.path.basename(row['path'])
+            candidates = [c for c in by_name.get(name, ()) if c['path'] not in taken]
+            if candidates:
+                taken.add(candidates[0]['path'])
+                moves.append((row, candidates[0]))
+        return moves
+
+    def _record_moves(self, live: int, root: Path, moves: List[Tuple], results: List[MoveResult],
+                      created: bool) -> None:
+        touched = {''} if created else set()
+        with self._conn:
+            for (target, current), result in zip(moves, results):
+                if not result.ok:
+                    continue
+                self._conn.execute(DELETE_FILE, (live, current['path']))
+                self._conn.execute(INSERT_FILE, (live, target['path'], target['category'],
+                                                 current['size'], current['mtime']))
+                touched.update((current['category'], target['category']))
+            # Our own moves bumped these folders; re-stamp them so the next refresh skips them
+            for category in touched:
+                try:
+                    mtime = (root / category if category else root).stat().st_mtime_ns
+                except OSError:
+                    continue
+                self._conn.execute(UPSERT_DIR, (live, category, mtime))
+
+    def refresh(self, root: Path) -> int:
+        """Bring the live layout of ``root`` up to date and return its id
+
+        Only folders whose mtime changed since the last refresh are listed
+        again; on an untouched desktop this costs one stat per folder.
+        """
+        root = Path(root).resolve()
+        with self._lock, self._conn:
+            live = self._layout_id(LIVE_LAYOUT, root, create=True)
+            stamps = dict(self._conn.execute(SELECT_DIRS, (live,)).fetchall())
+            if stamps.get('') != root.stat().st_mtime_ns:
+                folders = self._rescan(live, root, '')
+                for category in set(stamps) - set(folders) - {''}:
+                    self._drop_folder(live, category)
+            else:
+                folders = [category for category in stamps if category]
+            for category in folders:
+                try:
+                    mtime = (root / category).stat().st_mtime_ns
+                except OSError:
+                    self._drop_folder(live, category)
+                    continue
+                if stamps.get(category) != mtime:
+                    self._rescan(live, root, category)
+            return live
+
+    def _rescan(self, layout: int, root: Path, category: str) -> List[str]:
+        """Replace the rows of one folder with a fresh listing; returns subfolders of the root"""
+        folder = root / category if category else root
+        # Stamp before listing, so a change made during the scan shows up next time
+        mtime = folder.stat().st_mtime_ns
+        rows = []
+        folders = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    path = f"{category}/{entry.name}" if category else entry.name
+                    rows.append((layout, path, category, stat.st_size, stat.st_mtime_ns))
+                elif not category and entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.name)
+        self._conn.execute(DELETE_CATEGORY, (layout, category))
+        self._conn.executemany(INSERT_FILE, rows)
+        self._conn.execute(UPSERT_DIR, (layout, category, mtime))
+        FOLDERS_RESCANNED.inc()
+        return folders
+
+    def _drop_folder(self, layout: int, category: str) -> None:
+        self._conn.execute(DELETE_CATEGORY, (layout, category))
+        self._conn.execute(DELETE_DIR, (layout, category))
+
+    def _layout_id(self, workspace: str, root: Path, create: bool = False) -> Optional[int]:
+        row = self._conn.execute(SELECT_LAYOUT, (workspace, str(root))).fetchone()
+        if row:
+            return row['id']
+        if not create:
+            return None
+        return self._conn.execute(INSERT_LAYOUT, (workspace, str(root))).lastrowid
+
+    def close(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._conn.close()
+
+    def __enter__(self) -> 'WorkspaceManager':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
\ No newline at end of file
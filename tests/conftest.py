@@ -0,0 +1,45 @@
+import time
+from pathlib import Path
+from typing import Dict
+import pytest
+from modules.core_organizer import DesktopOrganizer
+
+@pytest.fixture
+def desktop(tmp_path: Path) -> Path:
+    directory = tmp_path / 'Desktop'
+    directory.mkdir()
+    return directory
+
+@pytest.fixture
+def organizer() -> DesktopOrganizer:
+    organizer = DesktopOrganizer()
+    yield organizer
+    organizer.notifier.close(flush=False)
+
+@pytest.fixture
+def make_files():
+    """Write ``{relative path: content}`` under a directory"""
+    def make(directory: Path, files: Dict[str, str]) -> None:
+        for name, content in files.items():
+            path = directory / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+    return make
+
+def tree(directory: Path) -> Dict[str, str]:
+    """Every visible file under ``directory`` mapped to its content"""
+    return {
+        str(path.relative_to(directory)): path.read_text()
+        for path in sorted(directory.rglob('*'))
+        if path.is_file() and not any(part.startswith('.') for part in path.relative_to(directory).parts)
+    }
+
+
+def wait_for(predicate, timeout: float = 2.0) -> bool:
+    """Poll ``predicate`` until it holds or ``timeout`` seconds pass"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
\ No newline at end of file
@@ -0,0 +1,41 @@
+import random
+import pytest
+from benchmarks.bench_classifier import classifier_names, legacy_classify
+from benchmarks.synthetic import make_config
+from modules.classifier import CategoryClassifier, PatternMatcher
+
+CONFIG = {
+    'categories': {
+        'Documents': {'extensions': ['.pdf', '.txt']},
+        'Media': {'extensions': ['.mp4', '.txt']},
+        'Executables': {'extensions': ['.exe']},
+    },
+    'executable_rules': {
+        # Earlier groups win even when a later pattern matches first or is longer
+        'Games': ['steam', 'craft'],
+        'Tools': ['minecraft', 'ste', 'setup'],
+        'Empty': [],
+    },
+}
+
+@pytest.mark.parametrize('name', [
+    'report.pdf', 'notes.TXT', 'clip.mp4', 'archive.tar.gz', 'README', 'file.', '.exe', '.hidden.txt',
+    'Minecraft.exe', 'steamsetup.EXE', 'setup_steam.exe', 'stew.exe', 'installer.exe', 'craft.exe.pdf',
+])
+def test_matches_linear_first_match(name):
+    assert CategoryClassifier(CONFIG).classify_name(name) == legacy_classify(CONFIG, name)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_linear_first_match_on_generated_configs(seed):
+    rng = random.Random(seed)
+    config = make_config(rng, 40, 400)
+    classifier = CategoryClassifier(config)
+    for name in classifier_names(rng, config, 2000):
+        assert classifier.classify_name(name) == legacy_classify(config, name), name
+
+def test_pattern_matcher_reports_lowest_priority():
+    matcher = PatternMatcher([('he', 2), ('she', 1), ('hers', 0), ('his', 3)])
+    assert matcher.best('ushers') == 0
+    assert matcher.best('ushe') == 1
+    assert matcher.best('this') == 3
+    assert matcher.best('nothing') == float('inf')
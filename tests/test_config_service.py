@@ -0,0 +1,52 @@
+import json
+import shutil
+from pathlib import Path
+import pytest
+from modules.config_service import CONFIG_DIR, ConfigService
+from modules.core_organizer import DesktopOrganizer
+from modules.manifest import MANIFEST_NAME
+
+@pytest.fixture
+def service(tmp_path: Path) -> ConfigService:
+    for name in ('categories.json', 'rules.json', 'workspace_settings.json'):
+        shutil.copy(CONFIG_DIR / name, tmp_path / name)
+    return ConfigService(tmp_path / 'categories.json', tmp_path / 'rules.json',
+                         tmp_path / 'workspace_settings.json')
+
+def _edit(path: Path, change) -> None:
+    data = json.loads(path.read_text())
+    change(data)
+    path.write_text(json.dumps(data))
+
+def test_tuning_changes_keep_the_fingerprint(service):
+    before = service.snapshot
+    _edit(service.categories_path, lambda c: c.update(move_workers=7, monitor={'reconcile_seconds': 5}))
+    assert service.reload()
+    assert service.snapshot.version == before.version + 1
+    assert service.snapshot.fingerprint == before.fingerprint
+
+def test_category_changes_change_the_fingerprint(service):
+    before = service.snapshot.fingerprint
+    _edit(service.categories_path, lambda c: c['categories']['Documents']['extensions'].append('.xyz'))
+    assert service.reload()
+    assert service.snapshot.fingerprint != before
+    assert service.snapshot.classifier.classify_name('a.xyz') == 'Documents'
+
+def test_invalid_reload_keeps_previous_snapshot(service):
+    before = service.snapshot
+    service.rules_path.write_text('[{"name": "x", "action": {"type": "bogus"}}]')
+    assert not service.reload()
+    assert service.snapshot is before
+
+def test_manifest_survives_tuning_reload(service, tmp_path, make_files):
+    desktop = tmp_path / 'Desktop'
+    desktop.mkdir()
+    make_files(desktop, {'a.txt': 'a'})
+    organizer = DesktopOrganizer(config_service=service)
+    organizer.organize(desktop)
+    _edit(service.categories_path, lambda c: c.update(move_workers=2))
+    service.reload()
+    organizer.organize(desktop)
+    manifest = json.loads((desktop / MANIFEST_NAME).read_text())
+    assert manifest['config'] == service.snapshot.fingerprint
+    assert 'Documents/a.txt' in manifest['entries']
@@ -0,0 +1,48 @@
+import os
+from modules import content_sniffer
+from modules.content_sniffer import ContentSniffer, detect
+
+def test_detects_by_magic_bytes():
+    assert detect(b'%PDF-1.7 ...') == '.pdf'
+    assert detect(b'RIFF\0\0\0\0WEBPVP8 ') == '.webp'
+    assert detect(b'RIFF\0\0\0\0WAVEfmt ') == '.wav'
+    assert detect(b'PK\x03\x04' + b'\0' * 26 + b'word/document.xml') == '.docx'
+    assert detect(b'PK\x03\x04' + b'\0' * 26 + b'notes.txt') == '.zip'
+    assert detect(b'plain text') == ''
+
+def sniff(sniffer, directory, names):
+    return sniffer.sniff_many(directory, [(directory / name, os.stat(directory / name)) for name in names])
+
+def test_results_are_cached_until_the_file_changes(tmp_path, monkeypatch):
+    (tmp_path / 'scan').write_bytes(b'%PDF-1.4')
+    sniffer = ContentSniffer(max_workers=1)
+    assert sniff(sniffer, tmp_path, ['scan']) == {tmp_path / 'scan': '.pdf'}
+
+    reads = []
+    read = sniffer._read
+    monkeypatch.setattr(sniffer, '_read', lambda file: reads.append(file) or read(file))
+    sniff(sniffer, tmp_path, ['scan'])
+    assert reads == []
+
+    (tmp_path / 'scan').write_bytes(b'\x89PNG\r\n\x1a\n....')
+    assert sniff(sniffer, tmp_path, ['scan']) == {tmp_path / 'scan': '.png'}
+    assert reads == [tmp_path / 'scan']
+
+def test_read_errors_are_not_cached(tmp_path, monkeypatch):
+    (tmp_path / 'locked').write_bytes(b'%PDF-1.4')
+    sniffer = ContentSniffer(max_workers=1)
+
+    def locked(*args, **kwargs):
+        raise PermissionError('in use')
+
+    monkeypatch.setattr(content_sniffer, 'open', locked, raising=False)
+    assert sniff(sniffer, tmp_path, ['locked']) == {tmp_path / 'locked': ''}
+    monkeypatch.undo()
+    assert sniff(sniffer, tmp_path, ['locked']) == {tmp_path / 'locked': '.pdf'}
+
+def test_cache_survives_a_save(tmp_path):
+    (tmp_path / 'scan').write_bytes(b'%PDF-1.4')
+    sniffer = ContentSniffer(max_workers=1)
+    sniff(sniffer, tmp_path, ['scan'])
+    sniffer.save()
+    assert content_sniffer.SniffCache(tmp_path).get(content_sniffer.SniffCache.key(os.stat(tmp_path / 'scan'))) == '.pdf'
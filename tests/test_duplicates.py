@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+from modules.duplicates import DuplicateFinder, HashCache
+from modules.manifest import DirectoryManifest
+
+ZIP_RULE = [{'name': 'Archives', 'conditions': {'extensions': ['.zip']}, 'action': {'type': 'move', 'destination': 'Archives'}}]
+NOTE_RULE = [{'name': 'Notes', 'conditions': {'name_pattern': 'note'}, 'action': {'type': 'notify', 'message': '{file}'}}]
+
+def manifest_entries(organizer, directory: Path) -> dict:
+    manifest = DirectoryManifest(directory, organizer.snapshot.fingerprint)
+    assert manifest.load()
+    return manifest.entries
+
+def stats(directory: Path, names) -> list:
+    return [(directory / name, os.stat(directory / name)) for name in names]
+
+def test_unique_file_keeps_going_through_later_rules(organizer, desktop, make_files):
+    organizer.organize(desktop)
+    make_files(desktop, {'tool.zip': 'only one'})
+    organizer.organize(desktop, ZIP_RULE)
+    assert (desktop / 'Uncategorized' / 'Archives' / 'tool.zip').exists()
+
+def test_unique_file_is_recorded(organizer, desktop, make_files):
+    organizer.organize(desktop)
+    make_files(desktop, {'tool.zip': 'only one'})
+    organizer.organize(desktop, NOTE_RULE)
+    assert (desktop / 'Uncategorized' / 'tool.zip').exists()
+    assert 'Uncategorized/tool.zip' in manifest_entries(organizer, desktop)
+
+def test_copy_is_moved_aside_and_forgotten(organizer, desktop, make_files):
+    organizer.organize(desktop)
+    make_files(desktop, {'setup.zip': 'same'})
+    organizer.organize(desktop, NOTE_RULE)
+    make_files(desktop, {'setup (1).zip': 'same'})
+    organizer.organize(desktop, NOTE_RULE)
+
+    container = desktop / 'Uncategorized'
+    assert (container / 'setup.zip').exists()
+    assert (container / 'Duplicates' / 'setup (1).zip').exists()
+    entries = manifest_entries(organizer, desktop)
+    assert 'Uncategorized/setup.zip' in entries
+    assert 'Uncategorized/setup (1).zip' not in entries
+
+def test_copy_follows_a_later_rule_move(organizer, desktop, make_files):
+    organizer.organize(desktop)
+    make_files(desktop, {'setup.zip': 'same', 'other.zip': 'same'})
+    organizer.organize(desktop, ZIP_RULE)
+    archives = desktop / 'Uncategorized' / 'Archives'
+    assert len(list(archives.glob('*.zip'))) == 1
+    assert len(list((archives / 'Duplicates').glob('*.zip'))) == 1
+
+def test_staged_hashing(tmp_path):
+    chunk = 4
+    files = {
+        'a': b'head-middle-tail', 'b': b'head-middle-tail',
+        # Same size, differs at the start: settled by the partial hash
+        'c': b'HEAD-middle-tail',
+        # Same size, same ends: only the full hash tells it apart
+        'd': b'head-MIDDLE-tail',
+        # Unique size: never hashed
+        'e': b'short',
+        'empty': b'', 'empty2': b'',
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    cache = HashCache()
+    finder = DuplicateFinder(max_workers=2, cache=cache, partial_chunk=chunk)
+    items = stats(tmp_path, files)
+    groups = finder.find(items)
+
+    assert [sorted(f.name for f in group.files) for group in groups] == [['a', 'b']]
+    hashed = {path.name: cache._entries.get(HashCache.key(stat)) for path, stat in items}
+    assert all(hashed[name][DuplicateFinder.PARTIAL] for name in 'abcd')
+    assert all(hashed[name][DuplicateFinder.FULL] for name in 'abd')
+    assert hashed['c'][DuplicateFinder.FULL] is None
+    assert hashed['e'] is None and hashed['empty'] is None
+
+def test_hard_links_are_not_copies(tmp_path):
+    (tmp_path / 'a').write_bytes(b'data')
+    os.link(tmp_path / 'a', tmp_path / 'b')
+    assert DuplicateFinder(cache=HashCache()).find(stats(tmp_path, ['a', 'b'])) == []
+
+def test_cached_digests_survive_a_reload(tmp_path):
+    for name in 'ab':
+        (tmp_path / name).write_bytes(b'x' * 100)
+    path = tmp_path / 'cache' / 'hashes.json'
+    cache = HashCache(path)
+    DuplicateFinder(cache=cache, partial_chunk=8).find(stats(tmp_path, 'ab'))
+    cache.save()
+    reloaded = HashCache(path)
+    key = HashCache.key(os.stat(tmp_path / 'a'))
+    assert reloaded.get(key, DuplicateFinder.FULL) == cache.get(key, DuplicateFinder.FULL)
@@ -0,0 +1,71 @@
+import time
+import threading
+from pathlib import Path
+from modules.event_queue import CoalescingQueue
+from .conftest import wait_for
+
+class Recorder:
+    def __init__(self, block: bool = False):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, batch):
+        self.batches.append(batch)
+        self.started.set()
+        self.release.wait(5)
+
+def test_repeated_paths_merge_into_one_batch():
+    recorder = Recorder()
+    queue = CoalescingQueue(recorder, quiet_window=0.05, max_delay=5.0)
+    for name in ('a', 'b', 'a', 'a', 'c'):
+        assert queue.add(Path(name))
+    assert wait_for(lambda: recorder.batches)
+    queue.stop()
+    assert recorder.batches == [[Path('a'), Path('b'), Path('c')]]
+    assert queue.stats() == {'received': 5, 'merged': 2, 'batches': 1, 'dropped': 0, 'pending': 0}
+
+def test_max_delay_releases_a_steady_stream():
+    recorder = Recorder()
+    queue = CoalescingQueue(recorder, quiet_window=1.0, max_delay=0.1)
+    start = time.monotonic()
+    # Events keep arriving inside the quiet window, so only max_delay can release them
+    while not recorder.batches and time.monotonic() - start < 2:
+        queue.add(Path('hot'))
+        time.sleep(0.01)
+    assert recorder.batches == [[Path('hot')]]
+    assert time.monotonic() - start < 0.5
+    queue.stop(flush=False)
+
+def test_stop_flushes_pending_paths():
+    recorder = Recorder()
+    queue = CoalescingQueue(recorder, quiet_window=10.0, max_delay=10.0)
+    queue.add(Path('a'))
+    queue.stop()
+    assert recorder.batches == [[Path('a')]]
+
+def test_full_queue_releases_drops_and_reports_overflow():
+    recorder = Recorder(block=True)
+    overflows = []
+    queue = CoalescingQueue(recorder, quiet_window=10.0, max_delay=10.0,
+                            max_pending=2, on_overflow=lambda: overflows.append(len(recorder.batches)))
+    queue.add(Path('a'))
+    queue.add(Path('b'))
+    # A full queue doesn't wait for the quiet window
+    assert recorder.started.wait(2)
+
+    assert queue.add(Path('c'))
+    assert queue.add(Path('d'))
+    assert queue.add(Path('c'))
+    assert not queue.add(Path('e'))
+    assert queue.depth == 2
+
+    recorder.release.set()
+    assert wait_for(lambda: len(recorder.batches) == 2)
+    queue.stop()
+    assert recorder.batches == [[Path('a'), Path('b')], [Path('c'), Path('d')]]
+    # The owner hears about the drop once, right after the batch that was running
+    assert overflows == [1]
+    assert queue.stats()['dropped'] == 1
@@ -0,0 +1,142 @@
+import time
+import threading
+from watchdog.events import FileCreatedEvent, FileModifiedEvent
+from modules.file_handler import RESCANS, FileEventHandler, FileMonitor, ThrottleTable
+from modules.move_executor import MoveReport
+from .conftest import wait_for
+
+def test_repeated_writes_settle_into_one_batch(organizer, desktop, monkeypatch):
+    organizer.organize(desktop)
+    calls = []
+    process_batch = organizer.process_batch
+
+    def record(directory, files, rules=None):
+        calls.append((time.monotonic(), [f.read_text() if f.exists() else None for f in files]))
+        return process_batch(directory, files, rules)
+
+    monkeypatch.setattr(organizer, 'process_batch', record)
+    handler = FileEventHandler(organizer, path=desktop)
+    file = desktop / 'draft.txt'
+    try:
+        handler.on_created(FileCreatedEvent(str(file)))
+        # Written over about twice the quiet window
+        for i in range(10):
+            with open(file, 'a') as f:
+                f.write(f"{i}\n")
+            handler.on_modified(FileModifiedEvent(str(file)))
+            time.sleep(0.1)
+        finished = time.monotonic()
+        assert wait_for(lambda: calls, timeout=3)
+    finally:
+        handler.close()
+
+    assert len(calls) == 1
+    when, contents = calls[0]
+    assert when >= finished
+    assert contents == [''.join(f"{i}\n" for i in range(10))]
+    assert handler.merged_events == 10
+    assert (desktop / 'Documents' / 'draft.txt').exists()
+
+def test_recently_handled_path_is_throttled(organizer, desktop, monkeypatch):
+    batches = []
+
+    def record(directory, files, rules=None):
+        batches.append(files)
+        return MoveReport()
+
+    monkeypatch.setattr(organizer, 'process_batch', record)
+    handler = FileEventHandler(organizer, path=desktop)
+    try:
+        path = desktop / 'a.txt'
+        handler._handle_batch([path])
+        handler._handle_batch([path, desktop / 'b.txt'])
+    finally:
+        handler.close()
+    assert batches == [[path], [desktop / 'b.txt']]
+    assert handler.throttle_stats['hits'] == 1
+
+def test_throttle_blocks_within_the_window_and_expires_after():
+    table = ThrottleTable(window=5.0)
+    assert table.allow('a', now=0.0)
+    assert not table.allow('a', now=4.9)
+    assert table.allow('b', now=4.9)
+    # 'a' is dropped on the next call after its window, 'b' is still live
+    assert table.allow('a', now=5.0)
+    assert not table.allow('b', now=6.0)
+    assert table.stats() == {'size': 2, 'hits': 2, 'misses': 3, 'evictions': 0, 'expirations': 1}
+
+def test_throttle_evicts_least_recent_when_full():
+    table = ThrottleTable(window=100.0, max_entries=2)
+    table.allow('a', now=0.0)
+    table.allow('b', now=1.0)
+    table.allow('c', now=2.0)
+    assert len(table) == 2
+    assert table.stats()['evictions'] == 1
+    # 'a' was evicted, so it is allowed again; 'c' is still throttled
+    assert table.allow('a', now=3.0)
+    assert not table.allow('c', now=3.0)
+
+def test_slow_root_does_not_hold_up_another(organizer, tmp_path, monkeypatch):
+    slow, fast = tmp_path / 'slow', tmp_path / 'fast'
+    slow.mkdir()
+    fast.mkdir()
+    release = threading.Event()
+    done = []
+    process_batch = organizer.process_batch
+
+    def process(directory, files, rules=None):
+        if directory == slow:
+            release.wait(5)
+        done.append(directory)
+        return process_batch(directory, files, rules)
+
+    monkeypatch.setattr(organizer, 'process_batch', process)
+    monitor = FileMonitor(organizer, [slow])
+    monitor.start()
+    try:
+        assert monitor.add_path(fast)
+        assert not monitor.add_path(fast)
+        (slow / 'a.txt').write_text('a')
+        assert wait_for(lambda: monitor.handler_for(slow).queue.stats()['batches'])
+        (fast / 'b.txt').write_text('b')
+        assert wait_for(lambda: fast in done, timeout=5)
+        assert slow not in done
+        release.set()
+        assert wait_for(lambda: slow in done, timeout=5)
+        assert monitor.remove_path(fast)
+        assert monitor.paths == [slow]
+    finally:
+        release.set()
+        monitor.stop()
+    assert (slow / 'Documents' / 'a.txt').exists() and (fast / 'Documents' / 'b.txt').exists()
+
+def test_full_queue_drops_events_and_rescans(organizer, desktop, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    process_batch = organizer.process_batch
+
+    def process(directory, files, rules=None):
+        started.set()
+        release.wait(5)
+        return process_batch(directory, files, rules)
+
+    monkeypatch.setattr(organizer, 'process_batch', process)
+    handler = FileEventHandler(organizer, path=desktop)
+    handler.queue.max_pending = 2
+    rescans = RESCANS.value()
+    names = ['a.txt', 'b.txt', 'c.txt', 'd.txt', 'e.txt']
+    try:
+        for name in names[:2]:
+            (desktop / name).write_text(name)
+            handler.on_created(FileCreatedEvent(str(desktop / name)))
+        # A full queue hands its batch over without waiting for the quiet window
+        assert started.wait(2)
+        for name in names[2:]:
+            (desktop / name).write_text(name)
+            handler.on_created(FileCreatedEvent(str(desktop / name)))
+        assert handler.queue.stats()['dropped'] == 1
+        release.set()
+        assert wait_for(lambda: RESCANS.value() == rescans + 1)
+    finally:
+        release.set()
+        handler.close()
+    assert sorted(path.name for path in (desktop / 'Documents').iterdir()) == names
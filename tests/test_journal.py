@@ -0,0 +1,156 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+from modules.journal import JOURNAL_NAME, MoveJournal, UNDO_PREFIX
+from .conftest import tree
+
+def test_run_records_moves_with_stat(desktop):
+    src, dest = desktop / 'a.txt', desktop / 'b.txt'
+    src.write_text('hello')
+    stat = src.stat()
+    journal = MoveJournal(desktop)
+    run = journal.begin('organize')
+    seqs = run.planned([(src, dest, stat)])
+    os.rename(src, dest)
+    run.done(seqs)
+    run.end()
+
+    last = journal.last_run(undoable=True)
+    assert last.id == run.id and last.kind == 'organize' and last.finished
+    entry, = last.completed
+    assert (entry.src, entry.dest) == (src, dest)
+    assert (entry.size, entry.mtime) == (stat.st_size, stat.st_mtime_ns)
+
+def test_run_without_moves_leaves_no_record(desktop):
+    journal = MoveJournal(desktop)
+    run = journal.begin('organize')
+    run.done(run.planned([]))
+    run.end()
+    assert run.id is None
+    assert not (desktop / JOURNAL_NAME).exists()
+
+def test_undoable_skips_runs_that_moved_nothing(desktop):
+    journal = MoveJournal(desktop)
+    run = journal.begin('organize')
+    run.done(run.planned([(desktop / 'a', desktop / 'b')]))
+    run.end()
+    # Empty runs as older versions wrote them for every no-op organize
+    with open(desktop / JOURNAL_NAME, 'a') as f:
+        f.write(f"B\t{run.id + 1}\t0\torganize\nE\t{run.id + 1}\n")
+    assert journal.last_run().id == run.id + 1
+    assert journal.last_run(undoable=True).id == run.id
+
+def test_undo_runs_are_not_undoable(desktop):
+    journal = MoveJournal(desktop)
+    run = journal.begin('organize')
+    run.done(run.planned([(desktop / 'a', desktop / 'b')]))
+    run.end()
+    undo = journal.begin(f"{UNDO_PREFIX}{run.id}")
+    undo.done(undo.planned([(desktop / 'b', desktop / 'a')]))
+    undo.end()
+    assert journal.last_run(undoable=True) is None
+
+def test_resume_finishes_crashed_run(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a', 'b.txt': 'b'})
+    (desktop / 'Documents').mkdir()
+    # A separate instance stands in for a process that died mid-run
+    crashed = MoveJournal(desktop)
+    run = crashed.begin('organize')
+    seqs = run.planned([(desktop / 'a.txt', desktop / 'Documents/a.txt'),
+                        (desktop / 'b.txt', desktop / 'Documents/b.txt')])
+    os.rename(desktop / 'a.txt', desktop / 'Documents/a.txt')
+    run.done(seqs[:1])
+    crashed.close()
+
+    journal = organizer._journal(desktop)
+    organizer._resume(journal)
+    assert tree(desktop) == {'Documents/a.txt': 'a', 'Documents/b.txt': 'b'}
+    assert journal.last_run().finished
+
+def test_resume_leaves_runs_open_in_this_process_alone(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a'})
+    journal = organizer._journal(desktop)
+    run = journal.begin('batch')
+    run.planned([(desktop / 'a.txt', desktop / 'Documents/a.txt')])
+    organizer._resume(journal)
+    assert tree(desktop) == {'a.txt': 'a'}
+    assert not journal.last_run().finished
+    run.end()
+
+def test_undo_after_noop_organize(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a'})
+    organizer.organize(desktop)
+    make_files(desktop, {'b.pdf': 'b'})
+    organizer.organize(desktop)
+    organizer.organize(desktop)
+
+    report = organizer.undo(desktop)
+    assert report.summary() == {'moved': 1}
+    assert tree(desktop) == {'Documents/a.txt': 'a', 'b.pdf': 'b'}
+
+def test_undo_refuses_files_changed_since_the_move(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a'})
+    organizer.organize(desktop)
+    (desktop / 'Documents/a.txt').write_text('edited')
+
+    result, = organizer.undo(desktop).results
+    assert result.status == 'failed' and 'changed' in result.error
+    assert tree(desktop) == {'Documents/a.txt': 'edited'}
+
+def test_undo_restores_duplicates_moved_aside(organizer, desktop, make_files):
+    make_files(desktop, {'setup.exe': 'same', 'setup (copy).exe': 'same'})
+    organizer.organize(desktop, rules=[{
+        'name': 'dups', 'conditions': {'extensions': ['.exe']},
+        'action': {'type': 'duplicate', 'mode': 'move', 'destination': 'Duplicates'}
+    }])
+    assert len([p for p in tree(desktop) if '/Duplicates/' in p]) == 1
+
+    organizer.undo(desktop)
+    assert tree(desktop) == {'setup.exe': 'same', 'setup (copy).exe': 'same'}
+
+CHILD = """
+import sys, os
+sys.path.insert(0, {root!r})
+from pathlib import Path
+from modules.journal import MoveJournal
+desktop = Path({desktop!r})
+journal = MoveJournal(desktop)
+journal.lock.acquire()
+run = journal.begin('organize')
+run.planned([(desktop / 'b.txt', desktop / 'Documents/b.txt')])
+print(run.id, flush=True)
+sys.stdin.read()
+os._exit(1)
+"""
+
+def test_runs_are_exclusive_across_processes(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a', 'b.txt': 'b'})
+    (desktop / 'Documents').mkdir()
+    journal = organizer._journal(desktop)
+    with journal.lock:
+        run = journal.begin('organize')
+        run.planned([(desktop / 'a.txt', desktop / 'Documents/a.txt')])
+        run.end()
+
+    script = CHILD.format(root=str(Path(__file__).resolve().parent.parent), desktop=str(desktop))
+    child = subprocess.Popen([sys.executable, '-c', script], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        # The other process takes the next id, not one this process cached
+        assert int(child.stdout.readline()) == run.id + 1
+        assert not journal.lock.acquire(blocking=False)
+        # Its run is in progress, not crashed
+        assert not journal.last_run().finished
+    finally:
+        child.stdin.close()
+        child.wait(10)
+
+    # The child died holding the lock; the OS released it, so its run has crashed
+    with journal.lock:
+        organizer._resume(journal)
+        assert journal.last_run().finished
+        later = journal.begin('organize')
+        later.planned([(desktop / 'x', desktop / 'y')])
+        assert later.id == run.id + 2
+        later.end()
+    assert (desktop / 'Documents/b.txt').exists()
@@ -0,0 +1,68 @@
+import os
+from modules.manifest import DirectoryManifest
+from .conftest import tree
+
+def load(organizer, desktop) -> DirectoryManifest:
+    manifest = DirectoryManifest(desktop, organizer.snapshot.fingerprint)
+    assert manifest.load()
+    return manifest
+
+def watch_categorize(organizer, monkeypatch) -> list:
+    seen = []
+    categorize = organizer._categorize
+
+    def record(directory, files):
+        seen.extend(file.name for file, _ in files)
+        return categorize(directory, files)
+
+    monkeypatch.setattr(organizer, '_categorize', record)
+    return seen
+
+def test_unchanged_files_are_not_classified_again(organizer, desktop, make_files, monkeypatch):
+    make_files(desktop, {'a.txt': 'a', 'b.mp4': 'b'})
+    organizer.organize(desktop)
+    assert set(load(organizer, desktop).entries) == {'Documents/a.txt', 'Media/b.mp4'}
+
+    classified = watch_categorize(organizer, monkeypatch)
+    make_files(desktop, {'c.pdf': 'c'})
+    report = organizer.organize(desktop)
+    assert classified == ['c.pdf']
+    assert [r.src.name for r in report.moved] == ['c.pdf']
+    assert set(load(organizer, desktop).entries) == {'Documents/a.txt', 'Media/b.mp4', 'Documents/c.pdf'}
+
+def test_changed_files_in_containers_are_rechecked(organizer, desktop, make_files, monkeypatch):
+    make_files(desktop, {'a.txt': 'a', 'b.txt': 'b', 'c.txt': 'c'})
+    organizer.organize(desktop)
+    # Edited in place: still a document, so it is re-recorded but stays
+    (desktop / 'Documents/a.txt').write_text('edited')
+    os.utime(desktop / 'Documents/a.txt', ns=(0, 12345))
+    # Renamed to another type: moves to its new container
+    os.rename(desktop / 'Documents/b.txt', desktop / 'Documents/b.mp4')
+    os.unlink(desktop / 'Documents/c.txt')
+
+    classified = watch_categorize(organizer, monkeypatch)
+    organizer.organize(desktop)
+    assert sorted(classified) == ['a.txt', 'b.mp4']
+    assert tree(desktop) == {'Documents/a.txt': 'edited', 'Media/b.mp4': 'b'}
+    entries = load(organizer, desktop).entries
+    assert set(entries) == {'Documents/a.txt', 'Media/b.mp4'}
+    assert entries['Documents/a.txt']['mtime'] == 12345
+
+def test_config_change_makes_every_entry_stale(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a'})
+    organizer.organize(desktop)
+    stat = os.stat(desktop / 'Documents/a.txt')
+    assert load(organizer, desktop).is_current('Documents/a.txt', stat) == 'Documents'
+
+    other = DirectoryManifest(desktop, 'another fingerprint')
+    assert other.load() and other.stale
+    assert other.is_current('Documents/a.txt', stat) is None
+
+def test_corrupt_manifest_is_rebuilt(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a'})
+    organizer.organize(desktop)
+    (desktop / '.organizer_manifest.json').write_text('{not json')
+    assert not DirectoryManifest(desktop, organizer.snapshot.fingerprint).load()
+    organizer.organize(desktop)
+    assert tree(desktop) == {'Documents/a.txt': 'a'}
+    assert set(load(organizer, desktop).entries) == {'Documents/a.txt'}
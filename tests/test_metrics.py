@@ -0,0 +1,69 @@
+import json
+import urllib.request
+import pytest
+from modules.core_organizer import FILES_MOVED, STAGE_SECONDS
+from modules.metrics import MetricsRegistry
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_counters_and_gauges_by_label(registry):
+    counter = registry.counter('moves_total', 'Moves')
+    counter.inc(category='Documents')
+    counter.inc(2, category='Documents')
+    counter.inc(category='Media')
+    assert counter.value(category='Documents') == 3
+    assert counter.value(category='Other') == 0
+    gauge = registry.gauge('depth')
+    gauge.set(5, queue='a')
+    gauge.set(2, queue='a')
+    assert gauge.value(queue='a') == 2
+    # Registering a name again returns the same metric, never one of another kind
+    assert registry.counter('moves_total') is counter
+    with pytest.raises(ValueError):
+        registry.gauge('moves_total')
+
+def test_prometheus_rendering(registry):
+    registry.counter('moves_total', 'Moves').inc(category='Docs "A"')
+    histogram = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    text = registry.render_prometheus()
+    assert '# HELP moves_total Moves\n# TYPE moves_total counter\n' in text
+    assert 'moves_total{category="Docs \\"A\\""} 1' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'latency_seconds_sum 5.55' in text
+    assert 'latency_seconds_count 3' in text
+
+def test_json_export(registry, tmp_path):
+    with registry.timer('stage_seconds', stage='scan'):
+        pass
+    registry.counter('files_total').inc(4)
+    path = tmp_path / 'metrics.json'
+    registry.export_json(path)
+    metrics = json.loads(path.read_text())['metrics']
+    assert metrics['files_total'] == {'type': 'counter', 'help': '', 'values': {'': 4}}
+    assert metrics['stage_seconds']['values']['{stage="scan"}']['count'] == 1
+
+def test_http_endpoint(registry):
+    registry.counter('up').inc()
+    server = registry.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.status == 200
+            assert 'up 1' in response.read().decode()
+    finally:
+        registry.stop_serving()
+
+def test_organize_is_instrumented(organizer, desktop, make_files):
+    moved = FILES_MOVED.value(category='Documents')
+    runs = STAGE_SECONDS.snapshot().get('{stage="moves"}', {}).get('count', 0)
+    make_files(desktop, {'a.txt': 'a', 'b.pdf': 'b'})
+    organizer.organize(desktop)
+    assert FILES_MOVED.value(category='Documents') == moved + 2
+    assert STAGE_SECONDS.snapshot()['{stage="moves"}']['count'] == runs + 1
@@ -0,0 +1,59 @@
+import pytest
+from modules.journal import MoveJournal
+from modules.move_executor import MoveExecutor
+from .conftest import tree
+
+def moves(directory, names, category='Documents'):
+    return [(directory / name, directory / category, category, None) for name in names]
+
+@pytest.fixture
+def collided(desktop, make_files):
+    make_files(desktop, {'a.txt': 'new', 'b.txt': 'b', 'Documents/a.txt': 'old', 'Documents/a (1).txt': 'older'})
+    return desktop
+
+def test_rename_policy_picks_a_free_name(collided):
+    report = MoveExecutor(max_workers=4).execute(moves(collided, ['a.txt', 'b.txt']))
+    assert report.summary() == {'renamed': 1, 'moved': 1}
+    assert [r.dest.name for r in report.collisions] == ['a (2).txt']
+    assert tree(collided) == {'Documents/a.txt': 'old', 'Documents/a (1).txt': 'older',
+                              'Documents/a (2).txt': 'new', 'Documents/b.txt': 'b'}
+
+def test_skip_policy_leaves_the_file(collided):
+    report = MoveExecutor(collision_policy='skip').execute(moves(collided, ['a.txt', 'b.txt']))
+    assert report.summary() == {'skipped': 1, 'moved': 1}
+    assert tree(collided)['a.txt'] == 'new'
+    assert tree(collided)['Documents/a.txt'] == 'old'
+
+def test_overwrite_policy_replaces(collided):
+    report = MoveExecutor(collision_policy='overwrite').execute(moves(collided, ['a.txt']))
+    assert report.summary() == {'overwritten': 1}
+    assert tree(collided)['Documents/a.txt'] == 'new'
+    assert 'a.txt' not in tree(collided)
+
+def test_names_collide_within_one_batch(desktop, make_files):
+    make_files(desktop, {'x/a.txt': 'x', 'y/a.txt': 'y', 'z/a.txt': 'z'})
+    executor = MoveExecutor(max_workers=3)
+    report = executor.execute([(desktop / d / 'a.txt', desktop / 'Documents', 'Documents', None) for d in 'xyz'],
+                              chunk_size=2)
+    assert not report.failed
+    assert sorted(path for path in tree(desktop) if path.startswith('Documents/')) == [
+        'Documents/a (1).txt', 'Documents/a (2).txt', 'Documents/a.txt']
+
+def test_unavailable_destination_fails_its_files_only(desktop, make_files):
+    make_files(desktop, {'a.txt': 'a', 'b.mp4': 'b', 'Documents': 'a file, not a folder'})
+    report = MoveExecutor().execute(moves(desktop, ['a.txt']) + moves(desktop, ['b.mp4'], 'Media'))
+    assert [r.src.name for r in report.failed] == ['a.txt']
+    assert [r.src.name for r in report.moved] == ['b.mp4']
+
+def test_moves_are_journaled(desktop, make_files):
+    make_files(desktop, {'a.txt': 'a', 'b.txt': 'b'})
+    journal = MoveJournal(desktop)
+    run = journal.begin('organize')
+    MoveExecutor(max_workers=2).execute(moves(desktop, ['a.txt', 'b.txt']), journal=run)
+    run.end()
+    last = journal.last_run()
+    assert last.finished and len(last.completed) == 2
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        MoveExecutor(collision_policy='merge')
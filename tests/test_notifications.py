@@ -0,0 +1,101 @@
+import threading
+import time
+import pytest
+from modules.notifications import NotificationDispatcher, create_backend
+from .conftest import wait_for
+
+class RecordingBackend:
+    name = 'recording'
+
+    def __init__(self):
+        self.shown = []
+        self.times = []
+
+    def show(self, title, message):
+        self.shown.append((title, message))
+        self.times.append(time.monotonic())
+
+@pytest.fixture
+def backend():
+    return RecordingBackend()
+
+def test_burst_is_merged_into_one_summary_per_kind(backend):
+    dispatcher = NotificationDispatcher(backend, window=0.2)
+    try:
+        for i in range(50):
+            dispatcher.file_organized(f'/desk/f{i}.txt', ['Documents', 'Images'][i % 2])
+        dispatcher.error("Error", "disk full")
+        dispatcher.error("Error", "still full")
+        assert wait_for(lambda: len(backend.shown) == 2)
+    finally:
+        dispatcher.close()
+    assert backend.shown == [
+        ("File Organized", "50 files organized into 2 categories"),
+        ("Error", "2 errors, the first: disk full"),
+    ]
+
+def test_single_message_is_shown_as_is(backend):
+    dispatcher = NotificationDispatcher(backend, window=0.05)
+    try:
+        dispatcher.file_organized('/desk/report.pdf', 'Documents')
+        assert wait_for(lambda: backend.shown)
+    finally:
+        dispatcher.close()
+    assert backend.shown == [("File Organized", "File report.pdf was organized")]
+
+def test_rate_limit_spaces_out_summaries(backend):
+    # 600 per minute is one every 0.1s
+    dispatcher = NotificationDispatcher(backend, window=0.0, max_per_minute=600)
+    try:
+        for i in range(3):
+            dispatcher.notify("Note", str(i))
+            assert wait_for(lambda: len(backend.shown) == i + 1)
+    finally:
+        dispatcher.close()
+    gaps = [b - a for a, b in zip(backend.times, backend.times[1:])]
+    assert all(gap >= 0.09 for gap in gaps)
+
+def test_full_queue_drops_without_blocking(backend):
+    dispatcher = NotificationDispatcher(backend, window=5.0, max_queue=3)
+    try:
+        results = [dispatcher.notify("Note", str(i)) for i in range(5)]
+    finally:
+        dispatcher.close(flush=False)
+    assert results == [True, True, True, False, False]
+    assert dispatcher.dropped == 2
+    assert backend.shown == []
+
+def test_close_flushes_pending_messages_early(backend):
+    dispatcher = NotificationDispatcher(backend, window=30.0)
+    dispatcher.notify("Note", "a")
+    dispatcher.notify("Note", "b")
+    started = time.monotonic()
+    dispatcher.close()
+    assert time.monotonic() - started < 5
+    assert backend.shown == [("Note", "2 notifications, the latest: b")]
+
+def test_failing_backend_does_not_stop_the_worker():
+    calls = []
+
+    class Flaky(RecordingBackend):
+        def show(self, title, message):
+            calls.append(message)
+            if len(calls) == 1:
+                raise RuntimeError("no display")
+            super().show(title, message)
+
+    backend = Flaky()
+    dispatcher = NotificationDispatcher(backend, window=0.0, max_per_minute=0)
+    try:
+        dispatcher.notify("Note", "first")
+        assert wait_for(lambda: calls)
+        dispatcher.notify("Note", "second")
+        assert wait_for(lambda: backend.shown)
+    finally:
+        dispatcher.close()
+    assert backend.shown == [("Note", "second")]
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_backend('pager')
+    assert create_backend('null').name == 'null'
@@ -0,0 +1,45 @@
+import os
+import pytest
+from modules import core_organizer
+from modules.core_organizer import ERRORS
+from modules.journal import MoveJournal
+from .conftest import tree
+
+RULES = [
+    {'name': 'Text', 'conditions': {'extensions': ['.txt']}, 'action': {'type': 'move', 'destination': 'Missing/Deeper'}},
+    {'name': 'Clips', 'conditions': {'extensions': ['.mp4']}, 'action': {'type': 'move', 'destination': 'Clips'}},
+]
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_failing_rule_move_does_not_abort_the_run(organizer, desktop, make_files, incremental):
+    if incremental:
+        organizer.organize(desktop)
+    # The rule's destination has a missing parent, so its move raises
+    make_files(desktop, {'a.txt': 'a', 'b.txt': 'b', 'clip.mp4': 'clip', 'x.zip': 'same', 'y.zip': 'same'})
+
+    errors = ERRORS.value(stage='rule')
+    report = organizer.organize(desktop, RULES)
+    assert ERRORS.value(stage='rule') == errors + 2
+
+    assert sorted(r.src.name for r in report.failed) == ['a.txt', 'b.txt']
+    files = tree(desktop)
+    assert files['Documents/a.txt'] == 'a' and files['Documents/b.txt'] == 'b'
+    assert files['Media/Clips/clip.mp4'] == 'clip'
+    # Queued duplicate checks still ran, and the run was closed
+    assert len([path for path in files if path.startswith('Uncategorized/Duplicates/')]) == 1
+    assert MoveJournal.for_directory(desktop).last_run().finished
+
+def test_file_vanishing_during_the_scan_is_skipped(organizer, desktop, make_files, monkeypatch):
+    make_files(desktop, {'a.txt': 'a', 'gone.txt': 'gone'})
+    scan_tree = core_organizer.scan_tree
+
+    def racing_scan(*args, **kwargs):
+        for entry, depth in scan_tree(*args, **kwargs):
+            if entry.name == 'gone.txt':
+                os.unlink(entry.path)
+            yield entry, depth
+
+    monkeypatch.setattr(core_organizer, 'scan_tree', racing_scan)
+    report = organizer.organize(desktop)
+    assert not report.failed
+    assert tree(desktop) == {'Documents/a.txt': 'a'}
@@ -0,0 +1,41 @@
+import pytest
+from .conftest import tree
+
+TEXT_RULE = [{'name': 'Text', 'conditions': {'extensions': ['.txt']}, 'action': {'type': 'move', 'destination': 'Text'}}]
+
+@pytest.fixture
+def layout():
+    return {
+        'a.txt': 'a', 'b.mp4': 'b', 'setup.exe': 'exe', 'report.pdf': 'pdf', 'misc.xyz': 'misc',
+        'Media/old.mp3': 'mp3', 'Documents/notes.docx': 'notes', 'Documents/Text/c.txt': 'c',
+    }
+
+def test_reset_folder_move_is_not_a_conflict(organizer, desktop, make_files):
+    make_files(desktop, {'c.txt': 'new', 'Documents/Text/c.txt': 'old'})
+    plan = organizer.plan(desktop, TEXT_RULE, rebuild=True)
+    rule_moves = [op for op in plan.ops if op.op == 'rule_move']
+    assert [op.dest for op in rule_moves] == [desktop / 'Documents' / 'Text' / 'c.txt']
+    assert not plan.conflicts
+
+@pytest.mark.parametrize('rebuild', [False, True])
+def test_apply_plan_matches_organize(organizer, tmp_path, make_files, layout, rebuild):
+    organized, planned = tmp_path / 'organized', tmp_path / 'planned'
+    for directory in (organized, planned):
+        make_files(directory, layout)
+        # A first pass leaves a manifest, so the second one is incremental
+        organizer.organize(directory)
+        make_files(directory, {'late.txt': 'late', 'clip.mov': 'clip'})
+
+    organizer.organize(organized, TEXT_RULE, rebuild=rebuild)
+    plan = organizer.plan(planned, TEXT_RULE, rebuild=rebuild)
+    report = organizer.apply_plan(plan)
+    assert not report.failed
+    assert tree(planned) == tree(organized)
+
+def test_stale_plan_entries_are_skipped(organizer, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a', 'b.mp4': 'b'})
+    plan = organizer.plan(desktop)
+    (desktop / 'a.txt').unlink()
+    report = organizer.apply_plan(plan)
+    assert [r.src.name for r in report.failed] == ['a.txt']
+    assert tree(desktop) == {'Media/b.mp4': 'b'}
@@ -0,0 +1,61 @@
+import os
+import time
+import pytest
+from modules.file_handler import FileMonitor
+from modules.reconciler import RECONCILE_PASSES, Reconciler, background_priority
+
+OLD = time.time() - 3600
+
+@pytest.fixture
+def monitor(organizer, desktop):
+    monitor = FileMonitor(organizer)
+    monitor.add_path(desktop)
+    yield monitor
+    for handler in monitor.handlers:
+        handler.close()
+
+def write_old(path, content, age=0):
+    path.write_text(content)
+    os.utime(path, (OLD - age, OLD - age))
+
+def test_reconcile_reports_only_missed_changes(monitor, desktop):
+    reconciler = Reconciler(monitor, grace=10.0)
+    write_old(desktop / 'a.txt', 'a')
+    write_old(desktop / 'b.txt', 'b')
+    assert reconciler.reconcile(desktop) == []
+
+    unchanged = RECONCILE_PASSES.value(result='unchanged')
+    assert reconciler.reconcile(desktop) == []
+    assert RECONCILE_PASSES.value(result='unchanged') == unchanged + 1
+
+    write_old(desktop / 'c.txt', 'c')
+    write_old(desktop / 'b.txt', 'bigger', age=1)
+    (desktop / '.hidden').write_text('x')
+    assert sorted(p.name for p in reconciler.reconcile(desktop)) == ['b.txt', 'c.txt']
+
+def test_fresh_files_are_left_to_the_watcher(monitor, desktop):
+    reconciler = Reconciler(monitor, grace=10.0)
+    reconciler.reconcile(desktop)
+    (desktop / 'new.txt').write_text('new')
+    assert reconciler.reconcile(desktop) == []
+    # Still unsettled, so the next pass looks again even though the folder didn't change
+    os.utime(desktop / 'new.txt', (OLD, OLD))
+    assert [p.name for p in reconciler.reconcile(desktop)] == ['new.txt']
+
+def test_run_queues_missed_files_and_skips_busy_roots(monitor, desktop):
+    reconciler = Reconciler(monitor, grace=10.0)
+    assert reconciler.run() == 0
+    handler = monitor.handler_for(desktop)
+    write_old(desktop / 'a.txt', 'a')
+    with handler.queue._cond:
+        # A root with a queued batch is left for the next pass
+        handler.queue._pending[desktop / 'busy.txt'] = time.monotonic()
+        assert reconciler.run() == 0
+        handler.queue._pending.clear()
+    assert reconciler.run() == 1
+
+def test_background_priority_is_restored():
+    before = os.getpriority(os.PRIO_PROCESS, 0)
+    with background_priority():
+        pass
+    assert os.getpriority(os.PRIO_PROCESS, 0) == before
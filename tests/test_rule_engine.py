@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from modules.rule_engine import RuleEngine, RulePlan
+from modules.security import FileVault
+
+class Notifier:
+    def __init__(self):
+        self.messages = []
+
+    def notify(self, title, message, kind='info', category=None):
+        self.messages.append(message)
+        return True
+
+def notify(name, message, **conditions):
+    return {'name': name, 'conditions': conditions, 'action': {'type': 'notify', 'message': message}}
+
+def move(name, destination, **conditions):
+    return {'name': name, 'conditions': conditions, 'action': {'type': 'move', 'destination': destination}}
+
+@pytest.fixture
+def notifier():
+    return Notifier()
+
+@pytest.fixture
+def engine(notifier):
+    # No configured rules, so only the ones each test passes apply
+    config = SimpleNamespace(snapshot=SimpleNamespace(rules=[], rule_plan=RulePlan.compile([])))
+    return RuleEngine(config=config, notifier=notifier)
+
+def fake_stat(size):
+    return os.stat_result((0o100644, 0, 0, 1, 0, 0, size, 0, 0, 0))
+
+def test_name_rules_never_stat(engine, notifier, tmp_path):
+    # The file doesn't exist, so any stat would raise
+    missing = tmp_path / 'report.pdf'
+    plan = engine.plan_for([notify('pdf', 'pdf {file}', extensions=['.pdf'], name_pattern='rep')])
+    assert not plan.needs_stat
+    assert engine.apply_rules(missing, plan) == missing
+    assert notifier.messages == ['pdf report.pdf']
+
+def test_size_rules_use_the_callers_stat(engine, notifier, tmp_path):
+    missing = tmp_path / 'big.iso'
+    plan = engine.plan_for([
+        notify('small', 'small', max_size=10),
+        notify('big', 'big', min_size=100),
+    ])
+    assert plan.needs_stat
+    engine.apply_rules(missing, plan, stat=fake_stat(1000))
+    engine.apply_rules(missing, plan, stat=fake_stat(5))
+    assert notifier.messages == ['big', 'small']
+
+def test_stats_once_when_no_stat_is_given(engine, tmp_path, monkeypatch):
+    file = tmp_path / 'a.bin'
+    file.write_bytes(b'x' * 50)
+    calls = []
+    stat = Path.stat
+    monkeypatch.setattr(Path, 'stat', lambda self, *a, **k: calls.append(self) or stat(self, *a, **k))
+    plan = engine.plan_for([notify(f'r{i}', str(i), min_size=i * 10) for i in range(8)])
+    engine.apply_rules(file, plan)
+    assert calls == [file]
+
+def test_rules_chain_and_match_simulation(engine, tmp_path):
+    (tmp_path / 'notes_tmp.txt').write_text('x')
+    rules = [
+        move('temp', 'Trash', name_pattern='tmp'),
+        move('text', 'Text', extensions=['.txt']),
+        move('never', 'Never', extensions=['.pdf']),
+    ]
+    plan = engine.plan_for(rules)
+    steps = engine.simulate(tmp_path / 'notes_tmp.txt', plan)
+    assert [rule.name for rule, _ in steps] == ['temp', 'text']
+    final = engine.apply_rules(tmp_path / 'notes_tmp.txt', plan)
+    assert final == steps[-1][1] == tmp_path / 'Trash' / 'Text' / 'notes_tmp.txt'
+    assert final.read_text() == 'x'
+
+def test_compiled_plans_are_reused(engine):
+    plan = RulePlan.compile([move('a', 'A')])
+    assert engine.plan_for(plan) is plan
+    assert engine.plan_for(None) is engine.plan
+
+def encrypt(name, password, **conditions):
+    return {'name': name, 'conditions': conditions, 'action': {'type': 'encrypt', 'password': password}}
+
+def test_encryptions_are_queued_and_flushed_per_password(engine, tmp_path):
+    engine.encrypt_workers = 2
+    files = {tmp_path / f'{name}.{ext}': f'{name} data' for name in 'abc' for ext in ('key', 'pem')}
+    for path, data in files.items():
+        path.write_text(data)
+    plan = engine.plan_for([encrypt('keys', 'one', extensions=['.key']), encrypt('pems', 'two', extensions=['.pem'])])
+    for path in files:
+        assert engine.apply_rules(path, plan) is None
+    # Nothing is encrypted until the batch is flushed
+    assert engine.pending_encrypts == 6 and all(path.exists() for path in files)
+
+    progress = []
+    report = engine.flush(progress=lambda done, total, result: progress.append((done, total)))
+    assert len(report.encrypted) == 6 and not report.failed
+    assert engine.pending_encrypts == 0
+    assert sorted(progress) == [(i, 3) for i in (1, 1, 2, 2, 3, 3)]
+
+    vault = FileVault()
+    for path, data in files.items():
+        assert not path.exists()
+        password = 'one' if path.suffix == '.key' else 'two'
+        assert vault.decrypt_file(path.with_name(path.name + '.enc'), password).read_text() == data
+
+def test_vanished_file_fails_alone(engine, tmp_path):
+    engine.encrypt_workers = 2
+    for name in 'ab':
+        (tmp_path / f'{name}.key').write_text(name)
+    plan = engine.plan_for([encrypt('keys', 'pw', extensions=['.key'])])
+    for name in 'ab':
+        engine.apply_rules(tmp_path / f'{name}.key', plan)
+    (tmp_path / 'a.key').unlink()
+    report = engine.flush()
+    assert [r.path.name for r in report.failed] == ['a.key']
+    assert [r.path.name for r in report.encrypted] == ['b.key']
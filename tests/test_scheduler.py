@@ -0,0 +1,100 @@
+import time
+import threading
+import pytest
+from modules.scheduler import TaskScheduler
+from .conftest import wait_for
+
+INTERVAL = 0.05
+
+class BlockingTask:
+    """Records each start; the first call blocks until ``release``"""
+
+    def __init__(self):
+        self.starts = []
+        self.active = 0
+        self.peak = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.starts.append(time.monotonic())
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            first = len(self.starts) == 1
+        if first:
+            self.release.wait(5)
+        with self._lock:
+            self.active -= 1
+
+@pytest.fixture
+def scheduler():
+    scheduler = TaskScheduler(max_workers=4)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop(wait=True)
+
+def run_blocked(scheduler, overlap: str, task: BlockingTask):
+    job = scheduler.add_interval_task(task, INTERVAL / 60, overlap=overlap)
+    assert wait_for(lambda: task.starts)
+    time.sleep(INTERVAL * 5)
+    return job
+
+def test_skip_drops_occurrences_while_running(scheduler):
+    task = BlockingTask()
+    job = run_blocked(scheduler, 'skip', task)
+    assert len(task.starts) == 1
+    assert not job.queued
+    task.release.set()
+    # The schedule carries on once the running copy finishes
+    assert wait_for(lambda: len(task.starts) >= 2)
+    scheduler.cancel(job)
+
+def test_queue_runs_once_more_after_finishing(scheduler):
+    task = BlockingTask()
+    job = run_blocked(scheduler, 'queue', task)
+    assert len(task.starts) == 1
+    assert job.queued
+    scheduler.cancel(job)
+    task.release.set()
+    time.sleep(INTERVAL * 3)
+    # Cancelling also drops the queued occurrence
+    assert len(task.starts) == 1
+
+    task = BlockingTask()
+    job = run_blocked(scheduler, 'queue', task)
+    released = time.monotonic()
+    task.release.set()
+    assert wait_for(lambda: len(task.starts) >= 2)
+    # Several occurrences fell due, but they collapse into one run started straight away
+    assert task.starts[1] - released < INTERVAL
+    assert task.peak == 1
+    scheduler.cancel(job)
+
+def test_concurrent_starts_overlapping_copies(scheduler):
+    task = BlockingTask()
+    job = run_blocked(scheduler, 'concurrent', task)
+    assert len(task.starts) >= 2
+    assert task.peak >= 2
+    task.release.set()
+    scheduler.cancel(job)
+
+def test_cancel_stops_future_runs(scheduler):
+    task = BlockingTask()
+    task.release.set()
+    job = scheduler.add_interval_task(task, INTERVAL / 60)
+    assert wait_for(lambda: task.starts)
+    scheduler.cancel(job)
+    time.sleep(INTERVAL)
+    count = len(task.starts)
+    time.sleep(INTERVAL * 3)
+    assert len(task.starts) == count
+    assert job not in scheduler.jobs
+
+def test_rejects_bad_arguments(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.add_interval_task(lambda: None, 0)
+    with pytest.raises(ValueError):
+        scheduler.add_interval_task(lambda: None, 1, overlap='parallel')
+    with pytest.raises(ValueError):
+        scheduler.add_daily_task(lambda: None, '25:00')
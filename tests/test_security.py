@@ -0,0 +1,94 @@
+import os
+import pytest
+from modules.security import HEADER, MAX_CHUNK_SIZE, TAG_SIZE, FileVault
+
+CHUNK = 64
+
+@pytest.fixture
+def vault() -> FileVault:
+    return FileVault(chunk_size=CHUNK)
+
+def test_round_trip(vault, tmp_path):
+    data = os.urandom(CHUNK * 3 + 5)
+    path = tmp_path / 'report.pdf'
+    path.write_bytes(data)
+    encrypted = vault.encrypt_file(path, 'secret')
+    assert encrypted.name == 'report.pdf.enc' and not path.exists()
+    assert data not in encrypted.read_bytes()
+    assert vault.decrypt_file(encrypted, 'secret').read_bytes() == data
+
+@pytest.mark.parametrize('size', [0, CHUNK, CHUNK * 2])
+def test_round_trip_at_chunk_boundaries(vault, tmp_path, size):
+    data = os.urandom(size)
+    path = tmp_path / 'a.bin'
+    path.write_bytes(data)
+    assert vault.decrypt_file(vault.encrypt_file(path, 'pw'), 'pw').read_bytes() == data
+
+def test_batch_encrypts_across_processes(vault, tmp_path):
+    files = {tmp_path / f'{i}.txt': os.urandom(CHUNK + i) for i in range(3)}
+    for path, data in files.items():
+        path.write_bytes(data)
+    report = vault.encrypt_files(files, 'pw', max_workers=2)
+    assert len(report.encrypted) == 3 and not report.failed
+    for result in report.encrypted:
+        assert vault.decrypt_file(result.target, 'pw').read_bytes() == files[result.path]
+
+def _encrypted(vault, tmp_path):
+    path = tmp_path / 'a.bin'
+    path.write_bytes(os.urandom(CHUNK * 3))
+    return vault.encrypt_file(path, 'pw')
+
+def test_wrong_password_is_rejected(vault, tmp_path):
+    encrypted = _encrypted(vault, tmp_path)
+    with pytest.raises(ValueError):
+        FileVault(chunk_size=CHUNK).decrypt_file(encrypted, 'other')
+    assert encrypted.exists() and not (tmp_path / 'a.bin').exists()
+
+def test_tampered_chunk_is_detected(vault, tmp_path):
+    encrypted = _encrypted(vault, tmp_path)
+    data = bytearray(encrypted.read_bytes())
+    data[HEADER.size + CHUNK + TAG_SIZE + 3] ^= 1
+    encrypted.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        vault.decrypt_file(encrypted, 'pw')
+    assert encrypted.exists() and not (tmp_path / 'a.bin').exists()
+
+@pytest.mark.parametrize('cut', [CHUNK + TAG_SIZE, 7])
+def test_truncated_file_is_detected(vault, tmp_path, cut):
+    encrypted = _encrypted(vault, tmp_path)
+    data = encrypted.read_bytes()
+    # Dropping a whole final chunk must fail too, not just a torn one
+    encrypted.write_bytes(data[:-cut])
+    with pytest.raises(ValueError):
+        vault.decrypt_file(encrypted, 'pw')
+    assert not (tmp_path / 'a.bin').exists()
+
+def test_decrypt_keeps_an_existing_file(vault, tmp_path):
+    path = tmp_path / 'report.pdf'
+    path.write_bytes(b'secret draft')
+    encrypted = vault.encrypt_file(path, 'pw')
+    path.write_bytes(b'newer copy')
+    restored = vault.decrypt_file(encrypted, 'pw')
+    assert restored.name == 'report (1).pdf'
+    assert restored.read_bytes() == b'secret draft'
+    assert path.read_bytes() == b'newer copy'
+
+def test_encrypt_keeps_an_existing_vault_file(vault, tmp_path):
+    path = tmp_path / 'report.pdf'
+    path.write_bytes(b'first')
+    first = vault.encrypt_file(path, 'pw')
+    path.write_bytes(b'second')
+    second = vault.encrypt_file(path, 'pw')
+    assert second.name == 'report (1).pdf.enc'
+    assert vault.decrypt_file(first, 'pw').read_bytes() == b'first'
+    assert vault.decrypt_file(second, 'pw').read_bytes() == b'second'
+
+def test_oversized_chunk_header_is_rejected(vault, tmp_path):
+    encrypted = _encrypted(vault, tmp_path)
+    data = bytearray(encrypted.read_bytes())
+    data[HEADER.size - 4:HEADER.size] = (0xFFFFFFFF).to_bytes(4, 'big')
+    encrypted.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match='header'):
+        vault.decrypt_file(encrypted, 'pw')
+    with pytest.raises(ValueError):
+        FileVault(chunk_size=MAX_CHUNK_SIZE + 1)
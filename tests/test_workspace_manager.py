@@ -0,0 +1,84 @@
+from pathlib import Path
+import pytest
+from modules.workspace_manager import WorkspaceManager
+from .conftest import tree
+
+@pytest.fixture
+def workspaces(tmp_path: Path) -> WorkspaceManager:
+    with WorkspaceManager(tmp_path / 'workspaces.db') as manager:
+        yield manager
+
+def test_switch_moves_only_misplaced_files(organizer, workspaces, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a', 'b.jpg': 'b', 'Notes/c.txt': 'c'})
+    assert workspaces.save_layout('loose', desktop) == 3
+    before = tree(desktop)
+
+    organizer.organize(desktop)
+    misplaced = set(tree(desktop)) - set(before)
+    assert misplaced
+
+    report = organizer.switch_workspace(desktop, 'loose', workspaces)
+    assert not report.failed
+    assert tree(desktop) == before
+    assert {str(r.src.relative_to(desktop)) for r in report.results} == misplaced
+    assert workspaces.active_workspace(desktop) == 'loose'
+
+    # Already in place: nothing left to move
+    assert not organizer.switch_workspace(desktop, 'loose', workspaces).results
+
+def test_switch_is_undoable(organizer, workspaces, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a', 'b.jpg': 'b'})
+    workspaces.save_layout('loose', desktop)
+    organizer.organize(desktop)
+    organized = tree(desktop)
+
+    organizer.switch_workspace(desktop, 'loose', workspaces)
+    assert not organizer.undo(desktop).failed
+    assert tree(desktop) == organized
+
+def test_switch_without_layout(workspaces, organizer, desktop):
+    with pytest.raises(ValueError):
+        organizer.switch_workspace(desktop, 'missing', workspaces)
+
+def test_list_and_delete_cover_both_tables(workspaces, desktop, make_files):
+    make_files(desktop, {'a.txt': 'a'})
+    workspaces.create_workspace('settings', {'rules': []})
+    workspaces.save_layout('layout', desktop)
+    names = {w['name'] for w in workspaces.list_workspaces()}
+    assert {'settings', 'layout'} <= names
+    assert '' not in names
+
+    workspaces.delete_workspace('layout')
+    workspaces.delete_workspace('settings')
+    names = {w['name'] for w in workspaces.list_workspaces()}
+    assert not {'settings', 'layout'} & names
+    assert workspaces.active_workspace(desktop) is None
+    with pytest.raises(ValueError):
+        workspaces.delete_workspace('')
+
+def test_default_path_is_not_cwd_relative(tmp_path, monkeypatch):
+    monkeypatch.delenv('LOCALAPPDATA', raising=False)
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / 'data'))
+    monkeypatch.chdir(tmp_path)
+    with WorkspaceManager() as manager:
+        assert manager.db_path == tmp_path / 'data' / 'desktop_organizer' / 'workspaces.db'
+    assert manager.db_path.exists()
+    assert not (tmp_path / 'workspaces.db').exists()
+
+def test_legacy_database_is_moved_on_first_open(tmp_path, monkeypatch, caplog):
+    monkeypatch.delenv('LOCALAPPDATA', raising=False)
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / 'data'))
+    monkeypatch.chdir(tmp_path)
+    with WorkspaceManager(tmp_path / 'workspaces.db') as legacy:
+        legacy.create_workspace('kept', {'rules': []})
+
+    with caplog.at_level('WARNING'), WorkspaceManager() as manager:
+        assert manager.get_workspace('kept') == {'rules': []}
+    assert not (tmp_path / 'workspaces.db').exists()
+    assert 'Moved workspaces database' in caplog.text
+
+    # Once moved, a stray copy in the working directory is left alone
+    (tmp_path / 'workspaces.db').write_bytes(b'')
+    with WorkspaceManager() as manager:
+        assert manager.get_workspace('kept') == {'rules': []}
+    assert (tmp_path / 'workspaces.db').exists()